@@ -0,0 +1,202 @@
+"""Asyncio interface for resources and drivers.
+
+PyVISA provides blocking I/O only, so blocking calls run in the default
+executor of the event loop, shared by all resources. Calls of one
+`AsyncResource` are serialized by a lock, keeping commands to one instrument
+in order while overlapping I/O of different instruments.
+`AsyncResource.wait_for_opc` polls service requests or the event status on
+the event loop without occupying an executor thread between polls.
+
+Drivers are wrapped by facades generated from the driver classes, every
+public driver method becomes a coroutine executed in the executor. The
+facade `fetch` awaits operation complete of readings started by `initiate`
+on the event loop, other methods waiting for operation complete (e.g.
+`measure_iv` or sweeps) block an executor thread while waiting. Direct I/O
+of an `AsyncResource` first sends pending pipelined writes of its drivers.
+
+>>> async def main():
+...     async with AsyncResource(Resource("SIM::K2410::1", "")) as resource:
+...         smu = async_driver(K2410, resource)
+...         await smu.set_voltage_level(-10.0)
+...         return await smu.measure_iv()
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .resource import Resource
+
+__all__ = [
+    "AsyncResource",
+    "AsyncDriver",
+    "async_driver_class",
+    "async_driver",
+    "measure_instruments",
+]
+
+
+class AsyncResource:
+    """Asynchronous wrapper of a `Resource`."""
+
+    def __init__(self, resource: Resource) -> None:
+        self.resource: Resource = resource
+        self.drivers: List[Any] = []
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def resource_name(self) -> str:
+        return self.resource.resource_name
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Run blocking call in the executor after previous calls of this
+        resource have returned.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Blocking calls can not be interrupted, keep calls in order
+                await asyncio.wait([future])
+                raise
+
+    async def __aenter__(self) -> "AsyncResource":
+        await self.run(self.resource.__enter__)
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None) -> bool:
+        await self.run(self.resource.__exit__, exc_type, exc_value, traceback)
+        return False
+
+    def _flushed(self, function: Callable, *args) -> Any:
+        for driver in self.drivers:
+            driver.flush(wait=False)
+        return function(*args)
+
+    async def run_flushed(self, function: Callable, *args) -> Any:
+        """Run blocking call on the worker after sending pending pipelined
+        writes of drivers using this resource.
+        """
+        return await self.run(self._flushed, function, *args)
+
+    async def query(self, message: str) -> str:
+        return await self.run_flushed(self.resource.query, message)
+
+    async def write(self, message: str) -> Any:
+        return await self.run_flushed(self.resource.write, message)
+
+    async def read(self) -> str:
+        return await self.run_flushed(self.resource.read)
+
+    async def query_binary_values(self, message: str, datatype: str = "d", is_big_endian: bool = False):
+        return await self.run_flushed(self.resource.query_binary_values, message, datatype, is_big_endian)
+
+    async def clear(self) -> None:
+        await self.run_flushed(self.resource.clear)
+
+    async def prepare_opc(self) -> None:
+        await self.run(self.resource.prepare_opc)
+
+    async def wait_for_opc(self, timeout: float, interval: float = 0.005, max_interval: float = 0.250) -> bool:
+        """Wait for operation complete after `*OPC` was written, returns
+        `False` on timeout. A service request armed by `prepare_opc` is
+        polled, else `*ESR?` is polled, both with growing intervals.
+        """
+        threshold = time.monotonic() + timeout
+        if self.resource.srq_armed:
+            srq_interval = interval
+            while not await self.run(self.resource.poll_srq):
+                remaining = threshold - time.monotonic()
+                if remaining <= 0:
+                    await self.run(self.resource.disarm_srq)
+                    break
+                await asyncio.sleep(min(srq_interval, remaining))
+                srq_interval = min(srq_interval * 2, max_interval)
+        while True:
+            if int(await self.query("*ESR?")) & 0x1:
+                return True
+            remaining = threshold - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+
+
+class AsyncDriver:
+    """Base class of asynchronous driver facades."""
+
+    driver_class: type = type(None)
+
+    opc_timeout: float = 10.0
+    """Timeout in seconds awaiting readings started by `initiate`."""
+
+    def __init__(self, resource: AsyncResource) -> None:
+        self.async_resource: AsyncResource = resource
+        self.driver = self.driver_class(resource.resource)
+        resource.drivers.append(self.driver)
+
+    async def fetch(self, *args, **kwargs) -> Any:
+        """Return reading started by `initiate`, operation complete requested
+        by the driver is awaited on the event loop before fetching.
+        """
+        if self.driver.opc_requested:
+            timeout = kwargs.get("timeout", self.opc_timeout)
+            self.driver.opc_result = await self.async_resource.wait_for_opc(timeout)
+        return await self.async_resource.run(self.driver.fetch, *args, **kwargs)
+
+
+def _async_method(name: str) -> Callable[..., Awaitable]:
+    async def method(self, *args, **kwargs):
+        return await self.async_resource.run(getattr(self.driver, name), *args, **kwargs)
+    method.__name__ = name
+    return method
+
+
+_async_driver_classes: Dict[type, type] = {}
+
+
+def async_driver_class(cls: type) -> type:
+    """Return facade class for driver class, public methods of the driver
+    are provided as coroutines.
+    """
+    facade = _async_driver_classes.get(cls)
+    if facade is None:
+        namespace: Dict[str, Any] = {"driver_class": cls, "__doc__": f"Asynchronous facade of `{cls.__name__}`."}
+        for name, _ in inspect.getmembers(cls, inspect.isfunction):
+            if not name.startswith("_") and not hasattr(AsyncDriver, name):
+                namespace[name] = _async_method(name)
+        facade = type(f"Async{cls.__name__}", (AsyncDriver,), namespace)
+        _async_driver_classes[cls] = facade
+    return facade
+
+
+def async_driver(cls: type, resource: AsyncResource) -> AsyncDriver:
+    """Return asynchronous facade of driver class `cls` for resource."""
+    return async_driver_class(cls)(resource)
+
+
+async def measure_instruments(instruments: Dict[str, AsyncDriver]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Initiate readings of all instruments, then fetch them concurrently.
+    Returns results and timestamps of the fetched readings by key.
+    """
+    keys: List[str] = list(instruments)
+    await asyncio.gather(*[instruments[key].initiate() for key in keys])
+
+    async def fetch(instrument: AsyncDriver) -> Tuple[Any, float]:
+        result = await instrument.fetch()
+        return result, time.time()
+
+    readings = await asyncio.gather(*[fetch(instruments[key]) for key in keys])
+    results: Dict[str, Any] = {}
+    timestamps: Dict[str, float] = {}
+    for key, (result, timestamp) in zip(keys, readings):
+        results[key] = result
+        timestamps[key] = timestamp
+    return results, timestamps
@@ -45,6 +45,7 @@ from .measurement.iv_bias import IVBiasMeasurement
 from .measurement.cv import CVMeasurement
 
 from .reader import Reader
+from .resource import resource_pool
 from .writer import Writer
 
 from .utils import get_resource
@@ -159,6 +160,11 @@ class Controller(QtCore.QObject):
         self.changeVoltageReady.connect(self.changeVoltageController.onChangeVoltageReady)
         self.failed.connect(self.handleException)
 
+        # Close idle instrument sessions
+        self.sessionTimer = QtCore.QTimer(self)
+        self.sessionTimer.timeout.connect(resource_pool.evict_idle)
+        self.sessionTimer.start(5000)
+
         # Source meter unit
         role = self.view.addRole("SMU")
         role.addInstrumentPanel(K237Panel())
@@ -306,6 +312,9 @@ class Controller(QtCore.QObject):
         state["voltage_end"] = self.view.generalWidget.endVoltage()
         state["voltage_step"] = self.view.generalWidget.stepVoltage()
         state["waiting_time"] = self.view.generalWidget.waitingTime()
+        state["sweep_profile"] = self.view.generalWidget.sweepProfile()
+        state["sweep_file"] = self.view.generalWidget.sweepFile()
+        state["sweep_bidirectional"] = self.view.generalWidget.isBidirectional()
         state["bias_voltage"] = self.view.generalWidget.biasVoltage()
         state["current_compliance"] = self.view.generalWidget.currentCompliance()
         state["continue_in_compliance"] = self.view.generalWidget.isContinueInCompliance()
@@ -353,6 +362,8 @@ class Controller(QtCore.QObject):
     def shutdown(self):
         self.stateMachine.stop()
         self.abortRequested.set()
+        self.sessionTimer.stop()
+        resource_pool.clear()
 
     def loadSettings(self):
         settings = QtCore.QSettings()
@@ -422,6 +433,15 @@ class Controller(QtCore.QObject):
         waitingTime = settings.value("waitingTime", 1, float)
         self.view.generalWidget.setWaitingTime(waitingTime)
 
+        sweepProfile = settings.value("sweepProfile", "linear", str)
+        self.view.generalWidget.setSweepProfile(sweepProfile)
+
+        sweepFile = settings.value("sweepFile", "", str)
+        self.view.generalWidget.setSweepFile(sweepFile)
+
+        bidirectional = settings.value("sweepBidirectional", False, bool)
+        self.view.generalWidget.setBidirectional(bidirectional)
+
         voltage = settings.value("biasVoltage", 0, float)
         self.view.generalWidget.setBiasVoltage(voltage)
 
@@ -515,6 +535,15 @@ class Controller(QtCore.QObject):
         waitingTime = self.view.generalWidget.waitingTime()
         settings.setValue("waitingTime", waitingTime)
 
+        sweepProfile = self.view.generalWidget.sweepProfile()
+        settings.setValue("sweepProfile", sweepProfile)
+
+        sweepFile = self.view.generalWidget.sweepFile()
+        settings.setValue("sweepFile", sweepFile)
+
+        bidirectional = self.view.generalWidget.isBidirectional()
+        settings.setValue("sweepBidirectional", bidirectional)
+
         voltage = self.view.generalWidget.biasVoltage()
         settings.setValue("biasVoltage", voltage)
 
@@ -862,15 +891,12 @@ class Controller(QtCore.QObject):
         return os.path.join(path, filename)
 
     def connectIVPlots(self, measurement) -> None:
-        measurement.ivReadingQueue = self.ivPlotsController.ivReadingQueue
-        measurement.ivReadingLock = self.ivPlotsController.ivReadingLock
-        measurement.itReadingQueue = self.ivPlotsController.itReadingQueue
-        measurement.itReadingLock = self.ivPlotsController.itReadingLock
+        measurement.attach_reading_queue("iv", self.ivPlotsController.ivReadingQueue, self.ivPlotsController.ivReadingLock)
+        measurement.attach_reading_queue("it", self.ivPlotsController.itReadingQueue, self.ivPlotsController.itReadingLock)
         measurement.it_change_voltage_ready_event.subscribe(self.changeVoltageReady.emit)
 
     def connectCVPlots(self, measurement) -> None:
-        measurement.cvReadingQueue = self.cvPlotsController.cvReadingQueue
-        measurement.cvReadingLock = self.cvPlotsController.cvReadingLock
+        measurement.attach_reading_queue("cv", self.cvPlotsController.cvReadingQueue, self.cvPlotsController.cvReadingLock)
 
     def createMeasurement(self):
         measurementType = self.state.measurement_type
@@ -926,6 +952,30 @@ class Controller(QtCore.QObject):
             if not state.get("source_role"):
                 raise RuntimeError("No source instrument selected.")
 
+            settings = QtCore.QSettings()
+            state["pipelined_writes"] = settings.value("measurement/pipelinedWrites", False, bool)
+            state["pipeline_size"] = settings.value("measurement/pipelineSize", 8, int)
+            state["service_requests"] = settings.value("measurement/serviceRequests", False, bool)
+            state["reconnect_budget"] = settings.value("measurement/reconnectBudget", 60.0, float)
+            resource_pool.idle_timeout = settings.value("measurement/sessionIdleTimeout", 0.0, float)
+            state["concurrent_readings"] = settings.value("measurement/concurrentReadings", False, bool)
+            state["hardware_sweep"] = settings.value("measurement/hardwareSweep", False, bool)
+            state["buffered_continuous"] = settings.value("measurement/bufferedContinuous", False, bool)
+            state["source_verify_interval"] = settings.value("measurement/sourceVerifyInterval", 10, int)
+            state["adaptive_ramp"] = settings.value("measurement/adaptiveRamp", False, bool)
+            state["adaptive_min_step"] = settings.value("measurement/adaptiveMinStep", 1.0, float)
+            state["adaptive_threshold"] = settings.value("measurement/adaptiveThreshold", 0.1, float)
+            state["settling_mode"] = settings.value("measurement/settlingMode", "off", str)
+            state["settling_tolerance"] = settings.value("measurement/settlingTolerance", 0.01, float)
+            state["settling_count"] = settings.value("measurement/settlingCount", 3, int)
+            state["sample_count"] = settings.value("measurement/sampleCount", 1, int)
+            state["sample_method"] = settings.value("measurement/sampleMethod", "median", str)
+            state["sample_sigma"] = settings.value("measurement/sampleSigma", 0.0, float)
+            state["sample_trim"] = settings.value("measurement/sampleTrim", 0.1, float)
+            state["ramp_slew_rate"] = settings.value("measurement/rampSlewRate", 20.0, float)
+            state["ramp_max_step"] = settings.value("measurement/rampMaxStep", 5.0, float)
+            state["ramp_hardware_sweep"] = settings.value("measurement/rampHardwareSweep", False, bool)
+
             # Update state
             self.state.update(state)
             self.state.update({"stop_requested": False})
@@ -946,7 +996,6 @@ class Controller(QtCore.QObject):
 
             options = {}
 
-            settings = QtCore.QSettings()
             timestampFormat = settings.value("writer/timestampFormat", ".6f", str)
             valueFormat = settings.value("writer/valueFormat", "+.3E", str)
 
@@ -1,4 +1,6 @@
-from typing import Dict
+from typing import Dict, FrozenSet
+
+from .driver import Capability
 
 # Drivers
 from .k237 import K237
@@ -13,7 +15,7 @@ from .e4980a import E4980A
 from .a4284a import A4284A
 from .brandbox import BrandBox
 
-__all__ = ["driver_factory"]
+__all__ = ["Capability", "driver_factory", "driver_capabilities"]
 
 DRIVERS: Dict[str, type] = {
     "K237": K237,
@@ -36,3 +38,8 @@ def driver_factory(model: str) -> type:
     if driver is None:
         raise ValueError(f"No such driver: {model}")
     return driver
+
+
+def driver_capabilities(model: str) -> FrozenSet[str]:
+    """Return capabilities of driver referenced by model, see `Capability`."""
+    return driver_factory(model).capabilities
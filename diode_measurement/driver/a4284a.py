@@ -1,13 +1,23 @@
-import time
-from typing import Tuple
+from typing import Callable, List, Optional, Tuple
 
-from .driver import LCRMeter, handle_exception
+from .driver import Capability, LCRMeter, handle_exception
 
 __all__ = ["A4284A"]
 
 
 class A4284A(LCRMeter):
 
+    capabilities = frozenset({
+        Capability.HARDWARE_SWEEP,
+        Capability.SERVICE_REQUEST,
+    })
+    list_sweep_size = 10
+
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._list_sweep_level: float = 0.0
+        self._list_sweep_timeout: float = 0.0
+
     def identity(self) -> str:
         return self._query("*IDN?").strip()
 
@@ -85,12 +95,64 @@ class A4284A(LCRMeter):
         return 0.0, 0.0
 
     def measure_impedance(self) -> Tuple[float, float]:
-        result = self._fetch().split(",")
+        self.initiate()
+        return self.fetch()
+
+    def initiate(self) -> None:
+        # Request operation complete
+        self._write("*CLS")
+        self._request_opc()
+        # Initiate measurement
+        self._write_nowait(":TRIG:IMM")
+
+    def fetch(self, timeout=10.0) -> Tuple[float, float]:
+        result = self._fetch_data(timeout).split(",")
         try:
             return float(result[0]), float(result[1])
         except Exception as exc:
             raise RuntimeError(f"Failed to parse impedance reading: {result!r}") from exc
 
+    def prepare_list_sweep(self, points: List[float], step_delay: float) -> None:
+        """Program sequential DC bias list sweep (up to 10 points)."""
+        levels = ",".join(format(level, ".3E") for level in points)
+        self._write(":DISP:PAGE LIST")
+        self._write(":LIST:MODE SEQ")
+        self._write(f":LIST:BIAS:VOLT {levels}")
+        self._write(f":TRIG:DEL {step_delay:E}")
+        self._list_sweep_level = points[-1]
+        self._list_sweep_timeout = 10.0 + len(points) * (step_delay + 1.0)
+
+    def fetch_list_sweep(self, timeout: Optional[float] = None,
+                         abort: Optional[Callable[[], bool]] = None) -> List[Tuple[float, float]]:
+        """Run prepared list sweep and return impedance tuples for every point.
+        Bias returns to the fixed level after the sequence, which is updated to
+        the last point of the list. If `abort` returns `True` while waiting the
+        sweep is aborted and no readings are returned.
+        """
+        if timeout is None:
+            timeout = self._list_sweep_timeout
+        self.initiate()
+        if not self._wait_for_opc(timeout, abort):
+            if abort is not None and abort():
+                self._write_nowait(":ABOR")
+                self._write(":TRIG:DEL 0")
+                self._write(":DISP:PAGE MEAS")
+                return []
+            raise RuntimeError(f"LCR reading timeout, exceeded {timeout:G} s")
+        try:
+            result = self._query(":FETC?")
+        except Exception as exc:
+            raise RuntimeError(f"Failed to fetch LCR reading: {exc}") from exc
+        self._write(f":BIAS:VOLT:LEV {self._list_sweep_level:.3E}")
+        self._write(":TRIG:DEL 0")
+        self._write(":DISP:PAGE MEAS")
+        try:
+            # <data A>,<data B>,<status>,<compare> for every point
+            values = result.split(",")
+            return [(float(values[index]), float(values[index + 1])) for index in range(0, len(values), 4)]
+        except Exception as exc:
+            raise RuntimeError(f"Failed to parse list sweep readings: {result!r}") from exc
+
     def set_function_impedance_type(self, impedance_type: str) -> None:
         self._write(f":FUNC:IMP:TYPE {impedance_type}")
 
@@ -120,31 +182,24 @@ class A4284A(LCRMeter):
 
     @handle_exception
     def _write(self, message):
-        self.resource.write(message)
-        self.resource.query("*OPC?")
+        if not self._queue_write(message):
+            self.resource.write(message)
+            self.resource.query("*OPC?")
 
     @handle_exception
     def _write_nowait(self, message):
+        self.flush(wait=False)
         self.resource.write(message)
 
     @handle_exception
     def _query(self, message):
+        self.flush(wait=False)
         return self.resource.query(message).strip()
 
-    def _fetch(self, timeout=10.0, interval=0.250) -> str:
-        # Request operation complete
-        self._write("*CLS")
-        self._write_nowait("*OPC")
-        # Initiate measurement
-        self._write_nowait(":TRIG:IMM")
-        threshold = time.time() + timeout
-        interval = min(timeout, interval)
-        while time.time() < threshold:
-            # Read event status
-            if int(self._query("*ESR?")) & 0x1:
-                try:
-                    return self._query(":FETC?")
-                except Exception as exc:
-                    raise RuntimeError(f"Failed to fetch LCR reading: {exc}") from exc
-            time.sleep(interval)
-        raise RuntimeError(f"LCR reading timeout, exceeded {timeout:G} s")
+    def _fetch_data(self, timeout: float) -> str:
+        if not self._wait_for_opc(timeout):
+            raise RuntimeError(f"LCR reading timeout, exceeded {timeout:G} s")
+        try:
+            return self._query(":FETC?")
+        except Exception as exc:
+            raise RuntimeError(f"Failed to fetch LCR reading: {exc}") from exc
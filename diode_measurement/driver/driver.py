@@ -1,11 +1,12 @@
 import logging
+import math
 import time
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["Driver"]
+__all__ = ["Capability", "Driver"]
 
 
 def handle_exception(method):
@@ -22,10 +23,230 @@ class DriverError(Exception):
     ...
 
 
+class Capability:
+    """Optional driver features declared by `Driver.capabilities`."""
+
+    MEASURE_V: str = "measure_v"
+    """Driver implements `measure_v`."""
+
+    INTERLOCK: str = "interlock"
+    """Driver implements `is_interlock`."""
+
+    HARDWARE_SWEEP: str = "hardware_sweep"
+    """Driver implements `prepare_sweep(points, source_delay)` and
+    `fetch_sweep(abort=None)` returning current, voltage and relative
+    timestamp tuples, aborting and returning no readings once `abort()` is
+    `True` (source meters) or `prepare_list_sweep(points, step_delay)` and
+    `fetch_list_sweep()` returning impedance tuples (LCR meters)."""
+
+    TRACE_BUFFER: str = "trace_buffer"
+    """Driver implements `prepare_buffer(points)` starting free running
+    acquisition, `fetch_buffer()` returning current and relative timestamp
+    tuples acquired since the last fetch and `abort_buffer()`."""
+
+    SERVICE_REQUEST: str = "service_request"
+    """Driver waits for operation complete using `_wait_for_opc`, which can
+    use service requests."""
+
+    SIMULTANEOUS_IV: str = "simultaneous_iv"
+    """`measure_iv` acquires current and voltage with a single reading.
+    Source meters declaring neither this nor `MEASURE_V` are read by
+    `measure_i` only, skipping the voltage query."""
+
+    COMPLIANCE_IN_READING: str = "compliance_in_reading"
+    """`measure_iv(status=True)` returns the compliance state with the
+    reading, saving the `compliance_tripped` query."""
+
+
+class WritePacer:
+    """Adaptive pacing of writes for legacy instruments requiring a gap
+    between commands.
+
+    The gap starts at the fixed maximum delay and is halved after every write
+    the instrument accepted without setting the error bit of its serial poll
+    status byte. On error the gap returns to the maximum delay and twice the
+    failed gap becomes the new lower limit, the error is read (clearing the
+    error bit) and the write is sent once more. If serial poll is not
+    available the fixed maximum delay is used.
+    """
+
+    error_mask: int = 0x20
+
+    def __init__(self, min_delay: float = 0.010) -> None:
+        self.min_delay: float = min_delay
+        self.delay: float = float("inf")
+        self.adaptive: bool = True
+        self.timestamp: float = 0.0
+
+    def wait(self, max_delay: float) -> None:
+        """Sleep until the current gap after the previous write elapsed."""
+        self.delay = min(self.delay, max_delay)
+        offset = self.timestamp + self.delay
+        while True:
+            remaining = offset - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.025))
+
+    def update(self, read_stb: Callable[[], int], max_delay: float) -> bool:
+        """Adjust gap by serial polling the instrument after a write, returns
+        `False` if the instrument reports an error.
+        """
+        self.timestamp = time.monotonic()
+        if not self.adaptive:
+            return True
+        try:
+            status = read_stb()
+        except Exception as exc:
+            logger.warning("serial poll failed, using fixed write delay: %s", exc)
+            self.adaptive = False
+            self.delay = max_delay
+            return True
+        if status & self.error_mask:
+            if self.delay < max_delay:
+                self.min_delay = min(max_delay, self.delay * 2)
+                logger.info("write pacing: error at %.3f s gap, limit is now %.3f s", self.delay, self.min_delay)
+            self.delay = max_delay
+            return False
+        self.delay = max(self.min_delay, min(max_delay, self.delay / 2))
+        return True
+
+    def write(self, write: Callable[[str], Any], read_stb: Callable[[], int],
+              next_error: Callable[[], Tuple[int, str]], message: str, max_delay: float) -> None:
+        """Write message paced. On error the error is read by `next_error`
+        and the message is sent again at the maximum gap, raises
+        `RuntimeError` if the instrument reports an error again.
+        """
+        for attempt in range(2):
+            self.wait(max_delay)
+            write(message)
+            if self.update(read_stb, max_delay):
+                return
+            self.wait(max_delay)
+            code, error = next_error()
+            self.timestamp = time.monotonic()
+            if attempt:
+                raise RuntimeError(f"Instrument rejected command {message!r}: {code}: {error}")
+            logger.warning("write pacing: command %r rejected (%d: %s), sending again", message, code, error)
+
+
 class Driver(ABC):
 
+    command_separator: str = ";"
+    """Separator for joining pipelined writes into compound commands."""
+
+    capabilities: FrozenSet[str] = frozenset()
+    """Optional features implemented by the driver, see `Capability`."""
+
     def __init__(self, resource):
         self.resource = resource
+        self._pipeline_enabled: bool = False
+        self._pipeline_size: int = 8
+        self._pipeline: List[str] = []
+        self._settings: Dict[str, str] = {}
+        self._settings_reconnects: int = 0
+        # Set by `_request_opc` until awaited, a result stored by awaiting
+        # elsewhere (e.g. on an event loop) is returned by `_wait_for_opc`
+        self.opc_requested: bool = False
+        self.opc_result: Optional[bool] = None
+
+    def set_pipeline_enabled(self, enabled: bool, size: int = 8) -> None:
+        """Enable pipelined write mode, queued writes are sent as compound
+        commands and synchronized at fence points only (before a query, by
+        calling `flush` or when `size` writes are queued).
+        """
+        self.flush()
+        self._pipeline_enabled = enabled
+        self._pipeline_size = max(1, size)
+
+    def flush(self, wait: bool = True) -> None:
+        """Send queued writes, wait for operation complete if `wait` is set."""
+        if self._pipeline:
+            message = self.command_separator.join(self._pipeline)
+            self._pipeline.clear()
+            self.resource.write(message)
+            if wait:
+                self.resource.query("*OPC?")
+
+    def _queue_write(self, message: str) -> bool:
+        """Queue message in pipelined write mode, return `True` if queued."""
+        if not self._pipeline_enabled:
+            return False
+        self._pipeline.append(message)
+        if len(self._pipeline) >= self._pipeline_size:
+            self.flush()
+        return True
+
+    def invalidate_settings(self) -> None:
+        """Forget last written settings, next setters write unconditionally."""
+        self._settings.clear()
+
+    def restore(self, options: dict) -> None:
+        """Configure instrument again and write all cached settings, e.g. on
+        a new session after a reconnect. Settings are written immediately,
+        also in pipelined write mode.
+        """
+        settings = list(self._settings.values())
+        self.invalidate_settings()
+        pipeline_enabled = self._pipeline_enabled
+        self._pipeline_enabled = False
+        try:
+            self.configure(options)
+            for message in settings:
+                self._write_setting(message)
+        finally:
+            self._pipeline_enabled = pipeline_enabled
+
+    def _write_setting(self, message: str) -> None:
+        """Write setting unless identical to the last written value of the
+        same command header. Cached values of related headers (one being a
+        prefix of the other, e.g. range and auto range) are dropped.
+        """
+        if self._settings_reconnects != self.resource.reconnects:
+            self._settings_reconnects = self.resource.reconnects
+            self.invalidate_settings()
+        header = self._setting_header(message)
+        if self._settings.get(header) == message:
+            return
+        for key in list(self._settings):
+            if key.startswith(header) or header.startswith(key):
+                del self._settings[key]
+        self._write(message)
+        self._settings[header] = message
+
+    def _setting_header(self, message: str) -> str:
+        """Return command header of a setting used as cache key."""
+        return message.split(None, 1)[0] if message.strip() else message
+
+    @handle_exception
+    def _query_binary(self, message: str, datatype: str = "d"):
+        """Query big endian binary block into an array of `datatype`."""
+        self.flush(wait=False)
+        return self.resource.query_binary_values(message, datatype, True)
+
+    @handle_exception
+    def _request_opc(self) -> None:
+        """Write `*OPC` to be awaited by `_wait_for_opc`, arming service
+        requests before so that an early completion is not missed.
+        """
+        self.flush(wait=False)
+        self.resource.prepare_opc()
+        self.resource.write("*OPC")
+        self.opc_requested = True
+        self.opc_result = None
+
+    @handle_exception
+    def _wait_for_opc(self, timeout: float, abort: Optional[Callable[[], bool]] = None) -> bool:
+        """Wait for operation complete after writing `*OPC`, returns `False` on
+        timeout or if `abort` returns `True`. Uses service requests if enabled
+        for the resource.
+        """
+        self.flush(wait=False)
+        self.opc_requested = False
+        if self.opc_result is not None:
+            result, self.opc_result = self.opc_result, None
+            return result
+        return self.resource.wait_for_opc(timeout, abort)
 
     @abstractmethod
     def identity(self) -> str:
@@ -50,6 +271,9 @@ class Driver(ABC):
 
 class SourceMeter(Driver):
 
+    max_ramp_step: float = math.inf
+    """Maximum voltage step of ramps for this instrument."""
+
     @abstractmethod
     def get_output_enabled(self) -> bool:
         ...
@@ -86,6 +310,19 @@ class SourceMeter(Driver):
     def measure_iv(self) -> Tuple[float, float]:
         ...
 
+    def initiate(self) -> None:
+        """Start a reading to be returned by `fetch` (optional)."""
+        ...
+
+    def fetch(self, status: bool = False) -> Tuple:
+        """Return reading started by `initiate`, defaults to `measure_iv`.
+        If `status` is set current, voltage and compliance state are
+        returned, requires `Capability.COMPLIANCE_IN_READING`.
+        """
+        if status:
+            return self.measure_iv(status=True)
+        return self.measure_iv()
+
 
 class Electrometer(SourceMeter):
 
@@ -97,13 +334,30 @@ class Electrometer(SourceMeter):
     def measure_i(self) -> float:
         ...
 
+    def fetch(self) -> float:
+        """Return reading started by `initiate`, defaults to `measure_i`."""
+        return self.measure_i()
+
 
 class LCRMeter(SourceMeter):
 
+    max_ramp_step: float = 1.0
+    """DC bias is applied through the measurement terminals, small steps
+    limit charging currents into the meter input."""
+
+    list_sweep_size: int = 0
+    """Maximum number of bias points per list sweep."""
+
     @abstractmethod
     def measure_impedance(self) -> Tuple[float, float]:
         ...
 
+    def fetch(self) -> Tuple[float, float]:
+        """Return reading started by `initiate`, defaults to
+        `measure_impedance`.
+        """
+        return self.measure_impedance()
+
 
 class DMM(Driver):
 
@@ -111,6 +365,22 @@ class DMM(Driver):
     def measure_temperature(self) -> float:
         ...
 
+    def initiate(self) -> None:
+        """Start a reading to be returned by `fetch` (optional)."""
+        ...
+
+    def fetch(self) -> float:
+        """Return reading started by `initiate`, defaults to
+        `measure_temperature`.
+        """
+        return self.measure_temperature()
+
+    def channel_temperatures(self) -> Dict[str, float]:
+        """Return temperatures of the last reading by channel, for drivers
+        scanning multiple channels (optional).
+        """
+        return {}
+
 
 class SwitchingMatrix(Driver):
 
@@ -1,8 +1,7 @@
-import time
 import logging
 from typing import Tuple
 
-from .driver import SourceMeter, handle_exception
+from .driver import Capability, SourceMeter, WritePacer, handle_exception
 
 __all__ = ["K237"]
 
@@ -40,15 +39,26 @@ logger = logging.getLogger(__name__)
 
 class K237(SourceMeter):
 
+    capabilities = frozenset({
+        Capability.COMPLIANCE_IN_READING,
+    })
+
     WRITE_DELAY = 0.250
+    """Maximum gap between writes, used until a shorter gap is learned."""
+
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._pacer: WritePacer = WritePacer()
 
     def identity(self) -> str:
         return self._query("U0X")
 
     def reset(self) -> None:
+        self.invalidate_settings()
         self.resource.clear()
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self.resource.clear()
 
     def next_error(self) -> Tuple[int, str]:
@@ -59,7 +69,7 @@ class K237(SourceMeter):
         return 0, "No Error"
 
     def configure(self, options: dict) -> None:
-        self._write("F0,0X")  # function VOLT
+        self._write_setting("F0,0X")  # function VOLT
         self._write("B0,0,0X")  # bias to auto
         filter_mode = options.get("filter.mode", 0)
         self._write(f"P{filter_mode:d}X")
@@ -72,7 +82,7 @@ class K237(SourceMeter):
         self._write(value)
 
     def get_voltage_level(self) -> float:
-        self._write("G1,2,0X")
+        self._write_setting("G1,2,0X")
         return float(self._query("X"))
 
     def set_voltage_level(self, level: float) -> None:
@@ -86,28 +96,30 @@ class K237(SourceMeter):
         self._write(f"L{level:.3E},0X")
 
     def compliance_tripped(self) -> bool:
-        self._write("G1,0,0X")
+        self._write_setting("G1,0,0X")
         return self._query("X")[0:2] == "OS"
 
     def measure_i(self) -> float:
-        self._write("G4,2,0X")
+        self._write_setting("G4,2,0X")
         return float(self._query("X"))
 
-    def measure_iv(self) -> Tuple[float, float]:
+    def measure_iv(self, status: bool = False) -> Tuple:
+        if status:
+            # Prefixed source and measure value, source prefix reports compliance
+            self._write_setting("G5,0,0X")
+            source, measure = self._query("X").split(",")[:2]
+            return float(measure[5:]), float(source[5:]), source[0:2] == "OS"
         i = self.measure_i()
         v = self.get_voltage_level()  # not possible in function VOLT
         return i, v
 
     @handle_exception
     def _write(self, message):
-        if not hasattr(self, "_write_timestamp"):
-            self._write_timestamp = 0
-        offset = self._write_timestamp + abs(type(self).WRITE_DELAY)
-        interval = 0.025
-        while time.time() < offset:
-            time.sleep(interval)
-        self.resource.write(message)
-        self._write_timestamp = time.time()
+        self._pacer.write(self.resource.write, self.resource.read_stb, self.next_error, message, abs(self.WRITE_DELAY))
+
+    def _setting_header(self, message: str) -> str:
+        # Device dependent commands are identified by their first letter
+        return message[:1]
 
     @handle_exception
     def _query(self, message):
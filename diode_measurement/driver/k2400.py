@@ -1,23 +1,35 @@
-from typing import Tuple
+from typing import Callable, List, Optional, Tuple
 
-from .driver import SourceMeter, handle_exception
+from .driver import Capability, SourceMeter, handle_exception
 
 __all__ = ["K2400"]
 
 
 class K2400(SourceMeter):
 
+    capabilities = frozenset({
+        Capability.MEASURE_V,
+        Capability.HARDWARE_SWEEP,
+        Capability.SERVICE_REQUEST,
+        Capability.SIMULTANEOUS_IV,
+        Capability.COMPLIANCE_IN_READING,
+    })
+
     def __init__(self, resource) -> None:
         super().__init__(resource)
-        self._format_element = None
+        self._sweep_count: int = 0
+        self._sweep_timeout: float = 0.0
+        self._source_delay: Optional[Tuple[bool, float]] = None
 
     def identity(self) -> str:
         return self._query("*IDN?")
 
     def reset(self) -> None:
+        self.invalidate_settings()
         self._write("*RST")
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self._write("*CLS")
 
     def next_error(self) -> Tuple[int, str]:
@@ -41,7 +53,7 @@ class K2400(SourceMeter):
 
         self._write(":SENS:FUNC:CONC ON")  # enable concurrent measurements
         self._write(":SENS:FUNC:ON 'VOLT','CURR'")
-        self._write(":FORM:ELEM VOLT,CURR")
+        self._write_setting(":FORM:ELEM VOLT,CURR,STAT")
 
         filter_mode = options.get("filter.mode", "MOV")
         self.set_sense_average_tcontrol(filter_mode)
@@ -69,10 +81,10 @@ class K2400(SourceMeter):
         self._write(f":SOUR:VOLT:LEV {level:.3E}")
 
     def set_voltage_range(self, level: float) -> None:
-        self._write(f":SOUR:VOLT:RANG {level:.3E}")
+        self._write_setting(f":SOUR:VOLT:RANG {level:.3E}")
 
     def set_current_compliance_level(self, level: float) -> None:
-        self._write(f":SENS:CURR:PROT:LEV {level:.3E}")
+        self._write_setting(f":SENS:CURR:PROT:LEV {level:.3E}")
 
     def compliance_tripped(self) -> bool:
         return self._query(":SENS:CURR:PROT:TRIP?") == "1"
@@ -85,13 +97,73 @@ class K2400(SourceMeter):
         _, v = self.measure_iv()
         return v
 
-    def measure_iv(self) -> Tuple[float, float]:
-        if self._format_element != "VOLT,CURR":
-            self._write(":FORM:ELEM VOLT,CURR")
-            self._format_element = "VOLT,CURR"
-        v, i = self._query(":READ?").split(",")[:2]
+    def measure_iv(self, status: bool = False) -> Tuple:
+        self._write_setting(":FORM:ELEM VOLT,CURR,STAT")
+        v, i, stat = self._query(":READ?").split(",")[:3]
+        if status:
+            # Status word bit 3: in compliance
+            return float(i), float(v), bool(int(float(stat)) & 0x8)
         return float(i), float(v)
 
+    def prepare_sweep(self, points: List[float], source_delay: float) -> None:
+        """Program source list sweep (up to 100 points)."""
+        levels = ",".join(format(level, ".3E") for level in points)
+        # Source delay is restored after the sweep
+        self._source_delay = self._query(":SOUR:DEL:AUTO?") == "1", float(self._query(":SOUR:DEL?"))
+        self._write(":SOUR:VOLT:MODE LIST")
+        self._write(f":SOUR:LIST:VOLT {levels}")
+        # Output returns to fixed level after the sweep
+        self._write(f":SOUR:VOLT:LEV {points[-1]:.3E}")
+        self._write(f":SOUR:DEL {source_delay:E}")
+        self._write(f":TRIG:COUN {len(points):d}")
+        self._write_setting(":FORM:ELEM VOLT,CURR,TIME")
+        self._sweep_count = len(points)
+        self._sweep_timeout = 10.0 + len(points) * (source_delay + 1.0)
+
+    def fetch_sweep(self, timeout: Optional[float] = None,
+                    abort: Optional[Callable[[], bool]] = None) -> List[Tuple[float, float, float]]:
+        """Run prepared sweep and return list of current, voltage and relative
+        timestamp tuples for every point. If `abort` returns `True` while
+        waiting the sweep is aborted and no readings are returned.
+        """
+        if timeout is None:
+            timeout = self._sweep_timeout
+        # Request operation complete
+        self._write("*CLS")
+        self._request_opc()
+        # Initiate sweep
+        self._write_nowait(":INIT")
+        if not self._wait_for_opc(timeout, abort):
+            if abort is not None and abort():
+                self._write_nowait(":ABOR")
+                self._restore_sweep()
+                return []
+            raise RuntimeError(f"Sweep timeout, exceeded {timeout:G} s")
+        # Binary transfer, instrument supports 32 bit floats only
+        self._write_setting(":FORM:BORD NORM")
+        self._write_setting(":FORM:DATA REAL,32")
+        try:
+            values = self._query_binary(":FETC?", "f")
+        finally:
+            self._write_setting(":FORM:DATA ASC")
+        self._restore_sweep()
+        try:
+            offset = values[2] if values else 0.0
+            return [(values[index + 1], values[index], values[index + 2] - offset) for index in range(0, len(values), 3)]
+        except Exception as exc:
+            raise RuntimeError(f"Failed to parse sweep readings: {values!r}") from exc
+
+    def _restore_sweep(self) -> None:
+        """Return to fixed source mode and restore the source delay."""
+        self._write(":SOUR:VOLT:MODE FIX")
+        if self._source_delay is not None:
+            auto_delay, source_delay = self._source_delay
+            if auto_delay:
+                self._write(":SOUR:DEL:AUTO ON")
+            else:
+                self._write(f":SOUR:DEL {source_delay:E}")
+        self._write(":TRIG:COUN 1")
+
     def set_system_beeper_state(self, state: bool) -> None:
         self._write(f":SYST:BEEP:STAT {state:d}")
 
@@ -102,22 +174,29 @@ class K2400(SourceMeter):
         self._write(f":SOUR:FUNC {function}")
 
     def set_sense_average_tcontrol(self, tcontrol: str) -> None:
-        self._write(f":SENS:AVER:TCON {tcontrol}")
+        self._write_setting(f":SENS:AVER:TCON {tcontrol}")
 
     def set_sense_average_count(self, count: int) -> None:
-        self._write(f":SENS:AVER:COUN {count:d}")
+        self._write_setting(f":SENS:AVER:COUN {count:d}")
 
     def set_sense_average_state(self, state: bool) -> None:
-        self._write(f":SENS:AVER:STAT {state:d}")
+        self._write_setting(f":SENS:AVER:STAT {state:d}")
 
     def set_sense_current_nplc(self, nplc: float) -> None:
-        self._write(f":SENS:CURR:NPLC {nplc:E}")
+        self._write_setting(f":SENS:CURR:NPLC {nplc:E}")
 
     @handle_exception
     def _write(self, message):
+        if not self._queue_write(message):
+            self.resource.write(message)
+            self.resource.query("*OPC?")
+
+    @handle_exception
+    def _write_nowait(self, message):
+        self.flush(wait=False)
         self.resource.write(message)
-        self.resource.query("*OPC?")
 
     @handle_exception
     def _query(self, message):
+        self.flush(wait=False)
         return self.resource.query(message).strip()
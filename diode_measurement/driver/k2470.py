@@ -1,19 +1,33 @@
-from typing import Tuple
+from typing import Callable, List, Optional, Tuple
 
-from .driver import SourceMeter, handle_exception
+from .driver import Capability, SourceMeter, handle_exception
 
 __all__ = ["K2470"]
 
 
 class K2470(SourceMeter):
 
+    capabilities = frozenset({
+        Capability.MEASURE_V,
+        Capability.INTERLOCK,
+        Capability.HARDWARE_SWEEP,
+        Capability.SERVICE_REQUEST,
+    })
+
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._sweep_count: int = 0
+        self._sweep_timeout: float = 0.0
+
     def identity(self) -> str:
         return self._query("*IDN?")
 
     def reset(self) -> None:
+        self.invalidate_settings()
         self._write("*RST")
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self._write("*CLS")
 
     def next_error(self) -> Tuple[int, str]:
@@ -57,10 +71,10 @@ class K2470(SourceMeter):
         self._write(f":SOUR:VOLT:LEV {level:.3E}")
 
     def set_voltage_range(self, level: float) -> None:
-        self._write(f":SOUR:VOLT:RANG {level:.3E}")
+        self._write_setting(f":SOUR:VOLT:RANG {level:.3E}")
 
     def set_current_compliance_level(self, level: float) -> None:
-        self._write(f":SOUR:VOLT:ILIM:LEV {level:.3E}")
+        self._write_setting(f":SOUR:VOLT:ILIM:LEV {level:.3E}")
 
     def compliance_tripped(self) -> bool:
         return self._query(":SOUR:VOLT:ILIM:LEV:TRIP?") == "1"
@@ -76,6 +90,45 @@ class K2470(SourceMeter):
         v = self.measure_v()
         return i, v
 
+    def prepare_sweep(self, points: List[float], source_delay: float) -> None:
+        """Program source list sweep acquiring into default buffer."""
+        levels = ",".join(format(level, ".3E") for level in points)
+        self._write(":SENS:FUNC \"CURR\"")
+        self._write(f":SOUR:LIST:VOLT {levels}")
+        self._write(f":SOUR:SWE:VOLT:LIST 1, {source_delay:E}")
+        self._write(":TRAC:CLE")
+        self._sweep_count = len(points)
+        self._sweep_timeout = 10.0 + len(points) * (source_delay + 1.0)
+
+    def fetch_sweep(self, timeout: Optional[float] = None,
+                    abort: Optional[Callable[[], bool]] = None) -> List[Tuple[float, float, float]]:
+        """Run prepared sweep and return list of current, source voltage and
+        relative timestamp tuples for every point. If `abort` returns `True`
+        while waiting the sweep is aborted and no readings are returned.
+        """
+        if timeout is None:
+            timeout = self._sweep_timeout
+        # Request operation complete
+        self._write("*CLS")
+        self._request_opc()
+        # Initiate sweep
+        self._write_nowait(":INIT")
+        if not self._wait_for_opc(timeout, abort):
+            if abort is not None and abort():
+                self._write_nowait(":ABOR")
+                return []
+            raise RuntimeError(f"Sweep timeout, exceeded {timeout:G} s")
+        self._write_setting(":FORM:BORD NORM")
+        self._write_setting(":FORM:DATA REAL")
+        try:
+            values = self._query_binary(f":TRAC:DATA? 1, {self._sweep_count:d}, \"defbuffer1\", READ, SOUR, REL", "d")
+        finally:
+            self._write_setting(":FORM:DATA ASC")
+        try:
+            return [(values[index], values[index + 1], values[index + 2]) for index in range(0, len(values), 3)]
+        except Exception as exc:
+            raise RuntimeError(f"Failed to parse sweep readings: {values!r}") from exc
+
     def set_route_terminals(self, terminal: str) -> None:
         self._write(f":ROUT:TERM {terminal}")
 
@@ -83,16 +136,16 @@ class K2470(SourceMeter):
         self._write(f":SOUR:FUNC {function}")
 
     def set_sense_current_average_tcontrol(self, tcontrol: str) -> None:
-        self._write(f":SENS:CURR:AVER:TCON {tcontrol}")
+        self._write_setting(f":SENS:CURR:AVER:TCON {tcontrol}")
 
     def set_sense_current_average_count(self, count: int) -> None:
-        self._write(f":SENS:CURR:AVER:COUN {count:d}")
+        self._write_setting(f":SENS:CURR:AVER:COUN {count:d}")
 
     def set_sense_current_average_enable(self, state: bool) -> None:
-        self._write(f":SENS:CURR:AVER:STAT {state:d}")
+        self._write_setting(f":SENS:CURR:AVER:STAT {state:d}")
 
     def set_sense_current_nplc(self, nplc: float) -> None:
-        self._write(f":SENS:CURR:NPLC {nplc:E}")
+        self._write_setting(f":SENS:CURR:NPLC {nplc:E}")
 
     def set_system_breakdown_protection(self, state: bool) -> None:
         value = "ON" if state else "OFF"  # 0 and 1 not supported?
@@ -104,9 +157,16 @@ class K2470(SourceMeter):
 
     @handle_exception
     def _write(self, message):
+        if not self._queue_write(message):
+            self.resource.write(message)
+            self.resource.query("*OPC?")
+
+    @handle_exception
+    def _write_nowait(self, message):
+        self.flush(wait=False)
         self.resource.write(message)
-        self.resource.query("*OPC?")
 
     @handle_exception
     def _query(self, message):
+        self.flush(wait=False)
         return self.resource.query(message).strip()
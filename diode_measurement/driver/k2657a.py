@@ -1,19 +1,37 @@
-from typing import Tuple
+import time
+from typing import Callable, List, Optional, Tuple
 
-from .driver import SourceMeter, handle_exception
+from .driver import Capability, SourceMeter, handle_exception
 
 __all__ = ["K2657A"]
 
 
 class K2657A(SourceMeter):
 
+    capabilities = frozenset({
+        Capability.MEASURE_V,
+        Capability.HARDWARE_SWEEP,
+        Capability.SIMULTANEOUS_IV,
+        Capability.COMPLIANCE_IN_READING,
+    })
+
+    SWEEP_SCRIPT = "diodeMeasurementSweep"
+
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._sweep_count: int = 0
+        self._sweep_timeout: float = 0.0
+        self._source_delay: Optional[float] = None
+
     def identity(self) -> str:
         return self._query("*IDN?")
 
     def reset(self) -> None:
+        self.invalidate_settings()
         self._write("reset()")
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self._write("status.reset()")
 
     def next_error(self) -> Tuple[int, str]:
@@ -54,10 +72,10 @@ class K2657A(SourceMeter):
         self._write(f"smua.source.levelv = {level:.3E}")
 
     def set_voltage_range(self, level: float) -> None:
-        self._write(f"smua.source.rangev = {level:.3E}")
+        self._write_setting(f"smua.source.rangev = {level:.3E}")
 
     def set_current_compliance_level(self, level: float) -> None:
-        self._write(f"smua.source.limiti = {level:.3E}")
+        self._write_setting(f"smua.source.limiti = {level:.3E}")
 
     def compliance_tripped(self) -> bool:
         return self._print("smua.source.compliance").lower() == "true"
@@ -68,10 +86,73 @@ class K2657A(SourceMeter):
     def measure_v(self) -> float:
         return float(self._print("smua.measure.v()"))
 
-    def measure_iv(self) -> Tuple[float, float]:
-        i = self.measure_i()  # TODO print(smua.measure.iv())
-        v = self.measure_v()
-        return i, v
+    def measure_iv(self, status: bool = False) -> Tuple:
+        if status:
+            i, v, compliance = self._print("smua.measure.i(), smua.measure.v(), smua.source.compliance").split("\t")[:3]
+            return float(i), float(v), compliance.strip().lower() == "true"
+        i, v = self._print("smua.measure.iv()").split("\t")[:2]
+        return float(i), float(v)
+
+    def prepare_sweep(self, points: List[float], source_delay: float) -> None:
+        """Upload TSP script running a hardware timed list sweep, acquiring
+        current and voltage readings into `smua.nvbuffer1` and `smua.nvbuffer2`.
+        """
+        levels = ", ".join(format(level, ".3E") for level in points)
+        # Source delay is restored after the sweep
+        self._source_delay = float(self._print("smua.source.delay"))
+        script = [
+            f"loadscript {self.SWEEP_SCRIPT}",
+            "smua.nvbuffer1.clear()",
+            "smua.nvbuffer2.clear()",
+            "smua.nvbuffer1.collecttimestamps = 1",
+            f"smua.source.delay = {source_delay:E}",
+            f"smua.trigger.source.listv({{{levels}}})",
+            "smua.trigger.source.limiti = smua.source.limiti",
+            "smua.trigger.source.action = smua.ENABLE",
+            "smua.trigger.measure.iv(smua.nvbuffer1, smua.nvbuffer2)",
+            "smua.trigger.measure.action = smua.ENABLE",
+            "smua.trigger.endsweep.action = smua.SOURCE_HOLD",
+            f"smua.trigger.count = {len(points):d}",
+            "smua.trigger.arm.count = 1",
+            "smua.trigger.initiate()",
+            "endscript",
+        ]
+        for line in script:
+            self._write_nowait(line)
+        self._sweep_count = len(points)
+        self._sweep_timeout = 10.0 + len(points) * (source_delay + 1.0)
+
+    def fetch_sweep(self, timeout: Optional[float] = None, interval: float = 0.050,
+                    abort: Optional[Callable[[], bool]] = None) -> List[Tuple[float, float, float]]:
+        """Run prepared sweep and return list of current, voltage and relative
+        timestamp tuples for every point. If `abort` returns `True` while
+        waiting the sweep is aborted and no readings are returned.
+        """
+        if timeout is None:
+            timeout = self._sweep_timeout
+        count = self._sweep_count
+        self._write_nowait(f"{self.SWEEP_SCRIPT}()")
+        threshold = time.time() + timeout
+        while int(float(self._print("smua.nvbuffer2.n"))) < count:
+            if time.time() > threshold:
+                raise RuntimeError(f"Sweep timeout, exceeded {timeout:G} s")
+            if abort is not None and abort():
+                self._write_nowait("smua.abort()")
+                self._restore_source_delay()
+                return []
+            time.sleep(interval)
+        self._restore_source_delay()
+        result = self._query(f"printbuffer(1, {count:d}, smua.nvbuffer1.timestamps, smua.nvbuffer1.readings, smua.nvbuffer2.readings)")
+        try:
+            values = [float(value) for value in result.split(",")]
+            return [(values[index + 1], values[index + 2], values[index]) for index in range(0, len(values), 3)]
+        except Exception as exc:
+            raise RuntimeError(f"Failed to parse sweep readings: {result!r}") from exc
+
+    def _restore_source_delay(self) -> None:
+        """Restore source delay saved by `prepare_sweep`."""
+        if self._source_delay is not None:
+            self._write(f"smua.source.delay = {self._source_delay:E}")
 
     def set_beeper_enable(self, enabled: bool) -> None:
         value = {True: "ON", False: "OFF"}[enabled]
@@ -81,24 +162,31 @@ class K2657A(SourceMeter):
         self._write(f"smua.source.func = smua.OUTPUT_{function}")
 
     def set_measure_filter_type(self, filter_type: str) -> None:
-        self._write(f"smua.measure.filter.type = smua.FILTER_{filter_type}")
+        self._write_setting(f"smua.measure.filter.type = smua.FILTER_{filter_type}")
 
     def set_measure_filter_count(self, count: int) -> None:
-        self._write(f"smua.measure.filter.count = {count:d}")
+        self._write_setting(f"smua.measure.filter.count = {count:d}")
 
     def set_measure_filter_enable(self, enabled: bool) -> None:
-        self._write(f"smua.measure.filter.enable = {enabled:d}")
+        self._write_setting(f"smua.measure.filter.enable = {enabled:d}")
 
     def set_measure_nplc(self, nplc: float) -> None:
-        self._write(f"smua.measure.nplc = {nplc:E}")
+        self._write_setting(f"smua.measure.nplc = {nplc:E}")
 
     @handle_exception
     def _write(self, message):
+        if not self._queue_write(message):
+            self.resource.write(message)
+            self.resource.query("*OPC?")
+
+    @handle_exception
+    def _write_nowait(self, message):
+        self.flush(wait=False)
         self.resource.write(message)
-        self.resource.query("*OPC?")
 
     @handle_exception
     def _query(self, message):
+        self.flush(wait=False)
         return self.resource.query(message).strip()
 
     def _print(self, message):
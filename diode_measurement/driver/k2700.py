@@ -1,12 +1,38 @@
-from typing import Tuple
+import math
+import time
+from typing import Dict, List, Tuple
 
 from .driver import DMM, handle_exception
 
 __all__ = ["K2700"]
 
 
+def parse_channels(channels: str) -> List[str]:
+    """Return list of channels from channel list string, e.g. `101:103,105`
+    returns `["101", "102", "103", "105"]`.
+    """
+    result: List[str] = []
+    for token in channels.replace("(@", "").replace(")", "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        begin, _, end = token.partition(":")
+        if end:
+            result.extend(format(channel, "d") for channel in range(int(begin), int(end) + 1))
+        else:
+            result.append(format(int(begin), "d"))
+    return result
+
+
 class K2700(DMM):
 
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._scan_channels: List[str] = []
+        self._temperatures: List[float] = []
+        self._temperatures_timestamp: float = 0.0
+        self._temperatures_interval: float = 1.0
+
     def identity(self) -> str:
         return self._query("*IDN?")
 
@@ -14,6 +40,7 @@ class K2700(DMM):
         ...  # prevent reset
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self._write("*CLS")
 
     def next_error(self) -> Tuple[int, str]:
@@ -23,17 +50,84 @@ class K2700(DMM):
         return code, message
 
     def configure(self, options: dict) -> None:
-        ...
+        interval = options.get("temperature.interval", 1.0)
+        self.set_temperature_interval(interval)
+
+        channels = parse_channels(options.get("scan.channels", ""))
+        if channels:
+            transducer = options.get("scan.transducer", "TC")
+            sensor_type = options.get("scan.type", "K")
+            self.configure_scan(channels, transducer, sensor_type)
+        else:
+            self.disable_scan()
+
+    def set_temperature_interval(self, interval: float) -> None:
+        """Set minimum interval between temperature readings in seconds,
+        cached temperatures are returned in between.
+        """
+        self._temperatures_interval = max(0.0, interval)
+        self._temperatures = []
+
+    def configure_scan(self, channels: List[str], transducer: str, sensor_type: str) -> None:
+        """Configure internal scan of temperature channels, every `:READ?`
+        scans all channels once.
+        """
+        assert transducer in ["TC", "FRTD"]
+        channel_list = f"(@{','.join(channels)})"
+        self._write(":INIT:CONT OFF")
+        self._write(":TRAC:CLE")
+        self._write(f":SENS:FUNC 'TEMP',{channel_list}")
+        self._write(f":SENS:TEMP:TRAN {transducer},{channel_list}")
+        self._write(f":SENS:TEMP:{transducer}:TYPE {sensor_type},{channel_list}")
+        self._write(":TRIG:SOUR IMM")
+        self._write(":TRIG:COUN 1")
+        self._write(f":SAMP:COUN {len(channels):d}")
+        self._write(f":ROUT:SCAN {channel_list}")
+        self._write(":ROUT:SCAN:TSO IMM")
+        self._write(":ROUT:SCAN:LSEL INT")
+        self._scan_channels = list(channels)
+        self._temperatures = []
+
+    def disable_scan(self) -> None:
+        """Return to continuous single channel (front panel) readings."""
+        self._write(":ROUT:SCAN:LSEL NONE")
+        self._write(":SAMP:COUN 1")
+        self._write(":INIT:CONT ON")
+        self._scan_channels = []
+        self._temperatures = []
 
     def measure_temperature(self) -> float:
-        self._write(":FORM:ELEM READ")  # select reading as return value
-        return float(self._query(":FETC?"))
+        temperatures = self.measure_temperatures()
+        return temperatures[0] if temperatures else math.nan
+
+    def measure_temperatures(self) -> List[float]:
+        """Return temperatures of all scanned channels, or the front panel
+        reading if no scan is configured. Readings are cached for the
+        temperature interval.
+        """
+        timestamp = time.monotonic()
+        if not self._temperatures or timestamp - self._temperatures_timestamp >= self._temperatures_interval:
+            self._write_setting(":FORM:ELEM READ")  # select reading as return value
+            if self._scan_channels:
+                result = self._query(":READ?")
+            else:
+                result = self._query(":FETC?")
+            self._temperatures = [float(value) for value in result.split(",")]
+            self._temperatures_timestamp = timestamp
+        return self._temperatures
+
+    def channel_temperatures(self) -> Dict[str, float]:
+        if not self._scan_channels:
+            return {}
+        return dict(zip(self._scan_channels, self._temperatures))
 
     @handle_exception
     def _write(self, message):
-        self.resource.write(message)
-        self.resource.query("*OPC?")
+        if not self._queue_write(message):
+            self.resource.write(message)
+            self.resource.query("*OPC?")
 
     @handle_exception
     def _query(self, message):
+        self.flush(wait=False)
         return self.resource.query(message).strip()
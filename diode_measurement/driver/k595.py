@@ -1,8 +1,7 @@
 import math
-import time
 from typing import Tuple
 
-from .driver import LCRMeter, handle_exception
+from .driver import LCRMeter, WritePacer, handle_exception
 
 __all__ = ["K595"]
 
@@ -20,14 +19,21 @@ ERROR_MESSAGES = {
 class K595(LCRMeter):
 
     WRITE_DELAY = 0.250
+    """Maximum gap between writes, used until a shorter gap is learned."""
+
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._pacer: WritePacer = WritePacer()
 
     def identity(self) -> str:
         return self._query("U0X")[:3]
 
     def reset(self) -> None:
+        self.invalidate_settings()
         self.resource.clear()
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self.resource.clear()
 
     def next_error(self) -> Tuple[int, str]:
@@ -48,8 +54,8 @@ class K595(LCRMeter):
         ...  # not available
 
     def get_voltage_level(self) -> float:
-        self._write("F1X")
-        self._write("G1X")
+        self._write_setting("F1X")
+        self._write_setting("G1X")
         return float(self._query("X").split(",")[1])
 
     def set_voltage_level(self, level: float) -> None:
@@ -62,33 +68,30 @@ class K595(LCRMeter):
         ...  # not available
 
     def compliance_tripped(self) -> bool:
-        self._write("F1X")
-        self._write("G1X")
+        self._write_setting("F1X")
+        self._write_setting("G1X")
         return self._query("X")[0] == "O"
 
     def measure_i(self) -> float:
-        self._write("F1X")
-        self._write("G1X")
+        self._write_setting("F1X")
+        self._write_setting("G1X")
         return float(self._query("X").split(",")[0])
 
     def measure_iv(self) -> Tuple[float, float]:
         return self.measure_i(), float("nan")  # TODO
 
     def measure_impedance(self) -> Tuple[float, float]:
-        self._write("F0X")
-        self._write("G1X")
+        self._write_setting("F0X")
+        self._write_setting("G1X")
         return float(self._query("X").split(",")[0]), math.nan
 
     @handle_exception
     def _write(self, message):
-        if not hasattr(self, "_write_timestamp"):
-            self._write_timestamp = 0
-        offset = self._write_timestamp + abs(type(self).WRITE_DELAY)
-        interval = max(0.025, abs(type(self).WRITE_DELAY / 100.))
-        while time.time() < offset:
-            time.sleep(interval)
-        self.resource.write(message)
-        self._write_timestamp = time.time()
+        self._pacer.write(self.resource.write, self.resource.read_stb, self.next_error, message, abs(self.WRITE_DELAY))
+
+    def _setting_header(self, message: str) -> str:
+        # Device dependent commands are identified by their first letter
+        return message[:1]
 
     @handle_exception
     def _query(self, message):
@@ -1,20 +1,35 @@
-import time
+import logging
+import math
 from typing import List, Tuple
 
-from .driver import Electrometer, handle_exception
+from .driver import Capability, Electrometer, handle_exception
 
 __all__ = ["K6517B"]
 
+logger = logging.getLogger(__name__)
+
 
 class K6517B(Electrometer):
 
+    capabilities = frozenset({
+        Capability.TRACE_BUFFER,
+        Capability.SERVICE_REQUEST,
+    })
+
+    def __init__(self, resource) -> None:
+        super().__init__(resource)
+        self._buffer_points: int = 0
+        self._buffer_index: int = 0
+
     def identity(self) -> str:
         return self._query("*IDN?").strip()
 
     def reset(self) -> None:
+        self.invalidate_settings()
         self._write("*RST")
 
     def clear(self) -> None:
+        self.invalidate_settings()
         self._write("*CLS")
 
     def next_error(self) -> Tuple[int, str]:
@@ -75,74 +90,115 @@ class K6517B(Electrometer):
     def compliance_tripped(self) -> bool:
         return bool(int(self._query(":SOUR:CURR:LIM?")))
 
-    def measure_i(self, timeout=10.0, interval=0.250):
+    def measure_i(self, timeout=10.0):
+        self.initiate()
+        return self.fetch(timeout)
+
+    def initiate(self) -> None:
         # Request operation complete
         self._write("*CLS")
-        self._write_nowait("*OPC")
+        self._request_opc()
         # Initiate measurement
         self._write_nowait(":INIT")
-        threshold = time.time() + timeout
-        interval = min(timeout, interval)
-        while time.time() < threshold:
-            # Read event status
-            if int(self._query("*ESR?")) & 0x1:
-                try:
-                    result = self._query(":FETC?")
-                    return float(result.split(",")[0])
-                except Exception as exc:
-                    raise RuntimeError(f"Failed to fetch ELM reading: {exc}") from exc
-            time.sleep(interval)
-        raise RuntimeError(f"Electrometer reading timeout, exceeded {timeout:G} s")
+
+    def fetch(self, timeout=10.0) -> float:
+        if not self._wait_for_opc(timeout):
+            raise RuntimeError(f"Electrometer reading timeout, exceeded {timeout:G} s")
+        try:
+            result = self._query(":FETC?")
+            return float(result.split(",")[0])
+        except Exception as exc:
+            raise RuntimeError(f"Failed to fetch ELM reading: {exc}") from exc
 
     def measure_iv(self) -> Tuple[float, float]:
-        i = self.measure_i(), float("nan")  # TODO
+        return self.measure_i(), math.nan
+
+    def prepare_buffer(self, points: int) -> None:
+        self._write(":ABOR")
+        self.set_format_elements(["READ", "TST"])
+        self._write_setting(":FORM:BORD NORM")
+        self._write_setting(":FORM:DATA REAL,64")
+        self._write(":TRAC:CLE")
+        self._write(f":TRAC:POIN {points:d}")
+        self._write(":TRAC:FEED SENS")
+        self._write(":TRAC:FEED:CONT NEXT")
+        self._write(":SYST:TST:REL:RES")
+        self._write(":INIT:CONT ON")
+        self._buffer_points = points
+        self._buffer_index = 0
+
+    def fetch_buffer(self) -> List[Tuple[float, float]]:
+        count = int(self._query(":TRAC:POIN:ACT?"))
+        if count <= self._buffer_index:
+            return []
+        # Read new readings only, buffer keeps filling
+        values = self._query_binary(f":TRAC:DATA:SEL? {self._buffer_index:d},{count - self._buffer_index:d}", "d")
+        readings = [(values[index], values[index + 1]) for index in range(0, len(values) - 1, 2)]
+        self._buffer_index += len(readings)
+        if self._buffer_index >= self._buffer_points:
+            # Buffer full, storage stopped: re-arm for next readings
+            logger.warning("ELM trace buffer full, readings might be lost.")
+            self._write(":TRAC:CLE")
+            self._write(":TRAC:FEED:CONT NEXT")
+            self._buffer_index = 0
+        return readings
+
+    def abort_buffer(self) -> None:
+        self._write(":INIT:CONT OFF")
+        self._write(":ABOR")
+        self._write(":TRAC:FEED:CONT NEV")
+        self._write_setting(":FORM:DATA ASC")
+        self.set_format_elements(["READ"])
 
     def set_format_elements(self, elements: List[str]) -> None:
         value = ",".join(elements)
-        self._write(f":FORM:ELEM {value}")
+        self._write_setting(f":FORM:ELEM {value}")
 
     def set_sense_function(self, function: str) -> None:
         self._write(f":SENS:FUNC '{function}'")
 
     def set_sense_current_range(self, level: float) -> None:
-        self._write(f":SENS:CURR:RANG {level:E}")
+        self._write_setting(f":SENS:CURR:RANG {level:E}")
 
     def set_sense_current_range_auto(self, enabled: bool) -> None:
-        self._write(f":SENS:CURR:RANG:AUTO {enabled:d}")
+        self._write_setting(f":SENS:CURR:RANG:AUTO {enabled:d}")
 
     def set_sense_current_range_auto_lower_limit(self, limit: float) -> None:
-        self._write(f":SENS:CURR:RANG:AUTO:LLIM {limit:E}")
+        self._write_setting(f":SENS:CURR:RANG:AUTO:LLIM {limit:E}")
 
     def set_sense_current_range_auto_upper_limit(self, limit: float) -> None:
-        self._write(f":SENS:CURR:RANG:AUTO:ULIM {limit:E}")
+        self._write_setting(f":SENS:CURR:RANG:AUTO:ULIM {limit:E}")
 
     def set_sense_current_average_tcontrol(self, tcontrol: str) -> None:
-        self._write(f":SENS:CURR:AVER:TCON {tcontrol}")
+        self._write_setting(f":SENS:CURR:AVER:TCON {tcontrol}")
 
     def set_sense_current_average_count(self, count: int) -> None:
-        self._write(f":SENS:CURR:AVER:COUN {count:d}")
+        self._write_setting(f":SENS:CURR:AVER:COUN {count:d}")
 
     def set_sense_current_average_state(self, state: bool) -> None:
-        self._write(f":SENS:CURR:AVER:STAT {state:d}")
+        self._write_setting(f":SENS:CURR:AVER:STAT {state:d}")
 
     def set_sense_current_nplcycles(self, nplc: float) -> None:
-        self._write(f":SENS:CURR:NPLC {nplc:E}")
+        self._write_setting(f":SENS:CURR:NPLC {nplc:E}")
 
     def set_source_voltage_mconnect(self, enabled: bool) -> None:
         self._write(f":SOUR:VOLT:MCON {enabled:d}")
 
     def set_zero_check_enabled(self, enabled: bool) -> None:
-        self._write(f":SYST:ZCH {enabled:d}")
+        self._write_setting(f":SYST:ZCH {enabled:d}")
 
     @handle_exception
     def _write(self, message):
-        self.resource.write(message)
-        self.resource.query("*OPC?")
+        if not self._queue_write(message):
+            self.resource.write(message)
+            self.resource.query("*OPC?")
 
     @handle_exception
     def _write_nowait(self, message):
+        self.flush(wait=False)
         self.resource.write(message)
 
     @handle_exception
     def _query(self, message):
+        self.flush(wait=False)
         return self.resource.query(message).strip()
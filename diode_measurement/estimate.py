@@ -25,6 +25,10 @@ class Estimate:
         self._start = datetime.datetime.now()
         self._prev = datetime.datetime.now()
 
+    def set_count(self, count):
+        """Update expected count, e.g. for runs of variable length."""
+        self._count = count
+
     def advance(self):
         now = datetime.datetime.now()
         self._deltas.append(now - self._prev)
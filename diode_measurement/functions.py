@@ -1,9 +1,10 @@
 """Functions module."""
 
+import math
 from decimal import Context, Decimal
-from typing import Generator
+from typing import Generator, List, Optional
 
-__all__ = ["LinearRange"]
+__all__ = ["LinearRange", "AdaptiveRange"]
 
 ctx: Context = Context(prec=24)
 
@@ -80,3 +81,91 @@ class LinearRange:
             # Yield end if range is incomplete (last odd step).
             if value != end:
                 yield float(end)
+
+
+class AdaptiveRange:
+    """Adaptive range function generator class.
+    Range is bound to [begin, end], the step width is adjusted by the
+    readings passed to `update` after every yielded value.
+
+    If the relative change of the reading since the previous point exceeds
+    `threshold`, the step is reduced proportionally (down to `min_step`).
+    If the change stays below a quarter of `threshold`, the step is doubled
+    (up to `step`). Readings reaching `limit_ratio` of `limit` force the
+    minimum step.
+
+    >>> r = AdaptiveRange(0, 10, 5, 1.25)
+    >>> for value in r:
+    ...     r.update(1e-9)
+    >>> r.points
+    [0.0, 5.0, 10.0]
+    """
+
+    noise_floor: float = 1e-12
+    """Lower bound of readings used as reference for relative changes."""
+
+    def __init__(self, begin: float, end: float, step: float, min_step: float,
+                 threshold: float = 0.1, limit: float = math.inf, limit_ratio: float = 0.5) -> None:
+        self.begin: float = begin
+        self.end: float = end
+        self.step: float = abs(step)
+        self.min_step: float = min(abs(min_step), abs(step)) or abs(step)
+        self.threshold: float = threshold
+        self.limit: float = abs(limit)
+        self.limit_ratio: float = limit_ratio
+        self.current_step: float = self.step
+        self.points: List[float] = []
+        self._reading: Optional[float] = None
+
+    @property
+    def distance(self) -> float:
+        """Return distance of range."""
+        return abs(self.end - self.begin)
+
+    def __len__(self) -> int:
+        """Return estimated number of steps, based on the points taken and
+        the current step width for the remaining distance.
+        """
+        if not self.step or not self.distance:
+            return 0
+        if not self.points:
+            return math.ceil(round(self.distance / min(self.step, self.distance), 9))
+        remaining = abs(self.end - self.points[-1])
+        return len(self.points) - 1 + math.ceil(round(remaining / self.current_step, 9))
+
+    def update(self, reading: float, current: float = math.nan) -> None:
+        """Adjust step width by reading taken at the last point, `current`
+        is compared against `limit` (defaults to reading).
+        """
+        if math.isnan(current):
+            current = reading
+        if math.isfinite(reading):
+            previous, self._reading = self._reading, reading
+            if previous is not None:
+                change = abs(reading - previous) / max(abs(previous), self.noise_floor)
+                if change > self.threshold:
+                    # Keep points on a grid of minimum steps
+                    count = math.floor(round(self.current_step * self.threshold / change / self.min_step, 9))
+                    self.current_step = self.min_step * max(1, count)
+                elif change < self.threshold / 4:
+                    self.current_step = min(self.step, self.current_step * 2)
+        if math.isfinite(current) and abs(current) >= self.limit * self.limit_ratio:
+            self.current_step = self.min_step
+
+    def __iter__(self) -> Generator[float, None, None]:
+        self.points = []
+        self._reading = None
+        self.current_step = self.step
+        if not self.step or not self.distance:
+            return
+        direction: float = 1.0 if self.end > self.begin else -1.0
+        value: float = float(self.begin)
+        while True:
+            self.points.append(value)
+            yield value
+            if value == self.end:
+                break
+            value = round(value + direction * self.current_step, 9)
+            # Do not overshoot or leave a remainder below the minimum step
+            if (self.end - value) * direction < self.min_step / 2:
+                value = float(self.end)
@@ -0,0 +1,128 @@
+"""Instrument I/O latency statistics."""
+
+import collections
+import math
+import re
+import threading
+
+from typing import Deque, Dict, List, Sequence
+
+__all__ = [
+    "normalize_command",
+    "percentile",
+    "CommandStatistics",
+    "IOStatistics",
+    "io_statistics",
+]
+
+RE_ASSIGNMENT = re.compile(r"^([\w.\[\]]+)\s*=")
+RE_NUMBER = re.compile(r"(?<![\w.])[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+def normalize_command(message: str) -> str:
+    """Return command mnemonic without arguments.
+
+    >>> normalize_command(":SOUR:VOLT:LEV 1.000E+01")
+    ':SOUR:VOLT:LEV'
+    >>> normalize_command("smua.source.levelv = 1.000E+01")
+    'smua.source.levelv'
+    >>> normalize_command("printbuffer(1, 10, smua.nvbuffer1.readings)")
+    'printbuffer(#, #, smua.nvbuffer1.readings)'
+    """
+    message = message.strip()
+    m = RE_ASSIGNMENT.match(message)
+    if m:
+        return m.group(1)
+    if "(" not in message:
+        message = message.split(None, 1)[0] if message else message
+    return RE_NUMBER.sub("#", message)
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Return nearest rank percentile of sorted values, `nan` if empty."""
+    if not values:
+        return math.nan
+    index = max(0, math.ceil(p / 100. * len(values)) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+class CommandStatistics:
+    """Latency histogram and counters of a single command."""
+
+    max_samples: int = 4096
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_time: float = 0.0
+        self.bytes_written: int = 0
+        self.bytes_read: int = 0
+        self.retries: int = 0
+        self.durations: Deque[float] = collections.deque(maxlen=self.max_samples)
+
+    def add(self, duration: float, bytes_written: int, bytes_read: int, retries: int) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.bytes_written += bytes_written
+        self.bytes_read += bytes_read
+        self.retries += retries
+        self.durations.append(duration)
+
+    def summary(self) -> Dict[str, float]:
+        durations = sorted(self.durations)
+        return {
+            "count": self.count,
+            "total_time": self.total_time,
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "retries": self.retries,
+        }
+
+
+class IOStatistics:
+    """Thread safe per instrument and command I/O statistics.
+
+    Method `record` is compatible with resource I/O hooks.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._instruments: Dict[str, Dict[str, CommandStatistics]] = {}
+
+    def record(self, resource_name: str, message: str, duration: float,
+               bytes_written: int, bytes_read: int, retries: int) -> None:
+        command = normalize_command(message)
+        with self._lock:
+            commands = self._instruments.setdefault(resource_name, {})
+            commands.setdefault(command, CommandStatistics()).add(duration, bytes_written, bytes_read, retries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instruments.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return summaries for every instrument and command."""
+        with self._lock:
+            return {
+                resource_name: {command: stats.summary() for command, stats in commands.items()}
+                for resource_name, commands in self._instruments.items()
+            }
+
+    def report(self) -> List[str]:
+        """Return report lines, commands sorted by total time."""
+        lines: List[str] = []
+        for resource_name, commands in self.snapshot().items():
+            total_time = sum(summary["total_time"] for summary in commands.values())
+            lines.append(f"{resource_name}: {total_time:.3f} s")
+            for command, summary in sorted(commands.items(), key=lambda item: -item[1]["total_time"]):
+                lines.append(
+                    f"  {command}: n={summary['count']:d} total={summary['total_time']:.3f} s "
+                    f"p50={summary['p50'] * 1e3:.1f} ms p95={summary['p95'] * 1e3:.1f} ms "
+                    f"p99={summary['p99'] * 1e3:.1f} ms retries={summary['retries']:d}"
+                )
+        return lines
+
+
+io_statistics = IOStatistics()
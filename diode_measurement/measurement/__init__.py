@@ -1,14 +1,24 @@
+import concurrent.futures
 import contextlib
+import functools
 import logging
+import math
+import statistics
+import threading
 import time
 
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from ..resource import Resource, AutoReconnectResource
-from ..driver import driver_factory
+from ..driver import Capability, driver_factory
+from ..driver.driver import Electrometer, LCRMeter, SourceMeter
 
-from ..functions import LinearRange
+from ..functions import AdaptiveRange
 from ..estimate import Estimate
+from ..iostats import io_statistics
+from ..profile import SweepProfile
+from ..sampling import reduce_samples
+from ..settling import Settling
 from ..state import State
 
 __all__ = ["Measurement", "RangeMeasurement"]
@@ -31,19 +41,54 @@ class EventHandler:
             handler(*args, **kwargs)
 
 
+class AcquisitionPlan:
+    """Instruments read by `Measurement.measure_instruments` for a set of
+    keys, derived once per run from the driver capabilities.
+    """
+
+    def __init__(self, instruments: Dict[str, Any], status_keys: List[str], current_keys: List[str]) -> None:
+        self.instruments: Dict[str, Any] = instruments
+        self.status_keys: List[str] = status_keys
+        self.current_keys: List[str] = current_keys
+
+
 class Measurement:
 
+    sample_deviation_keys: Dict[str, str] = {
+        "smu": "i_smu_std",
+        "smu2": "i_smu2_std",
+        "elm": "i_elm_std",
+        "elm2": "i_elm2_std",
+        "lcr": "c_lcr_std",
+    }
+    """Reading keys of standard deviations of sampled instruments."""
+
     def __init__(self, state: State) -> None:
         super().__init__()
         self.state: State = state
         self.instruments: Dict = {}
         self._instruments: Dict = {}
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.reading_compliance: Dict[str, bool] = {}
+        self.acquisition_plans: Dict[Tuple[str, ...], AcquisitionPlan] = {}
+        self.reading_queues: Dict[str, Tuple[List[ReadingType], threading.RLock]] = {}
         self.started_event: EventHandler = EventHandler()
         self.finished_event: EventHandler = EventHandler()
         self.failed_event: EventHandler = EventHandler()
         self.warning_event: EventHandler = EventHandler()
         self.update_event: EventHandler = EventHandler()
 
+    def attach_reading_queue(self, name: str, queue: List[ReadingType], lock: threading.RLock) -> None:
+        """Attach queue `name` (`iv`, `it` or `cv`) consumed by plots."""
+        self.reading_queues[name] = queue, lock
+
+    def queue_readings(self, name: str, readings: Iterable[ReadingType]) -> None:
+        """Append readings to queue `name` if attached."""
+        if name in self.reading_queues:
+            queue, lock = self.reading_queues[name]
+            with lock:
+                queue.extend(readings)
+
     def register_instrument(self, name: str) -> None:
         role = self.state.find_role(name)
         if not role.get("enabled"):
@@ -69,6 +114,10 @@ class Measurement:
             write_termination=termination,
             timeout=timeout
         )
+        resource.srq_enabled = self.state.service_requests and Capability.SERVICE_REQUEST in cls.capabilities
+        if isinstance(resource, AutoReconnectResource):
+            resource.retry_budget = self.state.reconnect_budget
+        resource.io_hooks.append(io_statistics.record)
         self._instruments[name] = cls, resource
 
     def check_error_state(self, context) -> None:
@@ -76,6 +125,160 @@ class Measurement:
         if code:
             raise RuntimeError(f"Instrument Error: {code}: {message}")
 
+    def measure_instruments(self, keys: List[str]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Read instruments by key using two phase `initiate` and `fetch`,
+        return results and sample timestamps by key. Missing instruments are
+        ignored. All instruments are armed before collecting readings, if a
+        worker pool is set every instrument is read by its own worker.
+
+        Instruments returned by `compliance_keys` reporting compliance with
+        their readings store the state in `reading_compliance` by key. Source
+        meters not measuring voltage return current readings only.
+        """
+        plan = self.acquisition_plan(keys)
+        instruments = plan.instruments
+        status_keys = plan.status_keys
+        current_keys = plan.current_keys
+        self.reading_compliance.clear()
+
+        def fetch(key, instrument) -> Tuple[Any, float]:
+            if key in status_keys:
+                *result, compliance = instrument.fetch(status=True)
+                self.reading_compliance[key] = compliance
+                return tuple(result), time.time()
+            if key in current_keys:
+                return (instrument.measure_i(), math.nan), time.time()
+            result = instrument.fetch()
+            return result, time.time()
+
+        def measure(key, instrument) -> Tuple[Any, float]:
+            instrument.initiate()
+            return fetch(key, instrument)
+
+        if self.executor is None or len(instruments) < 2:
+            for instrument in instruments.values():
+                instrument.initiate()
+            samples = {key: fetch(key, instrument) for key, instrument in instruments.items()}
+        else:
+            futures = {key: self.executor.submit(measure, key, instrument) for key, instrument in instruments.items()}
+            # Let all instruments complete before raising any exception
+            concurrent.futures.wait(futures.values())
+            samples = {key: future.result() for key, future in futures.items()}
+        results = {key: result for key, (result, _) in samples.items()}
+        timestamps = {key: timestamp for key, (_, timestamp) in samples.items()}
+        return results, timestamps
+
+    def sample_instruments(self, keys: List[str]) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, float]]:
+        """Read instruments by key `sample_count` times and reduce the samples
+        in one batch, return results, mean sample timestamps and standard
+        deviations by reading key. An ELM providing a trace buffer acquires
+        its samples free running while the other instruments are sampled.
+        """
+        count: int = self.state.sample_count
+        if count < 2:
+            results, timestamps = self.measure_instruments(keys)
+            return results, timestamps, {}
+
+        elm = self.instruments.get("elm") if "elm" in keys else None
+        if elm is not None and Capability.TRACE_BUFFER not in elm.capabilities:
+            elm = None
+        sample_keys: List[str] = [key for key in keys if elm is None or key != "elm"]
+
+        samples: Dict[str, List[Any]] = {}
+        sample_timestamps: Dict[str, List[float]] = {}
+        compliance: Dict[str, bool] = {}
+
+        if elm is not None:
+            elm.prepare_buffer(count)
+        try:
+            for _ in range(count if sample_keys else 0):
+                results, timestamps = self.measure_instruments(sample_keys)
+                for key, result in results.items():
+                    samples.setdefault(key, []).append(result)
+                    sample_timestamps.setdefault(key, []).append(timestamps[key])
+                for key, tripped in self.reading_compliance.items():
+                    compliance[key] = compliance.get(key, False) or tripped
+            if elm is not None:
+                samples["elm"] = [value for value, _ in self.fetch_sample_buffer(elm, count)]
+                sample_timestamps["elm"] = [time.time()]
+        finally:
+            if elm is not None:
+                elm.abort_buffer()
+        self.reading_compliance.clear()
+        self.reading_compliance.update(compliance)
+
+        method: str = self.state.sample_method
+        sigma: float = self.state.sample_sigma
+        proportion: float = self.state.sample_trim
+        results: Dict[str, Any] = {}
+        deviations: Dict[str, float] = {}
+        for key, values in samples.items():
+            if values and isinstance(values[0], tuple):
+                reduced = [reduce_samples(component, method, sigma, proportion) for component in zip(*values)]
+                results[key] = tuple(value for value, _ in reduced)
+                deviation = reduced[0][1]
+            else:
+                results[key], deviation = reduce_samples(values, method, sigma, proportion)
+            if key in self.sample_deviation_keys:
+                deviations[self.sample_deviation_keys[key]] = deviation
+        timestamps = {key: statistics.fmean(values) for key, values in sample_timestamps.items()}
+        return results, timestamps, deviations
+
+    def fetch_sample_buffer(self, elm, count: int, interval: float = 0.010) -> List[Tuple[float, float]]:
+        """Return at least `count` readings of a prepared ELM trace buffer."""
+        timeout: float = 10.0 + count * 1.0
+        threshold: float = time.monotonic() + timeout
+        readings: List[Tuple[float, float]] = []
+        while len(readings) < count:
+            readings.extend(elm.fetch_buffer())
+            if len(readings) >= count:
+                break
+            if time.monotonic() > threshold:
+                raise RuntimeError(f"ELM trace buffer timeout, exceeded {timeout:G} s")
+            time.sleep(interval)
+        return readings[:count]
+
+    def acquisition_plan(self, keys: List[str]) -> AcquisitionPlan:
+        """Return acquisition plan for instrument keys, created on first use
+        within a run. Missing instruments are ignored.
+        """
+        plan = self.acquisition_plans.get(tuple(keys))
+        if plan is None:
+            instruments = {key: self.instruments.get(key) for key in keys if key in self.instruments}
+            status_keys = [key for key in self.compliance_keys() if key in instruments and Capability.COMPLIANCE_IN_READING in instruments[key].capabilities]
+            current_keys = [key for key, instrument in instruments.items() if key not in status_keys and self.is_current_only(instrument)]
+            plan = AcquisitionPlan(instruments, status_keys, current_keys)
+            self.acquisition_plans[tuple(keys)] = plan
+        return plan
+
+    def is_current_only(self, instrument) -> bool:
+        """Return `True` if instrument is a source meter providing no voltage
+        readings, its `measure_iv` would only add a voltage placeholder.
+        """
+        if not isinstance(instrument, SourceMeter) or isinstance(instrument, (Electrometer, LCRMeter)):
+            return False
+        return not {Capability.MEASURE_V, Capability.SIMULTANEOUS_IV} & instrument.capabilities
+
+    def compliance_keys(self) -> List[str]:
+        """Return keys of source instruments to be checked for compliance."""
+        return []
+
+    def channel_temperatures(self) -> Dict[str, float]:
+        """Return DMM temperatures of scanned channels of the last reading
+        as `t_dmm_<channel>` reading keys.
+        """
+        dmm = self.instruments.get("dmm")
+        if dmm is None:
+            return {}
+        return {f"t_dmm_{channel}": value for channel, value in dmm.channel_temperatures().items()}
+
+    def flush_instruments(self) -> None:
+        """Send pending pipelined writes of all instruments."""
+        for key, context in self.instruments.items():
+            logger.debug("flush %s...", key.upper())
+            context.flush()
+            logger.debug("flush %s... done.", key.upper())
+
     def update_rpc_state(self, state) -> None:
         self.update_event({"rpc_state": state})
 
@@ -96,14 +299,26 @@ class Measurement:
             self.started_event()
             logger.debug("handle started callbacks... done.")
             self.instruments.clear()
+            self.acquisition_plans.clear()
+            io_statistics.clear()
             with contextlib.ExitStack() as stack:
+                resources: List[Any] = []
+                failed: bool = False
                 logger.debug("creating instrument contexts...")
                 for key, value in self._instruments.items():
                     cls, resource = value
                     logger.debug("creating instrument context %s: %s...", key, cls.__name__)
-                    context = cls(stack.enter_context(resource))
+                    resources.append(stack.enter_context(resource))
+                    context = cls(resources[-1])
+                    if self.state.pipelined_writes:
+                        context.set_pipeline_enabled(True, self.state.pipeline_size)
                     self.instruments[key] = context
                 logger.debug("creating instrument contexts... done.")
+                if self.state.concurrent_readings:
+                    self.executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=max(1, len(self.instruments)),
+                        thread_name_prefix="acquire"
+                    )
                 try:
                     logger.debug("initialize...")
                     self.initialize()
@@ -112,13 +327,25 @@ class Measurement:
                     self.measure()
                     logger.debug("measure... done.")
                 except Exception as exc:
+                    failed = True
                     logger.exception(exc)
                     self.failed_event(exc)
                 finally:
-                    logger.debug("finalize...")
-                    self.update_rpc_state("stopping")
-                    self.finalize()
-                    logger.debug("finalize... done.")
+                    try:
+                        logger.debug("finalize...")
+                        self.update_rpc_state("stopping")
+                        self.finalize()
+                        self.flush_instruments()
+                        logger.debug("finalize... done.")
+                    finally:
+                        if self.executor is not None:
+                            self.executor.shutdown()
+                            self.executor = None
+                        # Sessions may hold unread responses after errors,
+                        # close them instead of returning them to the pool
+                        if failed:
+                            for resource in resources:
+                                resource.close(discard=True)
         except Exception as exc:
             logger.exception(exc)
             self.failed_event(exc)
@@ -127,21 +354,45 @@ class Measurement:
             self.finished_event()
             logger.debug("handle finished callbacks... done.")
             self.instruments.clear()
+            for line in io_statistics.report():
+                logger.info("I/O statistics: %s", line)
             self.update_rpc_state("idle")
             logger.debug("run measurement... done.")
 
 
 class RangeMeasurement(Measurement):
 
+    sweep_size: int = 100
+    """Maximum number of points per hardware sweep."""
+
+    sweep_chunk_time: float = 1.0
+    """Maximum estimated duration in seconds of hardware sweeps, compliance
+    is checked between sweeps, stop requests abort a running sweep."""
+
+    sweep_point_time: float = 0.020
+    """Estimated acquisition time in seconds of a hardware sweep point in
+    addition to the waiting time."""
+
+    ramp_interval: float = 0.010
+    """Interval in seconds to check for stop requests while ramping."""
+
+    ramp_chunk_time: float = 1.0
+    """Maximum duration in seconds of hardware sweeps used for ramps."""
+
     def __init__(self, state: State) -> None:
         super().__init__(state)
         self.it_reading_event: EventHandler = EventHandler()
         self.it_change_voltage_ready_event: EventHandler = EventHandler()
+        self.source_voltage_level: Optional[float] = None
+        self.bias_source_voltage_level: Optional[float] = None
+        self.settling_time: Optional[float] = None
+        self.settling_reader: Optional[Callable[[], float]] = None
+        self.sweep_profile: Optional[SweepProfile] = None
 
     # Interlock check
 
     def check_interlock(self, instrument) -> None:
-        if hasattr(instrument, "is_interlock"):
+        if Capability.INTERLOCK in instrument.capabilities:
             if not instrument.is_interlock():
                 name = type(instrument).__name__
                 raise RuntimeError(f"{name}: instrument not interlocked!")
@@ -154,15 +405,23 @@ class RangeMeasurement(Measurement):
     def set_source_output_state(self, state: bool) -> None:
         logger.info("Source output state: %s", state)
         self.source_instrument.set_output_enabled(state)
+        self.source_instrument.flush()
         self.update_event({"source_output_state": state})
         self.state.update({"source_output_state": state})
 
     def get_source_voltage(self) -> float:
-        return self.source_instrument.get_voltage_level()
+        """Return commanded source voltage, read back from the instrument if
+        not known yet.
+        """
+        if self.source_voltage_level is None:
+            self.source_voltage_level = self.source_instrument.get_voltage_level()
+        return self.source_voltage_level
 
     def set_source_voltage(self, voltage: float) -> None:
         logger.info("Source voltage level: %gV", voltage)
+        self.source_voltage_level = voltage
         self.source_instrument.set_voltage_level(voltage)
+        self.source_instrument.flush(wait=False)
         self.update_event({"source_voltage": voltage})
         self.state.update({"source_voltage": voltage})
 
@@ -178,15 +437,23 @@ class RangeMeasurement(Measurement):
     def set_bias_source_output_state(self, state: bool) -> None:
         logger.info("Bias source output state: %s", state)
         self.bias_source_instrument.set_output_enabled(state)
+        self.bias_source_instrument.flush()
         self.update_event({"bias_source_output_state": state})
         self.state.update({"bias_source_output_state": state})
 
     def get_bias_source_voltage(self) -> float:
-        return self.bias_source_instrument.get_voltage_level()
+        """Return commanded bias source voltage, read back from the
+        instrument if not known yet.
+        """
+        if self.bias_source_voltage_level is None:
+            self.bias_source_voltage_level = self.bias_source_instrument.get_voltage_level()
+        return self.bias_source_voltage_level
 
     def set_bias_source_voltage(self, voltage: float) -> None:
         logger.info("Bias source voltage level: %gV", voltage)
+        self.bias_source_voltage_level = voltage
         self.bias_source_instrument.set_voltage_level(voltage)
+        self.bias_source_instrument.flush(wait=False)
         self.update_event({"bias_source_voltage": voltage})
         self.state.update({"bias_source_voltage": voltage})
 
@@ -194,12 +461,54 @@ class RangeMeasurement(Measurement):
         logger.info("Bias source voltage range: %gV", voltage)
         self.bias_source_instrument.set_voltage_range(voltage)
 
+    def verify_source_voltage(self, name: str, instrument, voltage: Optional[float]) -> float:
+        """Read back voltage level of a source, warn if it differs from the
+        commanded voltage. Returns the read back voltage.
+        """
+        level: float = instrument.get_voltage_level()
+        if voltage is not None and not math.isclose(level, voltage, rel_tol=1e-3, abs_tol=1e-3):
+            logger.warning("%s voltage level read back %gV, commanded %gV", name, level, voltage)
+        return level
+
+    def verify_source_levels(self) -> None:
+        """Replace commanded levels of source and bias source by read back
+        levels.
+        """
+        self.source_voltage_level = self.verify_source_voltage("Source", self.source_instrument, self.source_voltage_level)
+        if self.bias_source_instrument:
+            self.bias_source_voltage_level = self.verify_source_voltage("Bias source", self.bias_source_instrument, self.bias_source_voltage_level)
+
+    def is_verify_step(self, step: int, last: bool) -> bool:
+        """Return `True` if source levels are to be read back at ramp step,
+        applies to first and last step and every `source_verify_interval`
+        steps.
+        """
+        interval: int = self.state.source_verify_interval
+        if step == 0 or last:
+            return True
+        return interval > 0 and step % interval == 0
+
+    def compliance_keys(self) -> List[str]:
+        keys: List[str] = [self.state.source_role]
+        if self.bias_source_instrument:
+            keys.append(self.state.bias_source_role)
+        return keys
+
+    def source_compliance_tripped(self, key: str, instrument) -> bool:
+        """Return compliance state reported by the last reading of the
+        instrument, queries the instrument if not available.
+        """
+        compliance = self.reading_compliance.pop(key, None)
+        if compliance is None:
+            return instrument.compliance_tripped()
+        return compliance
+
     def check_current_compliance(self) -> None:
         """Raise exception if current compliance tripped and continue in
         compliance option is not active.
         """
         if not self.state.continue_in_compliance:
-            if self.source_instrument.compliance_tripped():
+            if self.source_compliance_tripped(self.state.source_role, self.source_instrument):
                 raise RuntimeError("Source compliance tripped!")
 
     def update_current_compliance(self) -> None:
@@ -223,7 +532,7 @@ class RangeMeasurement(Measurement):
         compliance option is not active.
         """
         if not self.state.continue_in_compliance:
-            if self.bias_source_instrument.compliance_tripped():
+            if self.source_compliance_tripped(self.state.bias_source_role, self.bias_source_instrument):
                 raise RuntimeError("Source compliance tripped!")
 
     def update_bias_current_compliance(self) -> None:
@@ -236,9 +545,61 @@ class RangeMeasurement(Measurement):
 
     def apply_waiting_time(self) -> None:
         waiting_time: float = self.state.waiting_time
+        if self.state.settling_mode in Settling.modes:
+            self.apply_settling_time(waiting_time)
+            return
         logger.info("Waiting for %.2f sec", waiting_time)
         time.sleep(waiting_time)
 
+    def apply_settling_time(self, waiting_time: float) -> None:
+        """Take preliminary readings until settled, waiting time is the
+        upper bound. The achieved settling time is added to the next reading.
+        """
+        settling: Settling = Settling(
+            self.state.settling_mode,
+            self.state.settling_tolerance,
+            self.state.settling_count,
+        )
+        reader: Callable[[], float] = self.get_settling_reader()
+        start: float = time.monotonic()
+        threshold: float = start + waiting_time
+        while not self.state.stop_requested:
+            now: float = time.monotonic()
+            if now >= threshold:
+                logger.info("Settling timeout after %.2f sec", waiting_time)
+                break
+            value: float = reader()
+            if not math.isfinite(value):
+                time.sleep(threshold - now)
+                break
+            if settling.append(value, time.monotonic()):
+                break
+        self.settling_time = time.monotonic() - start
+        logger.info("Settled after %.3f sec", self.settling_time)
+
+    def get_settling_reader(self) -> Callable[[], float]:
+        """Return function taking fast preliminary readings for settling
+        detection, selected once per run.
+        """
+        if self.settling_reader is None:
+            self.settling_reader = self.create_settling_reader()
+        return self.settling_reader
+
+    def create_settling_reader(self) -> Callable[[], float]:
+        """Return electrometer current reading if available, else source
+        current reading.
+        """
+        instrument = self.instruments.get("elm")
+        if instrument is None:
+            instrument = self.source_instrument
+        return instrument.measure_i
+
+    def settling_data(self) -> Dict[str, float]:
+        """Return settling time of the current step as reading key."""
+        if self.settling_time is None:
+            return {}
+        return {"settling_time": self.settling_time}
+
     def apply_waiting_time_continuous(self, estimate: Estimate) -> None:
         waiting_time: float = self.state.waiting_time_continuous
         interval: float = 1.0
@@ -295,6 +656,12 @@ class RangeMeasurement(Measurement):
         self.update_progress(0, estimate.count, estimate.passed)
 
     def initialize(self) -> None:
+        self.source_voltage_level = None
+        self.bias_source_voltage_level = None
+        self.settling_time = None
+        self.settling_reader = None
+        self.sweep_profile = None
+
         source: str = self.state.source_role
         if source in self.instruments:
             self.source_instrument = self.instruments.get(source)
@@ -363,6 +730,8 @@ class RangeMeasurement(Measurement):
             for name, value in options.items():
                 logger.info("%s: %r" , name, value)
             instrument.configure(options)
+            # Replay configuration on new sessions after reconnect
+            instrument.resource.reconnect_hooks.append(functools.partial(instrument.restore, options))
             self.check_error_state(instrument)
             logger.info("Configure %s... done.", key.upper())
 
@@ -418,18 +787,97 @@ class RangeMeasurement(Measurement):
         time.sleep(waiting_time_settle)
         logger.debug("apply settle time... done.")
 
+    def get_sweep_profile(self) -> SweepProfile:
+        """Return sweep profile of measurement, created once per run."""
+        if self.sweep_profile is None:
+            self.sweep_profile = self.create_sweep_profile()
+            logger.info("Sweep profile: %s, %d points", self.sweep_profile.name, len(self.sweep_profile))
+        return self.sweep_profile
+
+    def create_sweep_profile(self) -> SweepProfile:
+        profile: str = self.state.sweep_profile
+        voltage_begin: float = self.state.voltage_begin
+        voltage_end: float = self.state.voltage_end
+        voltage_step: float = self.state.voltage_step
+        if profile == "logarithmic":
+            count: int = len(SweepProfile.linear(voltage_begin, voltage_end, voltage_step))
+            sweep: SweepProfile = SweepProfile.logarithmic(voltage_begin, voltage_end, count, voltage_step)
+        elif profile == "file":
+            sweep = SweepProfile.from_file(self.state.sweep_file)
+            if not len(sweep):
+                raise RuntimeError(f"Sweep profile file contains no points: {self.state.sweep_file}")
+        else:
+            sweep = SweepProfile.linear(voltage_begin, voltage_end, voltage_step)
+        if self.state.sweep_bidirectional:
+            sweep = sweep.bidirectional()
+        return sweep
+
+    def is_adaptive_ramp(self) -> bool:
+        """Return `True` if ramp adapts its step, supported for single
+        linear sweeps only.
+        """
+        if not self.state.adaptive_ramp:
+            return False
+        return self.state.sweep_profile == "linear" and not self.state.sweep_bidirectional
+
+    def create_ramp(self) -> Union[SweepProfile, AdaptiveRange]:
+        """Return ramp for measurement, adaptive ramps use the ramp step as
+        maximum step.
+        """
+        if self.is_adaptive_ramp():
+            return AdaptiveRange(
+                self.state.voltage_begin,
+                self.state.voltage_end,
+                self.state.voltage_step,
+                self.state.adaptive_min_step,
+                threshold=self.state.adaptive_threshold,
+                limit=self.state.current_compliance,
+            )
+        return self.get_sweep_profile()
+
     def measure(self) -> None:
-        ramp: LinearRange = LinearRange(
-            self.state.voltage_begin,
-            self.state.voltage_end,
-            self.state.voltage_step,
-        )
+        ramp = self.create_ramp()
 
         self.update_message(f"Ramp to {ramp.end} V")
         estimate: Estimate = Estimate(len(ramp))
 
         self.update_rpc_state("ramping")
 
+        # Hardware sweeps acquire a single sample per step, steps exceeding
+        # the step limit require software ramps between points and sweeps
+        # of single points are slower than software steps
+        if isinstance(ramp, SweepProfile) and self.state.sample_count < 2 and self.is_hardware_sweep() \
+                and ramp.max_step <= self.sweep_max_step() and self.get_sweep_chunk_size() >= 2:
+            self.measure_sweep(ramp, estimate)
+        else:
+            self.measure_steps(ramp, estimate)
+
+        self.update_rpc_state("measure")
+
+        self.update_message("")
+
+        if self.state.stop_requested:
+            self.update_message("Stopping...")
+            return
+
+        if self.state.is_continuous:
+            self.update_message("Continuous measurement...")
+            self.update_rpc_state("continuous")
+            self.acquire_continuous_reading()
+
+    def sweep_max_step(self) -> float:
+        """Return largest step between sweep points applied without ramping.
+        Linear sweeps step by the voltage step, other profiles (e.g. read
+        from files) are limited by the maximum ramp step.
+        """
+        max_step: float = self.ramp_max_step(self.source_instrument)
+        if self.state.sweep_profile == "linear":
+            return max(max_step, abs(self.state.voltage_step))
+        return max_step
+
+    def measure_steps(self, ramp: Union[SweepProfile, AdaptiveRange], estimate: Estimate) -> None:
+        max_step: float = self.sweep_max_step()
+        previous: float = ramp.begin
         for step, voltage in enumerate(ramp):
             self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
             self.update_estimate_progress(estimate)
@@ -437,11 +885,31 @@ class RangeMeasurement(Measurement):
             if self.state.stop_requested:
                 self.update_message("Stopping...")
                 return
-            self.set_source_voltage(voltage)
+            if abs(voltage - previous) > max_step:
+                self.apply_ramp(self.source_instrument, previous, voltage, self.set_source_voltage, "Ramp")
+                if self.state.stop_requested:
+                    self.update_message("Stopping...")
+                    return
+            else:
+                self.set_source_voltage(voltage)
+            previous = voltage
 
             self.apply_waiting_time()
 
-            self.acquire_reading()
+            # Adaptive ramps change their length, but end on the end voltage
+            if isinstance(ramp, AdaptiveRange):
+                last: bool = voltage == ramp.end
+            else:
+                last = step == len(ramp) - 1
+            if self.is_verify_step(step, last):
+                self.verify_source_levels()
+
+            reading: ReadingType = self.acquire_reading()
+            self.settling_time = None
+
+            if isinstance(ramp, AdaptiveRange):
+                ramp.update(self.adaptive_reading(reading), reading.get(f"i_{self.state.source_role}", math.nan))
+                estimate.set_count(len(ramp))
 
             self.check_current_compliance()
             self.update_current_compliance()
@@ -452,18 +920,66 @@ class RangeMeasurement(Measurement):
 
             estimate.advance()
 
-        self.update_rpc_state("measure")
+        if isinstance(ramp, AdaptiveRange):
+            logger.info("Adaptive ramp: %d points", len(ramp.points))
 
-        self.update_message("")
+    def adaptive_reading(self, reading: ReadingType) -> float:
+        """Return value of reading controlling the step of adaptive ramps,
+        the electrometer current if available, else the source current.
+        """
+        value = reading.get("i_elm", math.nan)
+        if math.isfinite(value):
+            return value
+        return reading.get(f"i_{self.state.source_role}", math.nan)
+
+    def is_hardware_sweep(self) -> bool:
+        """Return `True` if ramp can be executed as hardware sweep by the
+        source instrument.
+        """
+        return False
 
-        if self.state.stop_requested:
-            self.update_message("Stopping...")
-            return
+    def get_sweep_size(self) -> int:
+        """Return maximum number of points per hardware sweep."""
+        return self.sweep_size
 
-        if self.state.is_continuous:
-            self.update_message("Continuous measurement...")
-            self.update_rpc_state("continuous")
-            self.acquire_continuous_reading()
+    def get_sweep_chunk_size(self) -> int:
+        """Return number of points per hardware sweep, limited to points
+        taking about `sweep_chunk_time` seconds.
+        """
+        point_time: float = abs(self.state.waiting_time) + self.sweep_point_time
+        return min(self.get_sweep_size(), int(self.sweep_chunk_time / point_time))
+
+    def measure_sweep(self, ramp: SweepProfile, estimate: Estimate) -> None:
+        """Run ramp as hardware timed sweeps, split into chunks of
+        `get_sweep_chunk_size()` points.
+        """
+        sweep_size: int = max(1, self.get_sweep_chunk_size())
+        for offset in range(0, len(ramp), sweep_size):
+            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
+            self.update_estimate_progress(estimate)
+
+            if self.state.stop_requested:
+                self.update_message("Stopping...")
+                return
+
+            chunk: List[float] = ramp[offset:offset + sweep_size]
+            logger.info("Source sweep: %gV to %gV (%d points)", chunk[0], chunk[-1], len(chunk))
+            self.acquire_sweep(chunk)
+            # Level after sweep depends on instrument, read back on demand
+            self.source_voltage_level = None
+
+            if self.state.stop_requested:
+                self.update_message("Stopping...")
+                return
+
+            for _ in chunk:
+                estimate.advance()
+
+            self.update_event({"source_voltage": chunk[-1]})
+            self.state.update({"source_voltage": chunk[-1]})
+
+            self.check_current_compliance()
+            self.update_current_compliance()
 
     def finalize(self) -> None:
         try:
@@ -516,10 +1032,13 @@ class RangeMeasurement(Measurement):
 
     def assure_discharge(self) -> None:
         # wait until capacitors discared before output disable
+        measure_v: bool = Capability.MEASURE_V in self.source_instrument.capabilities
+        if not measure_v:
+            logger.warning("Source instrument does not provide voltage readings.")
+
         def read_source_voltage():
-            if hasattr(self.source_instrument, "measure_v"):
+            if measure_v:
                 return self.source_instrument.measure_v()
-            logger.warning("Source instrument does not provide voltage readings.")
             return 0.
 
         threshold: float = 0.5  # Volt
@@ -538,38 +1057,43 @@ class RangeMeasurement(Measurement):
 
         self.update_message("")
 
-    def acquire_reading(self) -> None:
-        ...
+    def acquire_reading(self) -> ReadingType:
+        return {}
 
     def acquire_reading_data(self) -> ReadingType:
         return {}
 
+    def acquire_sweep(self, voltages: List[float]) -> None:
+        """Run a single hardware sweep over voltages using the source
+        instrument and pass on the readings.
+        """
+        self.source_instrument.prepare_sweep(voltages, self.state.waiting_time)
+        timestamp: float = time.time()
+        results = self.source_instrument.fetch_sweep(abort=lambda: self.state.stop_requested)
+        for voltage, (i, v, t) in zip(voltages, results):
+            self.acquire_sweep_reading({
+                "timestamp": timestamp + t,
+                "voltage": voltage,
+                "v_smu": v,
+                "i_smu": i,
+            })
+
+    def acquire_sweep_reading(self, reading: ReadingType) -> None:
+        ...
+
     def acquire_continuous_reading(self) -> None:
         ...
 
     def ramp_to_begin(self) -> None:
         source_voltage: float = self.state.source_voltage
-        voltage_begin: float = self.state.voltage_begin
-        voltage_end: float = self.state.voltage_end
-        voltage_step: float = 5.0
-        waiting_time: float = 0.250
+        profile: SweepProfile = self.get_sweep_profile()
+        voltage_begin: float = profile.begin if len(profile) else self.state.voltage_begin
 
         # Set voltage range according to highest voltage in ramp.
         # Including reverse ramps, eg. -100V...+10V -> range is 100V
-        self.set_source_voltage_range(max(abs(voltage_begin), abs(voltage_end)))
+        self.set_source_voltage_range(max(profile.extent, abs(voltage_begin)))
 
-        ramp: LinearRange = LinearRange(source_voltage, voltage_begin, voltage_step)
-        estimate: Estimate = Estimate(len(ramp))
-
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            if self.state.stop_requested:
-                break
-            self.set_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
+        self.apply_ramp(self.source_instrument, source_voltage, voltage_begin, self.set_source_voltage, "Ramp")
 
     def ramp_to_zero(self) -> None:
         source_voltage = self.get_source_voltage()
@@ -584,50 +1108,20 @@ class RangeMeasurement(Measurement):
             "dmm_temperature": None
         })
 
-        source_voltage_end: float = 0.0
-        source_voltage_step: float = 5.0
-        waiting_time: float = 0.250
-
-        ramp: LinearRange = LinearRange(source_voltage, source_voltage_end, source_voltage_step)
-        estimate: Estimate = Estimate(len(ramp))
         logging.info("Ramp source to zero...")
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            self.set_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
+        self.apply_ramp(self.source_instrument, source_voltage, 0.0, self.set_source_voltage, "Ramp", interruptible=False)
         logging.info("Ramp source to zero... done.")
 
     def ramp_bias_to_bias(self) -> None:
         bias_voltage_end: float = self.state.bias_voltage
         self.set_bias_source_voltage_range(bias_voltage_end)
 
-        bias_voltage_begin: float = 0.0
-        bias_voltage_step: float = 5.0
-        waiting_time: float = 0.250
-
-        ramp: LinearRange = LinearRange(bias_voltage_begin, bias_voltage_end, bias_voltage_step)
-        estimate: Estimate = Estimate(len(ramp))
-
-        logging.info("Ramp bias source to %g V...", ramp.end)
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp bias to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
-
-            if self.state.stop_requested:
-                break
-            self.set_bias_source_voltage(voltage)
-            time.sleep(waiting_time)
-            estimate.advance()
-        logging.info("Ramp bias source to %g V... done.", ramp.end)
+        logging.info("Ramp bias source to %g V...", bias_voltage_end)
+        self.apply_ramp(self.bias_source_instrument, 0.0, bias_voltage_end, self.set_bias_source_voltage, "Ramp bias")
+        logging.info("Ramp bias source to %g V... done.", bias_voltage_end)
 
     def ramp_bias_to_zero(self) -> None:
         bias_source_voltage: float = self.get_bias_source_voltage()
-        end_voltage: float = 0.0
-        step_voltage: float = 5.0
-        waiting_time: float = 0.250
         self.update_event({
             "smu_voltage": None,
             "smu_current": None,
@@ -638,22 +1132,83 @@ class RangeMeasurement(Measurement):
             "lcr_capacity": None,
             "dmm_temperature": None
         })
-        ramp: LinearRange = LinearRange(bias_source_voltage, end_voltage, step_voltage)
-        estimate: Estimate = Estimate(len(ramp))
         logging.info("Ramp bias source to zero...")
-        for step, voltage in enumerate(ramp):
-            self.update_estimate_message(f"Ramp bias to {ramp.end} V", estimate)
-            self.update_estimate_progress(estimate)
+        self.apply_ramp(self.bias_source_instrument, bias_source_voltage, 0.0, self.set_bias_source_voltage, "Ramp bias", interruptible=False)
+        logging.info("Ramp bias source to zero... done.")
 
-            self.set_bias_source_voltage(voltage)
-            time.sleep(waiting_time)
+    def ramp_max_step(self, instrument) -> float:
+        """Return maximum ramp step for instrument."""
+        return min(abs(self.state.ramp_max_step), instrument.max_ramp_step)
+
+    def is_hardware_ramp(self, instrument) -> bool:
+        if not self.state.ramp_hardware_sweep:
+            return False
+        # LCR meters provide list sweeps of the bias only
+        if isinstance(instrument, LCRMeter):
+            return False
+        return Capability.HARDWARE_SWEEP in instrument.capabilities
+
+    def apply_ramp(self, instrument, begin: float, end: float, set_voltage: Callable[[float], None],
+                   message: str, interruptible: bool = True) -> None:
+        """Ramp voltage of instrument from begin to end, limited by maximum
+        step and slew rate. Interruptible ramps return on stop requests.
+        """
+        ramp: SweepProfile = SweepProfile.linear(begin, end, self.ramp_max_step(instrument))
+        points: List[float] = ramp[1:]
+        if not points:
+            return
+        slew_rate: float = abs(self.state.ramp_slew_rate) or math.inf
+        dwell: float = abs(points[0] - begin) / slew_rate
+        estimate: Estimate = Estimate(len(points))
+        self.update_estimate_message(f"{message} to {ramp.end} V", estimate)
+        self.update_estimate_progress(estimate)
+
+        if self.is_hardware_ramp(instrument):
+            # Split into short sweeps to respond to stop requests
+            size: int = max(2, min(self.sweep_size, int(self.ramp_chunk_time / max(dwell, 1e-3))))
+            for index in range(0, len(points), size):
+                if interruptible and self.state.stop_requested:
+                    return
+                chunk: List[float] = points[index:index + size]
+                instrument.prepare_sweep(chunk, dwell)
+                instrument.fetch_sweep()
+                # Assure output holds last level of sweep
+                set_voltage(chunk[-1])
+                for _ in chunk:
+                    estimate.advance()
+                self.update_estimate_message(f"{message} to {ramp.end} V", estimate)
+                self.update_estimate_progress(estimate)
+            return
+
+        previous: float = begin
+        for voltage in points:
+            if interruptible and self.state.stop_requested:
+                return
+            set_voltage(voltage)
+            if not self.ramp_wait(abs(voltage - previous) / slew_rate, interruptible):
+                return
+            previous = voltage
             estimate.advance()
-        logging.info("Ramp bias source to zero... done.")
+            self.update_estimate_message(f"{message} to {ramp.end} V", estimate)
+            self.update_estimate_progress(estimate)
+
+    def ramp_wait(self, seconds: float, interruptible: bool) -> bool:
+        """Wait between ramp steps, return `False` if interrupted by a stop
+        request.
+        """
+        threshold: float = time.monotonic() + seconds
+        while True:
+            remaining: float = threshold - time.monotonic()
+            if remaining <= 0:
+                return True
+            if interruptible and self.state.stop_requested:
+                return False
+            time.sleep(min(remaining, self.ramp_interval))
 
     def ramp_to_continuous(self, end_voltage: float, step_voltage: float, waiting_time: float) -> None:
         source_voltage: float = self.state.source_voltage
 
-        ramp: LinearRange = LinearRange(source_voltage, end_voltage, step_voltage)
+        ramp: SweepProfile = SweepProfile.linear(source_voltage, end_voltage, step_voltage)
         estimate: Estimate = Estimate(len(ramp))
 
         # If end voltage higher, set new range before ramp.
@@ -675,10 +1230,7 @@ class RangeMeasurement(Measurement):
             reading = self.acquire_reading_data()
             logger.info(reading)
 
-            # TODO
-            if hasattr(self, "itReadingLock") and hasattr(self, "itReadingQueue"):
-                with self.itReadingLock:
-                    self.itReadingQueue.append(reading)
+            self.queue_readings("it", [reading])
 
             self.it_reading_event(reading)
 
@@ -4,6 +4,7 @@ import time
 
 from typing import Any, Callable, Dict, List
 
+from ..driver import Capability
 from ..utils import inverse_square
 
 from . import ReadingType, State, EventHandler, RangeMeasurement
@@ -29,30 +30,80 @@ class CVMeasurement(RangeMeasurement):
         return reading
 
     def acquire_reading_data(self) -> ReadingType:
-        smu = self.instruments.get("smu")
-        lcr = self.instruments.get("lcr")
-        dmm = self.instruments.get("dmm")
         voltage = self.get_source_voltage()
-        c_lcr, r_lcr = lcr.measure_impedance() if lcr else (math.nan, math.nan)
-        i_smu, v_smu = smu.measure_iv() if smu else (math.nan, math.nan)
-        t_dmm = dmm.measure_temperature() if dmm else math.nan
-        return {
+        results, timestamps, deviations = self.sample_instruments(["lcr", "smu", "dmm"])
+        c_lcr, r_lcr = results.get("lcr", (math.nan, math.nan))
+        i_smu, v_smu = results.get("smu", (math.nan, math.nan))
+        reading: ReadingType = {
             "timestamp": time.time(),
             "voltage": voltage,
             "v_smu": v_smu,
             "i_smu": i_smu,
             "c_lcr": c_lcr,
             "r_lcr": r_lcr,
-            "t_dmm": t_dmm
+            "t_dmm": results.get("dmm", math.nan)
         }
+        reading.update(self.channel_temperatures())
+        reading.update(self.settling_data())
+        reading.update(deviations)
+        for key, timestamp in timestamps.items():
+            reading[f"timestamp_{key}"] = timestamp
+        return reading
+
+    def is_hardware_sweep(self) -> bool:
+        if not self.state.hardware_sweep or self.state.is_continuous:
+            return False
+        lcr = self.instruments.get("lcr")
+        if lcr is None or lcr is not self.source_instrument:
+            return False
+        # Other instruments require a reading for every step
+        for name in ("smu", "dmm"):
+            if name in self.instruments:
+                return False
+        return Capability.HARDWARE_SWEEP in lcr.capabilities
 
-    def acquire_reading(self) -> None:
+    def get_sweep_size(self) -> int:
+        return self.instruments.get("lcr").list_sweep_size
+
+    def get_sweep_chunk_size(self) -> int:
+        # List sweeps are limited by the instrument list size
+        return self.get_sweep_size()
+
+    def acquire_sweep(self, voltages: List[float]) -> None:
+        lcr = self.instruments.get("lcr")
+        lcr.prepare_list_sweep(voltages, self.state.waiting_time)
+        timestamp: float = time.time()
+        results = lcr.fetch_list_sweep(abort=lambda: self.state.stop_requested)
+        # List sweeps provide no timestamps, distribute points evenly
+        interval: float = (time.time() - timestamp) / max(1, len(results))
+        for index, (voltage, (c_lcr, r_lcr)) in enumerate(zip(voltages, results)):
+            self.handle_cv_reading({
+                "timestamp": timestamp + (index + 1) * interval,
+                "voltage": voltage,
+                "v_smu": math.nan,
+                "i_smu": math.nan,
+                "c_lcr": c_lcr,
+                "r_lcr": r_lcr,
+                "t_dmm": math.nan
+            })
+
+    def acquire_reading(self) -> ReadingType:
         reading: ReadingType = self.acquire_reading_data()
+        self.handle_cv_reading(reading)
+        return reading
+
+    def adaptive_reading(self, reading: ReadingType) -> float:
+        return reading.get("c_lcr", math.nan)
+
+    def create_settling_reader(self) -> Callable[[], float]:
+        lcr = self.instruments.get("lcr")
+        if lcr is None:
+            return lambda: math.nan
+        return lambda: lcr.measure_impedance()[0]
+
+    def handle_cv_reading(self, reading: ReadingType) -> None:
         self.extend_cv_reading(reading)
-        # TODO
-        if hasattr(self, "cvReadingLock") and hasattr(self, "cvReadingQueue"):
-            with self.cvReadingLock:
-                self.cvReadingQueue.append(reading)
+        self.queue_readings("cv", [reading])
         self.update_event({
             "smu_voltage": reading.get("v_smu"),
             "smu_current": reading.get("i_smu"),
@@ -5,6 +5,7 @@ import threading
 
 from typing import Any, Callable, Dict, List
 
+from ..driver import Capability
 from ..estimate import Estimate
 
 from . import ReadingType, State, EventHandler, RangeMeasurement
@@ -16,39 +17,60 @@ logger = logging.getLogger(__name__)
 
 class IVMeasurement(RangeMeasurement):
 
+    buffer_size: int = 1000
+    """Size of ELM trace buffer for buffered continuous readings."""
+
     def __init__(self, state: State) -> None:
         super().__init__(state)
         self.iv_reading_event: EventHandler = EventHandler()
 
     def acquire_reading_data(self, voltage=None) -> ReadingType:
-        smu = self.instruments.get("smu")
-        elm = self.instruments.get("elm")
-        elm2 = self.instruments.get("elm2")
-        dmm = self.instruments.get("dmm")
         if voltage is None:
             voltage = self.get_source_voltage()
-        i_smu, v_smu = smu.measure_iv() if smu else (math.nan, math.nan)
-        i_elm = elm.measure_i() if elm else math.nan
-        i_elm2 = elm2.measure_i() if elm2 else math.nan
-        t_dmm = dmm.measure_temperature() if dmm else math.nan
-        return {
+        results, timestamps, deviations = self.sample_instruments(["smu", "elm", "elm2", "dmm"])
+        i_smu, v_smu = results.get("smu", (math.nan, math.nan))
+        reading: ReadingType = {
             "timestamp": time.time(),
             "voltage": voltage,
             "v_smu": v_smu,
             "i_smu": i_smu,
-            "i_elm": i_elm,
-            "i_elm2": i_elm2,
-            "t_dmm": t_dmm,
+            "i_elm": results.get("elm", math.nan),
+            "i_elm2": results.get("elm2", math.nan),
+            "t_dmm": results.get("dmm", math.nan),
         }
+        reading.update(self.channel_temperatures())
+        reading.update(self.settling_data())
+        reading.update(deviations)
+        for key, timestamp in timestamps.items():
+            reading[f"timestamp_{key}"] = timestamp
+        return reading
+
+    def is_hardware_sweep(self) -> bool:
+        if not self.state.hardware_sweep or self.state.is_continuous:
+            return False
+        # Other instruments require a reading for every step
+        for name in ("elm", "elm2", "dmm"):
+            if name in self.instruments:
+                return False
+        return Capability.HARDWARE_SWEEP in self.source_instrument.capabilities
+
+    def acquire_sweep_reading(self, reading: ReadingType) -> None:
+        reading.update({
+            "i_elm": math.nan,
+            "i_elm2": math.nan,
+            "t_dmm": math.nan,
+        })
+        self.handle_iv_reading(reading)
 
-    def acquire_reading(self) -> None:
+    def acquire_reading(self) -> ReadingType:
         reading: ReadingType = self.acquire_reading_data()
+        self.handle_iv_reading(reading)
+        return reading
+
+    def handle_iv_reading(self, reading: ReadingType) -> None:
         logger.info(reading)
 
-        # TODO
-        if hasattr(self, "ivReadingLock") and hasattr(self, "ivReadingQueue"):
-            with self.ivReadingLock:
-                self.ivReadingQueue.append(reading)
+        self.queue_readings("iv", [reading])
 
         self.update_event({
             "smu_voltage": reading.get("v_smu"),
@@ -59,7 +81,93 @@ class IVMeasurement(RangeMeasurement):
         })
         self.iv_reading_event(reading)
 
+    def is_buffered_continuous(self) -> bool:
+        if not self.state.buffered_continuous:
+            return False
+        # Merging multiple buffered streams is not supported
+        if "elm2" in self.instruments:
+            return False
+        elm = self.instruments.get("elm")
+        return elm is not None and Capability.TRACE_BUFFER in elm.capabilities
+
+    def acquire_buffered_reading_data(self, voltage: float, timestamp: float) -> List[ReadingType]:
+        """Return readings acquired by the ELM trace buffer since last call.
+        Other instruments are read once per batch, their values are assigned
+        to the last reading of the batch.
+        """
+        elm = self.instruments.get("elm")
+        batch = elm.fetch_buffer()
+        results, _ = self.measure_instruments(["smu", "dmm"])
+        i_smu, v_smu = results.get("smu", (math.nan, math.nan))
+        t_dmm = results.get("dmm", math.nan)
+        readings: List[ReadingType] = []
+        for index, (i_elm, t) in enumerate(batch):
+            last = index == len(batch) - 1
+            readings.append({
+                "timestamp": timestamp + t,
+                "voltage": voltage,
+                "v_smu": v_smu if last else math.nan,
+                "i_smu": i_smu if last else math.nan,
+                "i_elm": i_elm,
+                "i_elm2": math.nan,
+                "t_dmm": t_dmm if last else math.nan,
+            })
+        return readings
+
+    def acquire_buffered_continuous_reading(self) -> None:
+        elm = self.instruments.get("elm")
+
+        estimate = Estimate(1)
+
+        self.update_progress(0, 0, 0)
+
+        voltage = self.get_source_voltage()
+
+        while not self.state.stop_requested:
+            timestamp = time.time()
+            elm.prepare_buffer(self.buffer_size)
+            try:
+                while not self.state.stop_requested:
+                    self.apply_waiting_time_continuous(estimate)
+
+                    readings = self.acquire_buffered_reading_data(voltage, timestamp)
+                    for reading in readings:
+                        logger.info(reading)
+                        self.it_reading_event(reading)
+
+                    self.queue_readings("it", readings)
+
+                    self.check_current_compliance()
+                    self.update_current_compliance()
+
+                    if readings:
+                        reading = readings[-1]
+                        self.update_event({
+                            "smu_voltage": reading.get("v_smu"),
+                            "smu_current": reading.get("i_smu"),
+                            "elm_current": reading.get("i_elm"),
+                            "dmm_temperature": reading.get("t_dmm")
+                        })
+
+                    self.update_estimate_message_continuous("Reading...", estimate)
+
+                    estimate.advance()
+
+                    if self.state.change_voltage_continuous:
+                        break
+            finally:
+                elm.abort_buffer()
+
+            # Buffer is aborted while changing voltage
+            self.apply_change_voltage()
+
+            voltage = self.get_source_voltage()
+
     def acquire_continuous_reading(self) -> None:
+        if self.is_buffered_continuous():
+            self.acquire_buffered_continuous_reading()
+            return
+
         t = time.time()
         interval = 1.0
 
@@ -80,10 +188,7 @@ class IVMeasurement(RangeMeasurement):
             reading: ReadingType = self.acquire_reading_data(voltage=voltage)
             handle_reading(reading)
 
-            # TODO
-            if hasattr(self, "itReadingLock") and hasattr(self, "itReadingQueue"):
-                with self.itReadingLock:
-                    self.itReadingQueue.append(reading)
+            self.queue_readings("it", [reading])
 
             # Limit some actions for fast measurements
             if dt > interval:
@@ -21,37 +21,33 @@ class IVBiasMeasurement(RangeMeasurement):
         self.iv_reading_event: EventHandler = EventHandler()
 
     def acquire_reading_data(self, voltage=None) -> ReadingType:
-        smu = self.instruments.get("smu")
-        smu2 = self.instruments.get("smu2")
-        elm = self.instruments.get("elm")
-        elm2 = self.instruments.get("elm2")
-        dmm = self.instruments.get("dmm")
         if voltage is None:
             voltage = self.get_source_voltage()
-        i_smu, v_smu = smu.measure_iv() if smu else (math.nan, math.nan)
-        i_smu2, v_smu2 = smu2.measure_iv() if smu2 else (math.nan, math.nan)
-        i_elm = elm.measure_i() if elm else math.nan
-        i_elm2 = elm2.measure_i() if elm2 else math.nan
-        t_dmm = dmm.measure_temperature() if dmm else math.nan
-        return {
+        results, timestamps, deviations = self.sample_instruments(["smu", "smu2", "elm", "elm2", "dmm"])
+        i_smu, v_smu = results.get("smu", (math.nan, math.nan))
+        i_smu2, v_smu2 = results.get("smu2", (math.nan, math.nan))
+        reading: ReadingType = {
             "timestamp": time.time(),
             "voltage": voltage,
             "v_smu": v_smu,
             "i_smu": i_smu,
             "v_smu2": v_smu2,
             "i_smu2": i_smu2,
-            "i_elm": i_elm,
-            "i_elm2": i_elm2,
-            "t_dmm": t_dmm,
+            "i_elm": results.get("elm", math.nan),
+            "i_elm2": results.get("elm2", math.nan),
+            "t_dmm": results.get("dmm", math.nan),
         }
-
-    def acquire_reading(self) -> None:
+        reading.update(self.channel_temperatures())
+        reading.update(self.settling_data())
+        reading.update(deviations)
+        for key, timestamp in timestamps.items():
+            reading[f"timestamp_{key}"] = timestamp
+        return reading
+
+    def acquire_reading(self) -> ReadingType:
         reading: ReadingType = self.acquire_reading_data()
         logger.info(reading)
-        # TODO
-        if hasattr(self, "ivReadingLock") and hasattr(self, "ivReadingQueue"):
-            with self.ivReadingLock:
-                self.ivReadingQueue.append(reading)
+        self.queue_readings("iv", [reading])
         self.update_event({
             "smu_voltage": reading.get("v_smu"),
             "smu_current": reading.get("i_smu"),
@@ -62,6 +58,7 @@ class IVBiasMeasurement(RangeMeasurement):
             "dmm_temperature": reading.get("t_dmm"),
         })
         self.iv_reading_event(reading)
+        return reading
 
     def acquire_continuous_reading(self) -> None:
         t: float = time.time()
@@ -84,10 +81,7 @@ class IVBiasMeasurement(RangeMeasurement):
             reading: ReadingType = self.acquire_reading_data(voltage=voltage)
             handle_reading(reading)
 
-            # TODO
-            if hasattr(self, "itReadingLock") and hasattr(self, "itReadingQueue"):
-                with self.itReadingLock:
-                    self.itReadingQueue.append(reading)
+            self.queue_readings("it", [reading])
 
             # Limit some actions for fast measurements
             if dt > interval:
@@ -14,6 +14,7 @@ from typing import Any, Dict, Union
 
 from PyQt5 import QtCore, QtWidgets
 
+from ..iostats import io_statistics
 from . import Plugin
 
 __all__ = ["TCPServerPlugin"]
@@ -42,6 +43,7 @@ class RPCHandler:
         self.dispatcher["stop"] = self.on_stop
         self.dispatcher["change_voltage"] = self.on_change_voltage
         self.dispatcher["state"] = self.on_state
+        self.dispatcher["io_statistics"] = self.on_io_statistics
         self.manager = jsonrpc.JSONRPCResponseManager()
 
     def handle(self, request) -> Dict[str, Any]:
@@ -86,6 +88,10 @@ class RPCHandler:
     def on_state(self) -> Dict[str, Union[None, int, float, str]]:
         return json_dict(self.controller.snapshot())
 
+    def on_io_statistics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return live I/O latency statistics of current or last measurement."""
+        return io_statistics.snapshot()
+
 
 class TCPHandler(socketserver.BaseRequestHandler):
 
@@ -0,0 +1,145 @@
+"""Sweep profiles."""
+
+import math
+import os
+import re
+from array import array
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from .functions import LinearRange
+
+__all__ = ["SweepProfile"]
+
+
+class SweepProfile:
+    """Sweep points precomputed into compact `array('d')` storage, providing
+    constant time length and index access.
+
+    >>> list(SweepProfile.linear(0, 10, 5))
+    [0.0, 5.0, 10.0]
+
+    >>> list(SweepProfile.linear(0, 10, 5).bidirectional()) # hysteresis
+    [0.0, 5.0, 10.0, 5.0, 0.0]
+
+    >>> list(SweepProfile.logarithmic(-1, -100, 3))
+    [-1.0, -10.0, -100.0]
+
+    >>> list(SweepProfile.segments([(0, 10, 5), (10, 12, 1)]))
+    [0.0, 5.0, 10.0, 11.0, 12.0]
+    """
+
+    __slots__ = (
+        "points",
+        "name"
+    )
+
+    def __init__(self, points: Iterable[float], name: str = "list") -> None:
+        self.points: array = array("d", points)
+        self.name: str = name
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, List[float]]:
+        if isinstance(index, slice):
+            return self.points[index].tolist()
+        return self.points[index]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.points)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, {len(self)} points)"
+
+    @property
+    def begin(self) -> float:
+        return self.points[0] if self.points else math.nan
+
+    @property
+    def end(self) -> float:
+        return self.points[-1] if self.points else math.nan
+
+    @property
+    def extent(self) -> float:
+        """Return highest absolute voltage of profile."""
+        return max(map(abs, self.points), default=0.0)
+
+    @property
+    def max_step(self) -> float:
+        """Return largest absolute voltage difference of adjacent points."""
+        return max((abs(b - a) for a, b in zip(self.points, self.points[1:])), default=0.0)
+
+    @classmethod
+    def linear(cls, begin: float, end: float, step: float) -> "SweepProfile":
+        return cls(LinearRange(begin, end, step), "linear")
+
+    @classmethod
+    def logarithmic(cls, begin: float, end: float, count: int, min_value: float = 1.0) -> "SweepProfile":
+        """Return `count` points spaced logarithmically from begin to end.
+        A bound of zero is replaced by `min_value` (with the sign of the
+        other bound) and kept as additional first or last point.
+        """
+        if begin == end or count < 1:
+            return cls([], "logarithmic")
+        first = begin or math.copysign(abs(min_value), end)
+        last = end or math.copysign(abs(min_value), begin)
+        if first * last <= 0:
+            raise ValueError(f"Logarithmic profile requires bounds of the same sign: {begin:g}, {end:g}")
+        points: List[float] = [begin] if begin == 0 else []
+        if count > 1:
+            ratio = (last / first) ** (1 / (count - 1))
+            # Round to significant digits to suppress floating point noise
+            points.extend(float(format(first * ratio ** index, ".12g")) for index in range(count - 1))
+        points.append(last)
+        if end == 0:
+            points.append(end)
+        return cls(points, "logarithmic")
+
+    @classmethod
+    def segments(cls, segments: Iterable[Tuple[float, float, float]]) -> "SweepProfile":
+        """Return profile joining linear segments of begin, end and step."""
+        profile = cls([], "segments")
+        for begin, end, step in segments:
+            profile.extend(LinearRange(begin, end, step))
+        return profile
+
+    @classmethod
+    def from_file(cls, filename: str) -> "SweepProfile":
+        """Return profile read from text file. Every line contains either a
+        single voltage or a linear segment of begin, end and step, separated
+        by commas or whitespace. Lines starting with `#` are ignored.
+        """
+        profile = cls([], f"file:{os.path.basename(filename)}")
+        with open(filename, "rt") as fp:
+            for number, line in enumerate(fp, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    values = [float(value) for value in re.split(r"[\s,;]+", line)]
+                except ValueError as exc:
+                    raise ValueError(f"{filename}:{number}: invalid value: {line!r}") from exc
+                if len(values) == 1:
+                    profile.extend(values)
+                elif len(values) == 3:
+                    profile.extend(LinearRange(*values))
+                else:
+                    raise ValueError(f"{filename}:{number}: expected voltage or begin, end, step: {line!r}")
+        return profile
+
+    def extend(self, points: Iterable[float]) -> None:
+        """Append points, skipping a first point equal to the current end."""
+        iterator = iter(points)
+        for point in iterator:
+            if not self.points or self.points[-1] != point:
+                self.points.append(point)
+            break
+        self.points.extend(iterator)
+
+    def bidirectional(self) -> "SweepProfile":
+        """Return profile followed by its reverse, e.g. for hysteresis
+        measurements.
+        """
+        profile = type(self)(self.points, f"bidirectional {self.name}")
+        profile.extend(reversed(self.points))
+        return profile
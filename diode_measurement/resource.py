@@ -1,9 +1,26 @@
 import logging
+import random
+import sys
+import threading
 import time
+from array import array
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 import pyvisa
+import pyvisa.util
+from pyvisa.constants import EventMechanism, EventType, StatusCode
 
-__all__ = ["ResourceError", "Resource", "AutoReconnectResource"]
+from . import simulation
+
+__all__ = [
+    "ResourceError",
+    "ResourcePool",
+    "Resource",
+    "AutoReconnectResource",
+    "poll_event_status",
+    "parse_binary_block",
+    "resource_pool",
+]
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +30,175 @@ class ResourceError(Exception):
     ...
 
 
+def poll_event_status(query: Callable, timeout: float, interval: float = 0.005, max_interval: float = 0.250,
+                      abort: Optional[Callable[[], bool]] = None) -> bool:
+    """Poll `*ESR?` until operation complete bit is set, starting with a short
+    interval doubled after every poll up to `max_interval`. Returns `False` on
+    timeout or if `abort` returns `True` between polls, polls at least once.
+    """
+    threshold = time.monotonic() + timeout
+    while True:
+        if int(query("*ESR?")) & 0x1:
+            return True
+        remaining = threshold - time.monotonic()
+        if remaining <= 0:
+            return False
+        if abort is not None and abort():
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+def parse_binary_block(block: bytes, datatype: str = "d", is_big_endian: bool = False) -> array:
+    """Parse IEEE 488.2 definite or indefinite (`#0`) length block into an
+    array without intermediate objects. The length of indefinite blocks is
+    taken from the received data, trailing termination bytes are dropped.
+    """
+    offset, data_length = pyvisa.util.parse_ieee_block_header(block)
+    values = array(datatype)
+    if not data_length:
+        data_length = len(block) - offset
+        data_length -= data_length % values.itemsize
+    values.frombytes(memoryview(block)[offset:offset + data_length])
+    if is_big_endian != (sys.byteorder == "big"):
+        values.byteswap()
+    return values
+
+
+class ResourcePool:
+    """Process wide cache of VISA resource managers and idle sessions.
+
+    Sessions released to the pool are kept open for `idle_timeout` seconds
+    and reused by the next resource with identical name, library and
+    options. An `idle_timeout` of zero closes sessions on release.
+    """
+
+    probe_timeout: float = 500
+    """Timeout in milliseconds of the serial poll probing idle sessions."""
+
+    def __init__(self, idle_timeout: float = 0.0) -> None:
+        self.idle_timeout: float = idle_timeout
+        self._lock = threading.RLock()
+        self._managers: Dict[str, pyvisa.ResourceManager] = {}
+        self._sessions: Dict[Hashable, Tuple[pyvisa.resources.Resource, float]] = {}
+
+    @staticmethod
+    def session_key(resource_name: str, visa_library: str, options: dict) -> Hashable:
+        return resource_name, visa_library, tuple(sorted(options.items()))
+
+    def resource_manager(self, visa_library: str) -> pyvisa.ResourceManager:
+        """Return cached resource manager for VISA library."""
+        with self._lock:
+            rm = self._managers.get(visa_library)
+            if rm is None:
+                rm = pyvisa.ResourceManager(visa_library)
+                self._managers[visa_library] = rm
+            return rm
+
+    def acquire(self, resource_name: str, visa_library: str, options: dict) -> pyvisa.resources.Resource:
+        """Return idle session if available and healthy, else open a new
+        session.
+        """
+        key = self.session_key(resource_name, visa_library, options)
+        with self._lock:
+            self.evict_idle()
+            session, _ = self._sessions.pop(key, (None, 0.0))
+        if session is not None:
+            if self.is_alive(session):
+                logger.debug("reusing session: %r", resource_name)
+                return session
+            self.close_session(session)
+        if simulation.is_simulated(resource_name):
+            return simulation.open_session(resource_name, **options)
+        rm = self.resource_manager(visa_library)
+        return rm.open_resource(resource_name=resource_name, **options)
+
+    def release(self, resource_name: str, visa_library: str, options: dict, session: pyvisa.resources.Resource) -> None:
+        """Return session to the pool, closes session if pooling is disabled."""
+        key = self.session_key(resource_name, visa_library, options)
+        with self._lock:
+            if self.idle_timeout > 0 and key not in self._sessions:
+                self._sessions[key] = session, time.monotonic()
+                return
+        self.close_session(session)
+
+    def evict_idle(self) -> None:
+        """Close sessions idle for more than `idle_timeout` seconds."""
+        threshold = time.monotonic() - self.idle_timeout
+        sessions: List[pyvisa.resources.Resource] = []
+        with self._lock:
+            for key, (session, timestamp) in list(self._sessions.items()):
+                if timestamp <= threshold:
+                    del self._sessions[key]
+                    sessions.append(session)
+        for session in sessions:
+            self.close_session(session)
+
+    def clear(self) -> None:
+        """Close all idle sessions and resource managers."""
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            managers = list(self._managers.values())
+            self._sessions.clear()
+            self._managers.clear()
+        for session in sessions:
+            self.close_session(session)
+        for rm in managers:
+            try:
+                rm.close()
+            except Exception as exc:
+                logger.exception(exc)
+
+    def is_alive(self, session: pyvisa.resources.Resource) -> bool:
+        """Return `True` if session handle is still valid and the instrument
+        answers a serial poll within `probe_timeout`. Sessions not supporting
+        serial polls are checked for a valid handle only.
+        """
+        try:
+            session.session
+            timeout = session.timeout
+        except Exception:
+            return False
+        try:
+            session.timeout = self.probe_timeout
+            session.read_stb()
+        except NotImplementedError:
+            return True
+        except pyvisa.VisaIOError as exc:
+            if exc.error_code == StatusCode.error_nonsupported_operation:
+                return True
+            logger.debug("idle session not responding: %s", exc)
+            return False
+        except Exception as exc:
+            logger.debug("idle session not responding: %s", exc)
+            return False
+        finally:
+            try:
+                session.timeout = timeout
+            except Exception:
+                ...
+        return True
+
+    @staticmethod
+    def close_session(session: pyvisa.resources.Resource) -> None:
+        try:
+            session.close()
+        except Exception as exc:
+            logger.exception(exc)
+
+
+resource_pool = ResourcePool()
+
+
 class Resource:
 
+    srq_enabled: bool = False
+    """Wait for service requests on operation complete if supported."""
+
+    abort_interval: float = 0.100
+    """Interval in seconds checking abort requests while waiting for service
+    requests."""
+
     def __init__(self, resource_name: str, visa_library: str, **options):
         self.resource_name = resource_name
         self.visa_library = visa_library
@@ -24,30 +208,49 @@ class Resource:
             "timeout": 8000
         }
         self.options.update(options)
+        self.io_hooks: List[Callable] = []
+        self.reconnect_hooks: List[Callable[[], None]] = []
+        self.reconnects: int = 0
         self._resource = None
+        self._retries: int = 0
+        self._srq_session = None
+        self._srq_armed: bool = False
 
     def __enter__(self):
         try:
-            rm = pyvisa.ResourceManager(self.visa_library)
-            self._resource = rm.open_resource(resource_name=self.resource_name, **self.options)
+            self._resource = resource_pool.acquire(self.resource_name, self.visa_library, self.options)
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
         return self
 
-    def __exit__(self, *exc):
+    def __exit__(self, exc_type=None, exc_value=None, traceback=None):
+        try:
+            # Do not reuse sessions after errors
+            self.close(discard=exc_type is not None)
+        finally:
+            return False
+
+    def close(self, discard: bool = False) -> None:
+        """Release session to the resource pool or close it if `discard` is
+        set.
+        """
         try:
             if self._resource is not None:
-                self._resource.close()
+                if discard:
+                    self._resource.close()
+                else:
+                    resource_pool.release(self.resource_name, self.visa_library, self.options, self._resource)
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
         finally:
             self._resource = None
-            return False
 
     def query(self, message):
         try:
             logger.debug("resource.write: `%s`", message)
+            t0 = time.perf_counter()
             result = self._resource.query(message)
+            self._handle_io(message, time.perf_counter() - t0, len(message), len(result))
             logger.debug("resource.read: `%s`", result)
             return result
         except pyvisa.Error as exc:
@@ -56,47 +259,236 @@ class Resource:
     def write(self, message):
         try:
             logger.debug("resource.write: `%s`", message)
-            return self._resource.write(message)
+            t0 = time.perf_counter()
+            result = self._resource.write(message)
+            self._handle_io(message, time.perf_counter() - t0, len(message), 0)
+            return result
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
 
     def read(self):
         try:
+            t0 = time.perf_counter()
             result = self._resource.read()
+            self._handle_io("<read>", time.perf_counter() - t0, 0, len(result))
             logger.debug("resource.read: `%s`", result)
             return result
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
 
+    def query_binary_values(self, message: str, datatype: str = "d", is_big_endian: bool = False) -> array:
+        """Query IEEE 488.2 binary block into an array of `datatype` (`d` for
+        64 bit, `f` for 32 bit floats). The block is read until the end of
+        message (EOI) as data can contain termination characters, the number
+        of values is taken from the received data.
+        """
+        try:
+            logger.debug("resource.write: `%s`", message)
+            t0 = time.perf_counter()
+            self._resource.write(message)
+            read_termination = self._resource.read_termination
+            self._resource.read_termination = None
+            try:
+                block = bytearray(self._resource.read_raw())
+                offset, data_length = pyvisa.util.parse_ieee_block_header(block)
+                if data_length:
+                    expected_length = offset + data_length
+                    if len(block) < expected_length:
+                        block.extend(self._resource.read_bytes(expected_length - len(block)))
+            finally:
+                self._resource.read_termination = read_termination
+            self._handle_io(message, time.perf_counter() - t0, len(message), len(block))
+            logger.debug("resource.read: <%d bytes>", len(block))
+        except pyvisa.Error as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+        return parse_binary_block(block, datatype, is_big_endian)
+
+    def _handle_io(self, message: str, duration: float, bytes_written: int, bytes_read: int) -> None:
+        """Pass I/O timing to hooks, called as `hook(resource_name, message,
+        duration, bytes_written, bytes_read, retries)`.
+        """
+        for hook in self.io_hooks:
+            hook(self.resource_name, message, duration, bytes_written, bytes_read, self._retries)
+
     def clear(self):
         try:
             self._resource.clear()
         except pyvisa.Error as exc:
             raise ResourceError(f"{self.resource_name}: {exc}") from exc
 
+    def read_stb(self) -> int:
+        """Return status byte (serial poll)."""
+        try:
+            return self._resource.read_stb()
+        except pyvisa.Error as exc:
+            raise ResourceError(f"{self.resource_name}: {exc}") from exc
+
+    def prepare_opc(self) -> None:
+        """Arm service request on operation complete if enabled, to be called
+        before writing `*OPC` so that an early completion is queued. Event
+        status and service request enable registers are written once per
+        session.
+        """
+        if not self.srq_enabled:
+            return
+        try:
+            if self._srq_session is not self._resource:
+                self._resource.write("*ESE 1")  # operation complete
+                self._resource.write("*SRE 32")  # event summary bit
+                self._srq_session = self._resource
+            self._resource.discard_events(EventType.service_request, EventMechanism.queue)
+            self._resource.enable_event(EventType.service_request, EventMechanism.queue)
+            self._srq_armed = True
+        except (pyvisa.Error, NotImplementedError) as exc:
+            logger.warning("%s: service requests not supported, using polling: %s", self.resource_name, exc)
+            self.srq_enabled = False
+
+    def wait_for_opc(self, timeout: float, abort: Optional[Callable[[], bool]] = None) -> bool:
+        """Wait for operation complete after `*OPC` was written, returns `False`
+        on timeout or if `abort` returns `True`. Blocks on a VISA service
+        request if armed by `prepare_opc`, confirming the event status using
+        `*ESR?`, else falls back to adaptive polling.
+        """
+        threshold = time.monotonic() + timeout
+        if self.srq_enabled and self._srq_armed:
+            if not self._wait_for_srq(timeout, abort):
+                if abort is not None and abort():
+                    return False
+                if not poll_event_status(self.query, 0):
+                    return False
+                # Operation completed without service request
+                logger.warning("%s: missed service request, using polling", self.resource_name)
+                self.srq_enabled = False
+                return True
+        return poll_event_status(self.query, max(0, threshold - time.monotonic()), abort=abort)
+
+    @property
+    def srq_armed(self) -> bool:
+        """`True` if a service request was armed by `prepare_opc`."""
+        return self.srq_enabled and self._srq_armed
+
+    def poll_srq(self) -> bool:
+        """Return `True` if the service request armed by `prepare_opc`
+        occurred or service requests are not supported, `False` while still
+        pending. Does not block, for callers waiting on an event loop.
+        """
+        if self._wait_on_srq(0) is False:
+            return False
+        self.disarm_srq()
+        return True
+
+    def disarm_srq(self) -> None:
+        """Disable and discard service request events armed by
+        `prepare_opc`.
+        """
+        self._srq_armed = False
+        try:
+            self._resource.disable_event(EventType.service_request, EventMechanism.queue)
+            self._resource.discard_events(EventType.service_request, EventMechanism.queue)
+        except (pyvisa.Error, NotImplementedError) as exc:
+            logger.warning("%s: service requests not supported, using polling: %s", self.resource_name, exc)
+            self.srq_enabled = False
+
+    def _wait_for_srq(self, timeout: float, abort: Optional[Callable[[], bool]] = None) -> bool:
+        threshold = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = max(0, threshold - time.monotonic())
+                # Wait in slices to check for abort requests
+                wait = remaining if abort is None else min(remaining, self.abort_interval)
+                if self._wait_on_srq(wait) is not False:
+                    return True
+                if wait >= remaining or (abort is not None and abort()):
+                    return False
+        finally:
+            self.disarm_srq()
+
+    def _wait_on_srq(self, timeout: float) -> Optional[bool]:
+        """Wait for service request, returns `False` on timeout and `None`
+        if service requests are not supported.
+        """
+        try:
+            self._resource.wait_on_event(EventType.service_request, round(timeout * 1e3))
+            self._resource.read_stb()
+            return True
+        except pyvisa.VisaIOError as exc:
+            if exc.error_code == StatusCode.error_timeout:
+                return False
+            logger.warning("%s: service requests not supported, using polling: %s", self.resource_name, exc)
+        except (pyvisa.Error, NotImplementedError) as exc:
+            logger.warning("%s: service requests not supported, using polling: %s", self.resource_name, exc)
+        self.srq_enabled = False
+        return None
+
 
 class AutoReconnectResource(Resource):
+    """Resource reconnecting on I/O errors with jittered exponential backoff.
 
-    retry_attempts = 3
-    retry_delay = 1.0
+    After a reconnect the reconnect hooks are called, e.g. to restore the
+    instrument configuration, before the failed command is retried. Retries
+    stop after `retry_attempts` or if the next attempt would exceed
+    `retry_budget` seconds.
+    """
+
+    retry_attempts = 8
+    retry_delay = 0.5
+    retry_max_delay = 8.0
+    retry_budget = 60.0
+
+    def __init__(self, resource_name: str, visa_library: str, **options):
+        super().__init__(resource_name, visa_library, **options)
+        self._reconnecting: bool = False
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Return randomized delay before reconnect `attempt`, between half
+        and full of the exponentially growing delay.
+        """
+        delay = min(self.retry_max_delay, self.retry_delay * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+
+    def reconnect(self, delay: float) -> None:
+        try:
+            self.close(discard=True)
+        except Exception:
+            ...
+        time.sleep(delay)
+        self.__enter__()
+        self.reconnects += 1
+        # Hook I/O fails the attempt instead of retrying recursively
+        self._reconnecting = True
+        try:
+            for hook in self.reconnect_hooks:
+                hook()
+        except (pyvisa.Error, ConnectionError, ResourceError):
+            raise
+        except Exception as exc:
+            raise ResourceError(f"{self.resource_name}: failed to restore state: {exc}") from exc
+        finally:
+            self._reconnecting = False
 
     def _reconnect_retry(self, target, *args):
-        for attempt in range(self.retry_attempts + 1):
-            try:
-                if attempt:
-                    logger.info("auto reconnect to resource (%d/%d): %s", attempt, self.retry_attempts, repr(self.resource_name))
-                    try:
-                        self.__exit__()
-                    except Exception:
-                        ...
-                    time.sleep(self.retry_delay)
-                    self.__enter__()
-                return target(*args)
-            except (pyvisa.Error, ConnectionError, ResourceError) as exc:
-                if attempt < self.retry_attempts:
+        if self._reconnecting:
+            return target(*args)
+        deadline = time.monotonic() + self.retry_budget
+        attempt = 0
+        delay = 0.0
+        try:
+            while True:
+                # Reported to I/O hooks
+                self._retries = attempt
+                try:
+                    if attempt:
+                        logger.info("auto reconnect to resource in %.1f s (%d/%d): %s", delay, attempt, self.retry_attempts, repr(self.resource_name))
+                        self.reconnect(delay)
+                    return target(*args)
+                except (pyvisa.Error, ConnectionError, ResourceError) as exc:
+                    attempt += 1
+                    delay = self.backoff_delay(attempt)
+                    if attempt > self.retry_attempts or time.monotonic() + delay > deadline:
+                        raise
                     logger.exception(exc)
-                else:
-                    raise
+        finally:
+            self._retries = 0
 
     def query(self, message):
         return self._reconnect_retry(super().query, message)
@@ -107,5 +499,11 @@ class AutoReconnectResource(Resource):
     def read(self):
         return self._reconnect_retry(super().read)
 
+    def query_binary_values(self, message, datatype="d", is_big_endian=False):
+        return self._reconnect_retry(super().query_binary_values, message, datatype, is_big_endian)
+
     def clear(self):
         return self._reconnect_retry(super().clear)
+
+    def read_stb(self):
+        return self._reconnect_retry(super().read_stb)
@@ -0,0 +1,84 @@
+"""Reduce repeated samples of a reading."""
+
+import math
+import statistics
+from typing import List, Sequence, Tuple
+
+__all__ = ["sigma_clip", "trimmed_mean", "reduce_samples"]
+
+METHODS: Tuple[str, ...] = ("median", "trimmed_mean", "mean")
+
+
+MAD_SCALE: float = 1.4826
+"""Scale of the median absolute deviation estimating the standard deviation
+of normally distributed values."""
+
+
+def sigma_clip(values: Sequence[float], sigma: float, iterations: int = 5) -> List[float]:
+    """Return values within `sigma` standard deviations of their median,
+    repeated until no more values are rejected. The standard deviation is
+    estimated from the median absolute deviation, not being inflated by the
+    outliers to be rejected, or the population standard deviation if more
+    than half of the values are identical.
+
+    >>> sigma_clip([1.0, 1.1, 0.9, 1.0, 9.0], 2.0)
+    [1.0, 1.1, 0.9, 1.0]
+    """
+    result: List[float] = list(values)
+    for _ in range(iterations):
+        if len(result) < 3:
+            break
+        center = statistics.median(result)
+        deviation = MAD_SCALE * statistics.median(abs(value - center) for value in result)
+        if not deviation:
+            deviation = statistics.pstdev(result)
+        if not deviation:
+            break
+        kept = [value for value in result if abs(value - center) <= sigma * deviation]
+        if len(kept) == len(result):
+            break
+        result = kept
+    return result
+
+
+def trimmed_mean(values: Sequence[float], proportion: float = 0.1) -> float:
+    """Return mean of values without `proportion` of the lowest and highest
+    values, at least one value is removed from each side of three or more
+    values.
+
+    >>> trimmed_mean([1.0, 2.0, 3.0, 4.0, 100.0], 0.2)
+    3.0
+    """
+    ordered: List[float] = sorted(values)
+    cut: int = 0
+    if len(ordered) >= 3:
+        cut = min(max(1, int(len(ordered) * proportion)), (len(ordered) - 1) // 2)
+    if cut:
+        ordered = ordered[cut:-cut]
+    return statistics.fmean(ordered)
+
+
+def reduce_samples(values: Sequence[float], method: str = "median", sigma: float = 0.0,
+                   proportion: float = 0.1) -> Tuple[float, float]:
+    """Return reduced value and standard deviation of samples. Samples not
+    being finite are ignored, outliers are rejected by sigma clipping if
+    `sigma` is greater than zero.
+
+    >>> reduce_samples([1.0, 3.0, 2.0])
+    (2.0, 1.0)
+    """
+    finite: List[float] = [value for value in values if math.isfinite(value)]
+    if not finite:
+        return math.nan, math.nan
+    if sigma > 0:
+        finite = sigma_clip(finite, sigma)
+    if method == "median":
+        value = statistics.median(finite)
+    elif method == "trimmed_mean":
+        value = trimmed_mean(finite, proportion)
+    elif method == "mean":
+        value = statistics.fmean(finite)
+    else:
+        raise ValueError(f"Invalid sample reduction method: {method!r}")
+    deviation = statistics.stdev(finite) if len(finite) > 1 else math.nan
+    return value, deviation
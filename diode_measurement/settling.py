@@ -0,0 +1,69 @@
+"""Detect settling of repeated readings."""
+
+import math
+from collections import deque
+from typing import Deque, Tuple
+
+__all__ = ["Settling"]
+
+
+class Settling:
+    """Detect settling of repeated readings.
+
+    Mode `tolerance` is settled if the last `count` readings are within
+    relative `tolerance` of their mean, mode `slope` is settled if the
+    relative slope of a linear fit over the last `count` readings is below
+    `tolerance` per second.
+
+    >>> s = Settling("tolerance", 0.01, 3)
+    >>> [s.append(value, t) for t, value in enumerate([2.0, 1.2, 1.01, 1.0, 1.0])]
+    [False, False, False, False, True]
+    """
+
+    modes: Tuple[str, ...] = ("tolerance", "slope")
+
+    noise_floor: float = 1e-12
+    """Lower bound of readings used as reference for relative changes."""
+
+    def __init__(self, mode: str, tolerance: float, count: int) -> None:
+        if mode not in type(self).modes:
+            raise ValueError(f"Invalid settling mode: {mode!r}")
+        self.mode: str = mode
+        self.tolerance: float = abs(tolerance)
+        self.count: int = max(2, count)
+        self._readings: Deque[Tuple[float, float]] = deque(maxlen=self.count)
+
+    def reset(self) -> None:
+        self._readings.clear()
+
+    def append(self, value: float, timestamp: float) -> bool:
+        """Append reading taken at timestamp in seconds, return `True` if
+        readings are settled.
+        """
+        if not math.isfinite(value):
+            self._readings.clear()
+            return False
+        self._readings.append((timestamp, value))
+        if len(self._readings) < self.count:
+            return False
+        if self.mode == "slope":
+            return self._settled_slope()
+        return self._settled_tolerance()
+
+    def _reference(self) -> float:
+        mean = sum(value for _, value in self._readings) / len(self._readings)
+        return max(abs(mean), self.noise_floor)
+
+    def _settled_tolerance(self) -> bool:
+        values = [value for _, value in self._readings]
+        return max(values) - min(values) <= self.tolerance * self._reference()
+
+    def _settled_slope(self) -> bool:
+        count = len(self._readings)
+        t_mean = sum(t for t, _ in self._readings) / count
+        v_mean = sum(value for _, value in self._readings) / count
+        denominator = sum((t - t_mean) ** 2 for t, _ in self._readings)
+        if not denominator:
+            return False
+        slope = sum((t - t_mean) * (value - v_mean) for t, value in self._readings) / denominator
+        return abs(slope) <= self.tolerance * self._reference()
@@ -0,0 +1,1133 @@
+"""Simulated instruments for running measurements without lab hardware.
+
+Resource names of the form ``SIM::<model>::<bench>`` open a simulated session
+instead of a VISA session, e.g. ``SIM::K2410::1``. Instruments sharing a
+bench are connected to the same simulated diode, voltages applied by all
+sources of a bench add up.
+
+Integration and settling times follow the instrument settings (NPLC,
+filter count, aperture) scaled by `SimulatedInstrument.time_scale`, every
+message is delayed by `SimulatedInstrument.latency` seconds. Set
+`time_scale` to zero to run measurements as fast as possible.
+"""
+
+import logging
+import math
+import random
+import re
+import struct
+import threading
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pyvisa
+from pyvisa.constants import StatusCode
+
+__all__ = [
+    "SimulatedDiode",
+    "SimulatedInstrument",
+    "SimulatedSession",
+    "is_simulated",
+    "open_session",
+    "simulated_diode",
+]
+
+logger = logging.getLogger(__name__)
+
+RE_RESOURCE_NAME = re.compile(r"^SIM::(\w+)(?:::(\w+))?$", re.IGNORECASE)
+
+LINE_FREQUENCY: float = 50.0
+
+THERMAL_VOLTAGE: float = 0.02585
+
+
+def format_values(values: List[float], precision: int = 6) -> str:
+    return ",".join(format(value, f"+.{precision:d}E") for value in values)
+
+
+def binary_block(values: List[float], datatype: str = "d", is_big_endian: bool = True) -> bytes:
+    """Return IEEE 488.2 definite length binary block."""
+    data = struct.pack(f"{'>' if is_big_endian else '<'}{len(values):d}{datatype}", *values)
+    length = str(len(data))
+    return f"#{len(length):d}{length}".encode() + data
+
+
+class SimulatedDiode:
+    """Silicon pad diode with depletion voltage dependent leakage current
+    and capacitance.
+
+    Reverse leakage current and depletion depth grow with the square root of
+    the bias voltage until full depletion. Negative voltages are reverse bias.
+    """
+
+    def __init__(self) -> None:
+        self.saturation_current: float = 1e-12
+        self.ideality: float = 1.5
+        self.leakage_current: float = 5e-9
+        self.built_in_voltage: float = 0.6
+        self.full_depletion_voltage: float = 80.0
+        self.end_capacitance: float = 25e-12
+        self.parallel_resistance: float = 1e9
+        self.noise: float = 0.005
+        self.temperature: float = 23.0
+        self._voltages: Dict[int, float] = {}
+        self._random = random.Random()
+        self._lock = threading.RLock()
+
+    @property
+    def voltage(self) -> float:
+        with self._lock:
+            return sum(self._voltages.values())
+
+    def set_voltage(self, source: object, voltage: float) -> None:
+        """Set voltage applied by source, zero for disabled outputs."""
+        with self._lock:
+            self._voltages[id(source)] = voltage
+
+    def depletion(self, voltage: float) -> float:
+        """Return depleted fraction of the bulk (0 to 1)."""
+        reverse = max(0.0, -voltage) + self.built_in_voltage
+        return min(1.0, math.sqrt(reverse / (self.full_depletion_voltage + self.built_in_voltage)))
+
+    def current(self, voltage: Optional[float] = None) -> float:
+        if voltage is None:
+            voltage = self.voltage
+        if voltage > 0:
+            exponent = min(voltage, 1.0) / (self.ideality * THERMAL_VOLTAGE)
+            current = self.saturation_current * math.expm1(exponent)
+        else:
+            current = -(self.saturation_current + self.leakage_current * self.depletion(voltage))
+        return current * self._random.gauss(1.0, self.noise)
+
+    def capacitance(self, voltage: Optional[float] = None) -> float:
+        if voltage is None:
+            voltage = self.voltage
+        return self.end_capacitance / self.depletion(voltage) * self._random.gauss(1.0, self.noise)
+
+    def resistance(self) -> float:
+        return self.parallel_resistance * self._random.gauss(1.0, self.noise)
+
+    def read_temperature(self) -> float:
+        return self.temperature + self._random.gauss(0.0, 0.05)
+
+
+class SimulatedInstrument:
+    """Base class of simulated instruments, parsing messages into commands
+    and queuing responses.
+    """
+
+    latency: float = 0.0
+    """Delay of every message in seconds."""
+
+    time_scale: float = 1.0
+    """Scale of integration and settling times, zero runs instantly."""
+
+    identity: str = ""
+
+    def __init__(self, diode: SimulatedDiode) -> None:
+        self.diode: SimulatedDiode = diode
+        self.output: List[bytes] = []
+        self.errors: List[Tuple[int, str]] = []
+        self.lock = threading.RLock()
+        self.time_origin: float = time.monotonic()
+        self.reset()
+
+    def reset(self) -> None:
+        self.output.clear()
+        self.errors.clear()
+
+    def clear(self) -> None:
+        """Device clear, discards pending output."""
+        self.output.clear()
+
+    def status_byte(self) -> int:
+        return 0x20 if self.errors else 0
+
+    def sleep(self, duration: float) -> None:
+        duration *= self.time_scale
+        if duration > 0:
+            time.sleep(duration)
+
+    def busy_until(self, duration: float) -> float:
+        return time.monotonic() + duration * self.time_scale
+
+    def timestamp(self) -> float:
+        return (time.monotonic() - self.time_origin) / (self.time_scale or 1.0)
+
+    def respond(self, response) -> None:
+        if isinstance(response, str):
+            response = response.encode()
+        self.output.append(response)
+
+    def error(self, code: int, message: str) -> None:
+        logger.debug("%s: error %d: %s", type(self).__name__, code, message)
+        self.errors.append((code, message))
+
+    def write(self, message: str) -> None:
+        with self.lock:
+            self.execute(message)
+
+    def read(self) -> Optional[bytes]:
+        with self.lock:
+            if self.output:
+                return self.output.pop(0)
+            return None
+
+    def execute(self, message: str) -> None:
+        raise NotImplementedError()
+
+
+class ScpiInstrument(SimulatedInstrument):
+    """SCPI instrument, compound commands are separated by semicolons.
+
+    Commands without handler are stored as settings and returned by the
+    corresponding query.
+    """
+
+    defaults: Dict[str, str] = {}
+    """Values returned by queries of settings not written yet."""
+
+    def reset(self) -> None:
+        super().reset()
+        self.settings: Dict[str, str] = dict(self.defaults)
+        self.event_status: int = 0
+        self.opc_pending: bool = False
+        self.operation_complete: float = 0.0
+        self.update()
+
+    def setting(self, header: str, default: str = "") -> str:
+        return self.settings.get(header, default)
+
+    def float_setting(self, header: str, default: float = 0.0) -> float:
+        try:
+            return float(self.settings.get(header, default))
+        except ValueError:
+            return default
+
+    def bool_setting(self, header: str, default: bool = False) -> bool:
+        value = self.settings.get(header)
+        if value is None:
+            return default
+        return value.strip().upper() in ("1", "ON", "TRUE")
+
+    def respond_values(self, values: List[float]) -> None:
+        """Respond values in ASCII or binary format selected by `:FORM:DATA`."""
+        data_format = self.setting(":FORM:DATA", "ASC").replace(" ", "").upper()
+        if data_format.startswith("REAL"):
+            datatype = "f" if data_format.endswith(",32") else "d"
+            is_big_endian = self.setting(":FORM:BORD", "NORM").upper().startswith("NORM")
+            self.respond(binary_block(values, datatype, is_big_endian))
+        else:
+            self.respond(format_values(values))
+
+    def update_opc(self) -> None:
+        if self.opc_pending and time.monotonic() >= self.operation_complete:
+            self.opc_pending = False
+            self.event_status |= 0x01
+
+    def execute(self, message: str) -> None:
+        for command in message.split(";"):
+            command = command.strip()
+            if not command:
+                continue
+            header, _, args = command.partition(" ")
+            header = header.upper()
+            if not header.startswith("*") and not header.startswith(":"):
+                header = f":{header}"
+            self.execute_command(header, args.strip())
+
+    def execute_command(self, header: str, args: str) -> None:
+        handler: Optional[Callable[[str], None]] = self.handlers().get(header)
+        if handler is not None:
+            handler(args)
+        elif header == "*IDN?":
+            self.respond(self.identity)
+        elif header == "*RST":
+            self.reset()
+        elif header == "*CLS":
+            self.errors.clear()
+            self.event_status = 0
+        elif header == "*OPC":
+            self.opc_pending = True
+        elif header == "*OPC?":
+            self.sleep_until(self.operation_complete)
+            self.respond("1")
+        elif header == "*ESR?":
+            self.update_opc()
+            self.respond(format(self.event_status, "d"))
+            self.event_status = 0
+        elif header in ("*ESE", "*SRE"):
+            ...
+        elif header == ":SYST:ERR?":
+            code, message = self.errors.pop(0) if self.errors else (0, "No error")
+            self.respond(f"{code:d},\"{message}\"")
+        elif header.endswith("?"):
+            if header[:-1] in self.settings:
+                self.respond(self.settings[header[:-1]])
+            else:
+                self.error(-113, "Undefined header")
+        else:
+            self.settings[header] = args
+            self.update()
+
+    def sleep_until(self, timestamp: float) -> None:
+        remaining = timestamp - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        return {}
+
+    def update(self) -> None:
+        """Called after a setting changed."""
+        ...
+
+
+class SourceMeterInstrument(ScpiInstrument):
+    """SCPI source meter unit (K2400 series)."""
+
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 2410,4000000,C34 (simulated)"
+
+    defaults = {
+        ":OUTP:STAT": "0",
+        ":SOUR:VOLT:LEV": "+0.000000E+00",
+        ":SOUR:DEL:AUTO": "1",
+        ":SOUR:DEL": "+1.000000E-03",
+    }
+
+    compliance_header = ":SENS:CURR:PROT:LEV"
+    average_header = ":SENS:AVER"
+    elements = ["VOLT", "CURR", "RES", "TIME", "STAT"]
+
+    def reset(self) -> None:
+        super().reset()
+        self.readings: List[Dict[str, float]] = []
+        self.compliance_tripped: bool = False
+
+    @property
+    def output_enabled(self) -> bool:
+        return self.bool_setting(":OUTP:STAT")
+
+    def source_voltage(self) -> float:
+        return self.float_setting(":SOUR:VOLT:LEV") if self.output_enabled else 0.0
+
+    def integration_time(self) -> float:
+        count = 1
+        if self.bool_setting(f"{self.average_header}:STAT"):
+            count = max(1, int(self.float_setting(f"{self.average_header}:COUN", 10)))
+        return self.float_setting(":SENS:CURR:NPLC", 1.0) / LINE_FREQUENCY * count
+
+    def update(self) -> None:
+        self.diode.set_voltage(self, self.source_voltage())
+
+    def measure(self, voltage: Optional[float] = None) -> Dict[str, float]:
+        if voltage is None:
+            voltage = self.source_voltage()
+        else:
+            self.diode.set_voltage(self, voltage)
+        compliance = abs(self.float_setting(self.compliance_header, 105e-6))
+        current = self.diode.current() if self.output_enabled else random.gauss(0.0, 1e-12)
+        self.compliance_tripped = abs(current) >= compliance
+        if self.compliance_tripped:
+            current = math.copysign(compliance, current)
+        return {
+            "VOLT": voltage,
+            "CURR": current,
+            "RES": 9.91e37,
+            "TIME": self.timestamp(),
+            "STAT": 8.0 if self.compliance_tripped else 0.0,
+        }
+
+    def respond_readings(self, readings: List[Dict[str, float]]) -> None:
+        selected = [name.strip().upper() for name in self.setting(":FORM:ELEM", "VOLT,CURR").split(",")]
+        elements = [name for name in self.elements if name in selected]
+        self.respond_values([reading[name] for reading in readings for name in elements])
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        return {
+            ":READ?": self.on_read,
+            ":INIT": self.on_init,
+            ":FETC?": self.on_fetch,
+            ":ABOR": self.on_abort,
+            ":SENS:CURR:PROT:TRIP?": self.on_compliance_tripped,
+        }
+
+    def on_read(self, args: str) -> None:
+        self.sleep(self.integration_time())
+        self.respond_readings([self.measure()])
+
+    def on_init(self, args: str) -> None:
+        if self.setting(":SOUR:VOLT:MODE", "FIX").upper() == "LIST":
+            points = [float(value) for value in self.setting(":SOUR:LIST:VOLT").split(",") if value.strip()]
+            count = int(self.float_setting(":TRIG:COUN", 1))
+            points = (points * count)[:count]
+            delay = self.float_setting(":SOUR:DEL", 0.001)
+        else:
+            points = [self.source_voltage()]
+            delay = 0.0
+        readings = []
+        for voltage in points:
+            reading = self.measure(voltage)
+            readings.append(reading)
+        if readings:
+            # Simulated timestamps of the sweep
+            step = delay + self.integration_time()
+            for index, reading in enumerate(readings):
+                reading["TIME"] += index * step
+        self.readings = readings
+        self.update()
+        self.operation_complete = self.busy_until(len(points) * (delay + self.integration_time()))
+
+    def on_fetch(self, args: str) -> None:
+        self.sleep_until(self.operation_complete)
+        self.respond_readings(self.readings)
+
+    def on_abort(self, args: str) -> None:
+        self.operation_complete = time.monotonic()
+
+    def on_compliance_tripped(self, args: str) -> None:
+        self.measure()
+        self.respond(format(self.compliance_tripped, "d"))
+
+
+class K2470Instrument(SourceMeterInstrument):
+
+    identity = "KEITHLEY INSTRUMENTS,MODEL 2470,04000000,1.7.0b (simulated)"
+
+    compliance_header = ":SOUR:VOLT:ILIM:LEV"
+    average_header = ":SENS:CURR:AVER"
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        return {
+            ":MEAS:CURR?": self.on_measure_current,
+            ":MEAS:VOLT?": self.on_measure_voltage,
+            ":INIT": self.on_init,
+            ":ABOR": self.on_abort,
+            ":TRAC:CLE": self.on_trace_clear,
+            ":TRAC:DATA?": self.on_trace_data,
+            ":SOUR:VOLT:ILIM:LEV:TRIP?": self.on_compliance_tripped,
+            ":OUTP:INT:TRIP?": lambda args: self.respond("1"),
+        }
+
+    def on_measure_current(self, args: str) -> None:
+        self.sleep(self.integration_time())
+        self.respond(format_values([self.measure()["CURR"]]))
+
+    def on_measure_voltage(self, args: str) -> None:
+        self.sleep(self.integration_time())
+        self.respond(format_values([self.measure()["VOLT"]]))
+
+    def on_init(self, args: str) -> None:
+        sweep = self.settings.pop(":SOUR:SWE:VOLT:LIST", None)
+        if sweep is None:
+            self.readings.append(self.measure())
+            self.operation_complete = self.busy_until(self.integration_time())
+            return
+        _, _, delay = sweep.partition(",")
+        delay = float(delay or 0.0)
+        points = [float(value) for value in self.setting(":SOUR:LIST:VOLT").split(",") if value.strip()]
+        step = delay + self.integration_time()
+        for index, voltage in enumerate(points):
+            reading = self.measure(voltage)
+            reading["TIME"] = index * step
+            self.readings.append(reading)
+        self.update()
+        self.operation_complete = self.busy_until(len(points) * step)
+
+    def on_trace_clear(self, args: str) -> None:
+        self.readings = []
+
+    def on_trace_data(self, args: str) -> None:
+        self.sleep_until(self.operation_complete)
+        fields = [field.strip().strip('"').upper() for field in args.split(",")]
+        try:
+            begin, end = int(fields[0]), int(fields[1])
+        except (IndexError, ValueError):
+            self.error(-109, "Missing parameter")
+            return
+        names = {"READ": "CURR", "SOUR": "VOLT", "REL": "TIME"}
+        elements = [names[field] for field in fields[3:] if field in names] or ["CURR"]
+        readings = self.readings[begin - 1:end]
+        self.respond_values([reading[name] for reading in readings for name in elements])
+
+
+class K2657AInstrument(SimulatedInstrument):
+    """TSP source meter, supports the statements used by the driver."""
+
+    identity = "Keithley Instruments Inc., Model 2657A, 4000000, 1.1.7 (simulated)"
+
+    def reset(self) -> None:
+        super().reset()
+        self.attributes: Dict[str, str] = {
+            "smua.source.output": "0",
+            "smua.source.levelv": "0",
+            "smua.source.limiti": "1e-05",
+            "smua.measure.nplc": "1",
+            "smua.source.delay": "-1",
+        }
+        self.scripts: Dict[str, List[str]] = {}
+        self.script: Optional[Tuple[str, List[str]]] = None
+        self.buffer: List[Tuple[float, float, float]] = []
+        self.buffer_origin: float = 0.0
+        self.buffer_step: float = 0.0
+
+    def number(self, name: str, default: float = 0.0) -> float:
+        try:
+            return float(self.attributes.get(name, default))
+        except ValueError:
+            return default
+
+    @property
+    def output_enabled(self) -> bool:
+        return self.attributes.get("smua.source.output") in ("1", "smua.OUTPUT_ON")
+
+    def integration_time(self) -> float:
+        count = 1
+        if self.number("smua.measure.filter.enable"):
+            count = max(1, int(self.number("smua.measure.filter.count", 1)))
+        return self.number("smua.measure.nplc", 1.0) / LINE_FREQUENCY * count
+
+    def update(self) -> None:
+        voltage = self.number("smua.source.levelv") if self.output_enabled else 0.0
+        self.diode.set_voltage(self, voltage)
+
+    def measure_i(self) -> float:
+        if not self.output_enabled:
+            return random.gauss(0.0, 1e-12)
+        limit = abs(self.number("smua.source.limiti", 1e-5))
+        current = self.diode.current()
+        return math.copysign(min(abs(current), limit), current)
+
+    def execute(self, message: str) -> None:
+        for statement in message.split(";"):
+            statement = statement.strip()
+            if statement:
+                self.execute_statement(statement)
+
+    def execute_statement(self, statement: str) -> None:
+        if self.script is not None:
+            name, lines = self.script
+            if statement == "endscript":
+                self.scripts[name] = lines
+                self.script = None
+            else:
+                lines.append(statement)
+            return
+        if statement.startswith("loadscript "):
+            self.script = statement.split(None, 1)[1].strip(), []
+        elif statement == "*IDN?":
+            self.respond(self.identity)
+        elif statement == "*OPC?":
+            self.respond("1")
+        elif statement in ("reset()", "*RST"):
+            self.reset()
+            self.update()
+        elif statement in ("status.reset()", "*CLS"):
+            self.errors.clear()
+        elif statement.endswith("()") and statement[:-2] in self.scripts:
+            self.run_sweep(self.scripts[statement[:-2]])
+        elif statement == "smua.abort()":
+            self.buffer = self.buffer[:self.buffer_count()]
+            self.buffer_step = 0.0
+        elif statement.startswith("print(") and statement.endswith(")"):
+            values = [self.evaluate(expression.strip()) for expression in statement[6:-1].split(",")]
+            self.respond("\t".join(values))
+        elif statement.startswith("printbuffer("):
+            self.print_buffer(statement)
+        elif "=" in statement:
+            name, _, value = statement.partition("=")
+            value = value.strip()
+            value = {"smua.OUTPUT_ON": "1", "smua.OUTPUT_OFF": "0", "smua.DELAY_AUTO": "-1"}.get(value, value)
+            self.attributes[name.strip()] = value
+            self.update()
+        else:
+            self.error(-285, "TSP Syntax error")
+
+    def evaluate(self, expression: str) -> str:
+        if expression == "smua.measure.i()":
+            self.sleep(self.integration_time())
+            return format(self.measure_i(), ".8e")
+        if expression == "smua.measure.iv()":
+            self.sleep(self.integration_time())
+            voltage = self.number("smua.source.levelv") if self.output_enabled else 0.0
+            return f"{self.measure_i():.8e}\t{voltage:.8e}"
+        if expression == "smua.measure.v()":
+            self.sleep(self.integration_time())
+            return format(self.number("smua.source.levelv") if self.output_enabled else 0.0, ".8e")
+        if expression == "smua.source.compliance":
+            limit = abs(self.number("smua.source.limiti", 1e-5))
+            return "true" if self.output_enabled and abs(self.diode.current()) >= limit else "false"
+        if expression == "smua.nvbuffer2.n":
+            return format(self.buffer_count(), "d")
+        if expression == "errorqueue.next()":
+            code, message = self.errors.pop(0) if self.errors else (0, "Queue Is Empty")
+            return f"{code:d}\t{message}\t0\t0"
+        if expression in self.attributes:
+            return self.attributes[expression]
+        self.error(-285, "TSP Syntax error")
+        return "nil"
+
+    def run_sweep(self, lines: List[str]) -> None:
+        script = "\n".join(lines)
+        m = re.search(r"listv\(\{(.*?)\}\)", script)
+        points = [float(value) for value in m.group(1).split(",") if value.strip()] if m else []
+        m = re.search(r"smua\.source\.delay\s*=\s*([^\s]+)", script)
+        try:
+            delay = float(m.group(1)) if m else 0.0
+        except ValueError:
+            delay = 0.0
+        self.buffer = []
+        for voltage in points:
+            self.diode.set_voltage(self, voltage)
+            self.buffer.append((len(self.buffer) * (delay + self.integration_time()), self.measure_i(), voltage))
+        if points:
+            self.attributes["smua.source.levelv"] = format(points[-1], "E")
+        self.buffer_origin = time.monotonic()
+        self.buffer_step = (delay + self.integration_time()) * self.time_scale
+        self.update()
+
+    def buffer_count(self) -> int:
+        if not self.buffer_step:
+            return len(self.buffer)
+        elapsed = time.monotonic() - self.buffer_origin
+        return min(len(self.buffer), int(elapsed / self.buffer_step))
+
+    def print_buffer(self, statement: str) -> None:
+        m = re.match(r"printbuffer\(\s*(\d+)\s*,\s*(\d+)", statement)
+        if not m:
+            self.error(-285, "TSP Syntax error")
+            return
+        begin, end = int(m.group(1)), int(m.group(2))
+        values: List[float] = []
+        for timestamp, current, voltage in self.buffer[begin - 1:end]:
+            values.extend((timestamp, current, voltage))
+        self.respond(", ".join(format(value, ".8e") for value in values))
+
+
+class ElectrometerInstrument(ScpiInstrument):
+    """SCPI electrometer (K6514) with free running trace buffer."""
+
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 6514,4000000,A13 (simulated)"
+
+    average_header = ":SENS:AVER"
+    time_element = "TIME"
+    time_reset_header = ":SYST:TIME:RES"
+
+    def reset(self) -> None:
+        super().reset()
+        self.reading: Dict[str, float] = {}
+        self.trace: List[Dict[str, float]] = []
+        self.trace_running: bool = False
+        self.trace_next: float = 0.0
+
+    def integration_time(self) -> float:
+        count = 1
+        if self.bool_setting(f"{self.average_header}:STAT"):
+            count = max(1, int(self.float_setting(f"{self.average_header}:COUN", 10)))
+        return self.float_setting(":SENS:CURR:NPLC", 5.0) / LINE_FREQUENCY * count
+
+    def measure(self, timestamp: Optional[float] = None) -> Dict[str, float]:
+        if self.bool_setting(":SYST:ZCH", True):
+            current = random.gauss(0.0, 1e-15)
+        else:
+            current = self.diode.current()
+        return {
+            "READ": current,
+            self.time_element: self.timestamp() if timestamp is None else timestamp,
+        }
+
+    def respond_readings(self, readings: List[Dict[str, float]]) -> None:
+        selected = [name.strip().upper() for name in self.setting(":FORM:ELEM", "READ").split(",")]
+        elements = [name for name in ("READ", self.time_element) if name in selected]
+        self.respond_values([reading.get(name, 0.0) for reading in readings for name in elements])
+
+    def update_trace(self) -> None:
+        if not self.trace_running or self.setting(":TRAC:FEED:CONT", "NEV").upper() == "NEV":
+            return
+        interval = max(self.integration_time() * self.time_scale, 1e-3)
+        points = int(self.float_setting(":TRAC:POIN", 100))
+        now = time.monotonic()
+        while self.trace_next <= now and len(self.trace) < points:
+            timestamp = (self.trace_next - self.time_origin) / (self.time_scale or 1.0)
+            self.trace.append(self.measure(timestamp))
+            self.trace_next += interval
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        return {
+            ":INIT": self.on_init,
+            ":FETC?": self.on_fetch,
+            ":INIT:CONT": self.on_init_continuous,
+            ":ABOR": self.on_abort,
+            ":TRAC:CLE": self.on_trace_clear,
+            ":TRAC:POIN:ACT?": self.on_trace_count,
+            ":TRAC:DATA?": self.on_trace_data,
+            self.time_reset_header: self.on_time_reset,
+        }
+
+    def on_init(self, args: str) -> None:
+        self.reading = self.measure()
+        self.operation_complete = self.busy_until(self.integration_time())
+
+    def on_fetch(self, args: str) -> None:
+        self.sleep_until(self.operation_complete)
+        if not self.reading:
+            self.error(-230, "Data corrupt or stale")
+            return
+        self.respond_readings([self.reading])
+
+    def on_init_continuous(self, args: str) -> None:
+        self.settings[":INIT:CONT"] = args
+        self.update_trace()
+        self.trace_running = args.upper() in ("1", "ON")
+        self.trace_next = time.monotonic()
+
+    def on_abort(self, args: str) -> None:
+        self.update_trace()
+        self.trace_running = self.bool_setting(":INIT:CONT")
+        self.trace_next = time.monotonic()
+
+    def on_trace_clear(self, args: str) -> None:
+        self.update_trace()
+        self.trace = []
+
+    def on_trace_count(self, args: str) -> None:
+        self.update_trace()
+        self.respond(format(len(self.trace), "d"))
+
+    def on_trace_data(self, args: str) -> None:
+        self.respond_readings(self.trace)
+
+    def on_time_reset(self, args: str) -> None:
+        self.time_origin = time.monotonic()
+
+
+class K6517BInstrument(ElectrometerInstrument):
+    """SCPI electrometer with voltage source."""
+
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 6517B,4000000,A13/700x (simulated)"
+
+    defaults = {":OUTP:STAT": "0", ":SOUR:VOLT:LEV": "+0.000000E+00"}
+
+    average_header = ":SENS:CURR:AVER"
+    time_element = "TST"
+    time_reset_header = ":SYST:TST:REL:RES"
+
+    def update(self) -> None:
+        voltage = self.float_setting(":SOUR:VOLT:LEV") if self.bool_setting(":OUTP:STAT") else 0.0
+        self.diode.set_voltage(self, voltage)
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        handlers = super().handlers()
+        handlers[":SOUR:CURR:LIM?"] = lambda args: self.respond("0")
+        handlers[":TRAC:DATA:SEL?"] = self.on_trace_data_selected
+        return handlers
+
+    def on_trace_data_selected(self, args: str) -> None:
+        start, count = [int(value) for value in args.split(",")]
+        self.respond_readings(self.trace[start:start + count])
+
+
+class DMMInstrument(ScpiInstrument):
+    """SCPI multimeter (K2700) reading the temperature of the bench."""
+
+    identity = "KEITHLEY INSTRUMENTS INC.,MODEL 2700,4000000,B09 (simulated)"
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        return {
+            ":FETC?": lambda args: self.respond(format_values([self.diode.read_temperature()])),
+            ":READ?": self.on_read,
+        }
+
+    def on_read(self, args: str) -> None:
+        # Scanned channels differ by a small gradient across the bench
+        count = max(1, int(self.float_setting(":SAMP:COUN", 1)))
+        self.sleep(0.02 * count)
+        self.respond(format_values([self.diode.read_temperature() + 0.1 * index for index in range(count)]))
+
+
+class LCRInstrument(ScpiInstrument):
+    """SCPI LCR meter (E4980A) with DC bias and list sweep."""
+
+    identity = "Keysight Technologies,E4980A,MY00000000,A.02.20 (simulated)"
+
+    defaults = {":BIAS:STAT": "0", ":BIAS:VOLT:LEV": "+0.000000E+00", ":SENS:CURR:PROT:TRIP": "0"}
+
+    aperture_times = {"SHOR": 0.0056, "MED": 0.088, "LONG": 0.22}
+
+    def reset(self) -> None:
+        super().reset()
+        self.readings: List[Tuple[float, float]] = []
+
+    def bias_voltage(self) -> float:
+        return self.float_setting(":BIAS:VOLT:LEV") if self.bool_setting(":BIAS:STAT") else 0.0
+
+    def measurement_time(self) -> float:
+        integration_time, _, averaging_rate = self.setting(":APER", "MED,1").partition(",")
+        aperture_time = self.aperture_times.get(integration_time.strip().upper()[:4], 0.088)
+        return aperture_time * max(1, int(averaging_rate or 1))
+
+    def update(self) -> None:
+        self.diode.set_voltage(self, self.bias_voltage())
+
+    def measure(self, voltage: float) -> Tuple[float, float]:
+        self.diode.set_voltage(self, voltage)
+        capacitance = self.diode.capacitance()
+        resistance = self.diode.resistance()
+        function = self.setting(":FUNC:IMP:TYPE", "CPD").upper()
+        if function.endswith("D"):
+            frequency = self.float_setting(":FREQ", 1000.0)
+            return capacitance, 1.0 / (2 * math.pi * frequency * capacitance * resistance)
+        return capacitance, resistance
+
+    def handlers(self) -> Dict[str, Callable[[str], None]]:
+        return {
+            ":TRIG:IMM": self.on_trigger,
+            ":FETC?": self.on_fetch,
+            ":ABOR": self.on_abort,
+        }
+
+    def on_trigger(self, args: str) -> None:
+        step = self.measurement_time()
+        if self.setting(":DISP:PAGE", "MEAS").upper().startswith("LIST"):
+            points = [float(value) for value in self.setting(":LIST:BIAS:VOLT").split(",") if value.strip()]
+            step += self.float_setting(":TRIG:DEL")
+        else:
+            points = [self.bias_voltage()]
+        self.readings = [self.measure(voltage) for voltage in points]
+        self.update()
+        self.operation_complete = self.busy_until(len(points) * step)
+
+    def on_fetch(self, args: str) -> None:
+        self.sleep_until(self.operation_complete)
+        if len(self.readings) == 1 and not self.setting(":DISP:PAGE", "MEAS").upper().startswith("LIST"):
+            primary, secondary = self.readings[0]
+            self.respond_values([primary, secondary, 0.0])
+        else:
+            self.respond_values([value for primary, secondary in self.readings for value in (primary, secondary, 0.0, 0.0)])
+
+    def on_abort(self, args: str) -> None:
+        self.operation_complete = time.monotonic()
+
+
+class A4284AInstrument(LCRInstrument):
+
+    identity = "HEWLETT-PACKARD,4284A,0,01.20 (simulated)"
+
+    aperture_times = {"SHOR": 0.030, "MED": 0.065, "LONG": 0.19}
+
+
+class DdcInstrument(SimulatedInstrument):
+    """Device dependent command instrument, commands are single letters
+    followed by arguments and executed by `X`. Reading the bus returns the
+    status requested by the last `U` command or a reading.
+    """
+
+    def reset(self) -> None:
+        super().reset()
+        self.status: Optional[str] = None
+
+    def execute(self, message: str) -> None:
+        for letter, args in self.parse(message):
+            if letter == "U":
+                self.status = self.status_word(int(args or 0))
+            elif letter != "X":
+                self.execute_command(letter, args)
+
+    @staticmethod
+    def parse(message: str) -> List[Tuple[str, str]]:
+        """Split message into commands, an `E` followed by a sign or digit
+        after a number is an exponent.
+        """
+        commands: List[Tuple[str, str]] = []
+        message = message.strip().upper()
+        index = 0
+        while index < len(message):
+            letter = message[index]
+            index += 1
+            if not letter.isalpha():
+                continue
+            start = index
+            while index < len(message):
+                char = message[index]
+                if char.isalpha():
+                    is_exponent = (
+                        char == "E" and index > start and (message[index - 1].isdigit() or message[index - 1] == ".")
+                        and index + 1 < len(message) and (message[index + 1].isdigit() or message[index + 1] in "+-")
+                    )
+                    if not is_exponent:
+                        break
+                index += 1
+            commands.append((letter, message[start:index]))
+        return commands
+
+    def read(self) -> Optional[bytes]:
+        with self.lock:
+            if self.status is not None:
+                status, self.status = self.status, None
+                return status.encode()
+            return self.reading().encode()
+
+    def execute_command(self, letter: str, args: str) -> None:
+        raise NotImplementedError()
+
+    def status_word(self, index: int) -> str:
+        raise NotImplementedError()
+
+    def reading(self) -> str:
+        raise NotImplementedError()
+
+
+class K237Instrument(DdcInstrument):
+
+    integration_times = [0.000416, 0.004, 0.01667, 0.02]
+
+    def reset(self) -> None:
+        super().reset()
+        self.output_enabled: bool = False
+        self.voltage: float = 0.0
+        self.compliance: float = 1e-3
+        self.integration: int = 3
+        self.format: Tuple[int, int] = (4, 2)
+
+    def update(self) -> None:
+        self.diode.set_voltage(self, self.voltage if self.output_enabled else 0.0)
+
+    @staticmethod
+    def fields(args: str) -> List[str]:
+        return [field.strip() for field in args.split(",")]
+
+    def execute_command(self, letter: str, args: str) -> None:
+        fields = self.fields(args)
+        try:
+            if letter == "B" and fields[0]:
+                self.voltage = float(fields[0])
+            elif letter == "N":
+                self.output_enabled = fields[0] == "1"
+            elif letter == "L" and fields[0]:
+                self.compliance = abs(float(fields[0]))
+            elif letter == "S" and fields[0]:
+                self.integration = min(3, max(0, int(fields[0])))
+            elif letter == "G":
+                fields += ["", ""]
+                self.format = int(fields[0] or 4), int(fields[1] or 2)
+            elif letter not in "BFHJKLMNOPQRSTWYZ":
+                self.error(1, "IDDC")
+        except ValueError:
+            self.error(2, "IDDCO")
+        self.update()
+
+    def status_word(self, index: int) -> str:
+        if index == 0:
+            return "237A06"
+        if index == 1:
+            errors = ["0"] * 26
+            for code, _ in self.errors:
+                errors[code % 26] = "1"
+            self.errors.clear()
+            return "237" + "".join(errors)
+        if index == 3:
+            return "237" + "0" * 15 + f"N{self.output_enabled:d}" + "0" * 9
+        return "237" + "0" * 26
+
+    def reading(self) -> str:
+        self.sleep(self.integration_times[self.integration])
+        voltage = self.voltage if self.output_enabled else 0.0
+        current = self.diode.current() if self.output_enabled else random.gauss(0.0, 1e-12)
+        compliance = abs(current) >= self.compliance
+        if compliance:
+            current = math.copysign(self.compliance, current)
+        items, prefix = self.format
+        values: List[str] = []
+        if items & 1:
+            values.append(("OSDCV" if compliance else "NSDCV") * (prefix == 0) + format(voltage, "+.4E"))
+        if items & 4:
+            values.append("NMDCI" * (prefix == 0) + format(current, "+.4E"))
+        return ",".join(values)
+
+
+class K595Instrument(DdcInstrument):
+
+    def reset(self) -> None:
+        super().reset()
+        self.voltage: float = 0.0
+        self.function: int = 0
+
+    def update(self) -> None:
+        self.diode.set_voltage(self, self.voltage)
+
+    def execute_command(self, letter: str, args: str) -> None:
+        try:
+            if letter == "V" and args:
+                self.voltage = float(args)
+            elif letter == "F" and args:
+                self.function = int(args)
+            elif letter not in "ACFGIMNOQRSTVWYZ":
+                self.error(0, "IDDC")
+        except ValueError:
+            self.error(1, "IDDCO")
+        self.update()
+
+    def status_word(self, index: int) -> str:
+        if index == 1:
+            errors = ["0"] * 7
+            for code, _ in self.errors:
+                errors[code % 7] = "1"
+            self.errors.clear()
+            return "595" + "".join(errors)
+        return "595A01"
+
+    def reading(self) -> str:
+        self.sleep(0.05)
+        if self.function == 1:
+            value = self.diode.current()
+        else:
+            value = self.diode.capacitance()
+        return f"{value:+.3E},{self.voltage:+.3E}"
+
+
+class BrandBoxInstrument(SimulatedInstrument):
+    """Switching matrix answering every message."""
+
+    channels = ["A1", "A2", "B1", "B2", "C1", "C2"]
+
+    def reset(self) -> None:
+        super().reset()
+        self.closed: List[str] = []
+
+    def execute(self, message: str) -> None:
+        header, _, args = message.strip().partition(" ")
+        header = header.upper()
+        channels = [channel.strip().upper() for channel in args.split(",") if channel.strip()]
+        if header == "*IDN?":
+            self.respond("BrandBox, v2.0 (simulated)")
+        elif header == "*CLS":
+            self.closed = []
+            self.respond("OK")
+        elif header == ":CLOS:STAT?":
+            self.respond(",".join(sorted(self.closed)))
+        elif header in (":CLOS", ":OPEN") and all(channel in self.channels for channel in channels):
+            if header == ":CLOS":
+                self.closed = sorted(set(self.closed) | set(channels))
+            else:
+                self.closed = sorted(set(self.closed) - set(channels))
+            self.respond("OK")
+        else:
+            self.respond("Err99")
+
+
+SIMULATED_MODELS: Dict[str, type] = {
+    "K237": K237Instrument,
+    "K595": K595Instrument,
+    "K2400": SourceMeterInstrument,
+    "K2410": SourceMeterInstrument,
+    "K2470": K2470Instrument,
+    "K2657A": K2657AInstrument,
+    "K2700": DMMInstrument,
+    "K6514": ElectrometerInstrument,
+    "K6517B": K6517BInstrument,
+    "E4980A": LCRInstrument,
+    "A4284A": A4284AInstrument,
+    "BRANDBOX": BrandBoxInstrument,
+}
+
+_lock = threading.RLock()
+_diodes: Dict[str, SimulatedDiode] = {}
+_instruments: Dict[Tuple[str, str], SimulatedInstrument] = {}
+
+
+def simulated_diode(bench: str = "0") -> SimulatedDiode:
+    """Return simulated diode of bench."""
+    with _lock:
+        return _diodes.setdefault(bench, SimulatedDiode())
+
+
+def is_simulated(resource_name: str) -> bool:
+    """Return `True` if resource name references a simulated instrument."""
+    return RE_RESOURCE_NAME.match(resource_name.strip()) is not None
+
+
+class SimulatedSession:
+    """Session with the subset of the pyvisa message based resource API used
+    by `Resource`. Instruments keep their state between sessions.
+    """
+
+    def __init__(self, resource_name: str, instrument: SimulatedInstrument,
+                 read_termination: str = "\r\n", write_termination: str = "\r\n",
+                 timeout: float = 8000, **options) -> None:
+        self.resource_name: str = resource_name
+        self.instrument: SimulatedInstrument = instrument
+        self.read_termination: Optional[str] = read_termination or ""
+        self.write_termination: str = write_termination or ""
+        # Responses are always terminated, also with termination character
+        # detection disabled (reading until end of message)
+        self._response_termination: str = read_termination or ""
+        self.timeout: float = timeout
+        self._closed: bool = False
+
+    @property
+    def session(self) -> int:
+        if self._closed:
+            raise pyvisa.InvalidSession()
+        return id(self)
+
+    def _delay(self) -> None:
+        if self.instrument.latency > 0:
+            time.sleep(self.instrument.latency)
+
+    def write(self, message: str) -> int:
+        self.session
+        self._delay()
+        self.instrument.write(message)
+        return len(message) + len(self.write_termination)
+
+    def read_raw(self) -> bytes:
+        self.session
+        self._delay()
+        response = self.instrument.read()
+        if response is None:
+            raise pyvisa.VisaIOError(StatusCode.error_timeout)
+        return response + self._response_termination.encode()
+
+    def read_bytes(self, count: int) -> bytes:
+        raise pyvisa.VisaIOError(StatusCode.error_timeout)
+
+    def read(self) -> str:
+        response = self.read_raw().decode()
+        if self.read_termination and response.endswith(self.read_termination):
+            response = response[:-len(self.read_termination)]
+        return response
+
+    def query(self, message: str) -> str:
+        self.write(message)
+        return self.read()
+
+    def clear(self) -> None:
+        self.session
+        self.instrument.clear()
+
+    def read_stb(self) -> int:
+        self.session
+        return self.instrument.status_byte()
+
+    def enable_event(self, event_type, mechanism) -> None:
+        raise NotImplementedError("service requests not simulated")
+
+    def close(self) -> None:
+        self._closed = True
+
+
+def open_session(resource_name: str, **options) -> SimulatedSession:
+    """Open session to simulated instrument `SIM::<model>::<bench>`."""
+    m = RE_RESOURCE_NAME.match(resource_name.strip())
+    model = m.group(1).upper() if m else ""
+    cls = SIMULATED_MODELS.get(model)
+    if cls is None:
+        raise pyvisa.VisaIOError(StatusCode.error_resource_not_found)
+    bench = m.group(2) or "0"
+    with _lock:
+        instrument = _instruments.get((model, bench))
+        if instrument is None:
+            instrument = cls(simulated_diode(bench))
+            _instruments[(model, bench)] = instrument
+    return SimulatedSession(resource_name, instrument, **options)
@@ -26,6 +26,102 @@ class State:
     def auto_reconnect(self) -> bool:
         return self.state.get("auto_reconnect", False)
 
+    @property
+    def reconnect_budget(self) -> float:
+        return self.state.get("reconnect_budget", 60.0)
+
+    @property
+    def pipelined_writes(self) -> bool:
+        return self.state.get("pipelined_writes", False)
+
+    @property
+    def pipeline_size(self) -> int:
+        return self.state.get("pipeline_size", 8)
+
+    @property
+    def service_requests(self) -> bool:
+        return self.state.get("service_requests", False)
+
+    @property
+    def concurrent_readings(self) -> bool:
+        return self.state.get("concurrent_readings", False)
+
+    @property
+    def hardware_sweep(self) -> bool:
+        return self.state.get("hardware_sweep", False)
+
+    @property
+    def buffered_continuous(self) -> bool:
+        return self.state.get("buffered_continuous", False)
+
+    @property
+    def sweep_profile(self) -> str:
+        return self.state.get("sweep_profile", "linear")
+
+    @property
+    def sweep_file(self) -> str:
+        return self.state.get("sweep_file", "")
+
+    @property
+    def sweep_bidirectional(self) -> bool:
+        return self.state.get("sweep_bidirectional", False)
+
+    @property
+    def source_verify_interval(self) -> int:
+        return self.state.get("source_verify_interval", 10)
+
+    @property
+    def adaptive_ramp(self) -> bool:
+        return self.state.get("adaptive_ramp", False)
+
+    @property
+    def adaptive_min_step(self) -> float:
+        return self.state.get("adaptive_min_step", 1.0)
+
+    @property
+    def adaptive_threshold(self) -> float:
+        return self.state.get("adaptive_threshold", 0.1)
+
+    @property
+    def settling_mode(self) -> str:
+        return self.state.get("settling_mode", "off")
+
+    @property
+    def settling_tolerance(self) -> float:
+        return self.state.get("settling_tolerance", 0.01)
+
+    @property
+    def settling_count(self) -> int:
+        return self.state.get("settling_count", 3)
+
+    @property
+    def sample_count(self) -> int:
+        return self.state.get("sample_count", 1)
+
+    @property
+    def sample_method(self) -> str:
+        return self.state.get("sample_method", "median")
+
+    @property
+    def sample_sigma(self) -> float:
+        return self.state.get("sample_sigma", 0.0)
+
+    @property
+    def sample_trim(self) -> float:
+        return self.state.get("sample_trim", 0.1)
+
+    @property
+    def ramp_slew_rate(self) -> float:
+        return self.state.get("ramp_slew_rate", 20.0)
+
+    @property
+    def ramp_max_step(self) -> float:
+        return self.state.get("ramp_max_step", 5.0)
+
+    @property
+    def ramp_hardware_sweep(self) -> bool:
+        return self.state.get("ramp_hardware_sweep", False)
+
     @property
     def is_continuous(self) -> bool:
         return self.state.get("continuous", False)
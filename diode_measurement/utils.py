@@ -4,7 +4,7 @@ import pint
 
 from typing import Iterable, Tuple
 
-import pyvisa
+from .resource import Resource
 
 __all__ = [
     "ureg",
@@ -42,11 +42,10 @@ def get_resource(resource_name: str) -> Tuple[str, str]:
     return resource_name, visa_library
 
 
-def open_resource(resource_name: str, termination: str, timeout: float):
+def open_resource(resource_name: str, termination: str, timeout: float) -> Resource:
     resource_name, visa_library = get_resource(resource_name)
     timeout_millisecs = timeout * 1e3
-    rm = pyvisa.ResourceManager(visa_library)
-    return rm.open_resource(resource_name=resource_name, read_termination=termination, write_termination=termination, timeout=timeout_millisecs)
+    return Resource(resource_name, visa_library, read_termination=termination, write_termination=termination, timeout=timeout_millisecs)
 
 
 def safe_filename(filename: str) -> str:
@@ -58,6 +58,25 @@ class GeneralWidget(QtWidgets.QWidget):
         self.stepVoltageSpinBox.setRange(0, +3030.0)
         self.stepVoltageSpinBox.setSuffix(" V")
 
+        self.profileComboBox = QtWidgets.QComboBox()
+        self.profileComboBox.setStatusTip("Sweep profile, logarithmic profiles use the number of linear steps")
+        self.profileComboBox.addItem("Linear", "linear")
+        self.profileComboBox.addItem("Logarithmic", "logarithmic")
+        self.profileComboBox.addItem("File", "file")
+        self.profileComboBox.currentIndexChanged.connect(self.updateProfile)
+
+        self.bidirectionalCheckBox = QtWidgets.QCheckBox()
+        self.bidirectionalCheckBox.setText("Bidirectional")
+        self.bidirectionalCheckBox.setStatusTip("Sweep back to begin after reaching the end (hysteresis)")
+
+        self.profileFileLineEdit = QtWidgets.QLineEdit()
+        self.profileFileLineEdit.setStatusTip("Profile file, one voltage or begin, end, step per line")
+
+        self.profileFileToolButton = QtWidgets.QToolButton()
+        self.profileFileToolButton.setText("...")
+        self.profileFileToolButton.setStatusTip("Select profile file")
+        self.profileFileToolButton.clicked.connect(self.selectProfileFile)
+
         self.waitingTimeSpinBox = QtWidgets.QDoubleSpinBox()
         self.waitingTimeSpinBox.setSuffix(" s")
 
@@ -167,6 +186,15 @@ class GeneralWidget(QtWidgets.QWidget):
         layout.addWidget(self.stepVoltageSpinBox)
         layout.addWidget(QtWidgets.QLabel("Waiting Time"))
         layout.addWidget(self.waitingTimeSpinBox)
+        layout.addWidget(QtWidgets.QLabel("Profile"))
+        layout.addWidget(self.profileComboBox)
+        self.profileFileWidget = QtWidgets.QWidget()
+        profileFileLayout = QtWidgets.QHBoxLayout(self.profileFileWidget)
+        profileFileLayout.addWidget(self.profileFileLineEdit)
+        profileFileLayout.addWidget(self.profileFileToolButton)
+        profileFileLayout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.profileFileWidget)
+        layout.addWidget(self.bidirectionalCheckBox)
 
         layout = QtWidgets.QVBoxLayout(self.biasGroupBox)
         layout.addWidget(self.biasVoltageSpinBox)
@@ -208,6 +236,8 @@ class GeneralWidget(QtWidgets.QWidget):
 
         self._currentComplianceLocked = False
 
+        self.updateProfile()
+
     def setIdleState(self) -> None:
         self.measurementComboBox.setEnabled(True)
         self.instrumentWidget.setEnabled(True)
@@ -216,6 +246,9 @@ class GeneralWidget(QtWidgets.QWidget):
         self.endVoltageSpinBox.setEnabled(True)
         self.stepVoltageSpinBox.setEnabled(True)
         self.waitingTimeSpinBox.setEnabled(True)
+        self.profileComboBox.setEnabled(True)
+        self.profileFileWidget.setEnabled(True)
+        self.bidirectionalCheckBox.setEnabled(True)
         self.biasVoltageSpinBox.setEnabled(True)
         self.changeVoltageButton.setEnabled(False)
         self.currentComplianceSpinBox.setEnabled(not self._currentComplianceLocked)
@@ -229,6 +262,9 @@ class GeneralWidget(QtWidgets.QWidget):
         self.endVoltageSpinBox.setEnabled(False)
         self.stepVoltageSpinBox.setEnabled(False)
         self.waitingTimeSpinBox.setEnabled(False)
+        self.profileComboBox.setEnabled(False)
+        self.profileFileWidget.setEnabled(False)
+        self.bidirectionalCheckBox.setEnabled(False)
         self.biasVoltageSpinBox.setEnabled(False)
 
     def setStoppingState(self):
@@ -342,6 +378,33 @@ class GeneralWidget(QtWidgets.QWidget):
     def setWaitingTime(self, value):
         self.waitingTimeSpinBox.setValue(value)
 
+    def sweepProfile(self):
+        return self.profileComboBox.currentData()
+
+    def setSweepProfile(self, profile):
+        index = self.profileComboBox.findData(profile)
+        self.profileComboBox.setCurrentIndex(max(0, index))
+
+    def updateProfile(self):
+        self.profileFileWidget.setVisible(self.sweepProfile() == "file")
+
+    def sweepFile(self):
+        return self.profileFileLineEdit.text().strip()
+
+    def setSweepFile(self, filename):
+        self.profileFileLineEdit.setText(filename)
+
+    def selectProfileFile(self):
+        filename, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select profile file", self.sweepFile(), "Text (*.txt *.csv);;All files (*)")
+        if filename:
+            self.setSweepFile(filename)
+
+    def isBidirectional(self):
+        return self.bidirectionalCheckBox.isChecked()
+
+    def setBidirectional(self, enabled):
+        self.bidirectionalCheckBox.setChecked(enabled)
+
     def biasVoltage(self):
         unit = self.biasVoltageSpinBox.suffix().strip()
         return (self.biasVoltageSpinBox.value() * ureg(unit)).to("V").m
@@ -468,9 +468,106 @@ class K2657APanel(InstrumentPanel):
 
 class K2700Panel(InstrumentPanel):
 
+    SENSOR_TYPES: Dict[str, list] = {
+        "TC": ["J", "K", "N", "T", "E", "R", "S", "B"],
+        "FRTD": ["PT100", "D100", "F100", "PT385", "PT3916"],
+    }
+
     def __init__(self, parent: QtWidgets.QWidget = None) -> None:
         super().__init__("K2700", parent)
 
+        # Scan
+
+        self.scanGroupBox = QtWidgets.QGroupBox()
+        self.scanGroupBox.setTitle("Temperature Scan")
+
+        self.channelsLabel = QtWidgets.QLabel("Channels")
+
+        self.channelsLineEdit = QtWidgets.QLineEdit()
+        self.channelsLineEdit.setStatusTip("Channel list to scan, e.g. 101:104 (leave empty for front panel reading)")
+
+        self.transducerLabel = QtWidgets.QLabel("Transducer")
+
+        self.transducerComboBox = QtWidgets.QComboBox()
+        self.transducerComboBox.addItem("Thermocouple", "TC")
+        self.transducerComboBox.addItem("4-wire RTD", "FRTD")
+        self.transducerComboBox.currentIndexChanged.connect(self.updateSensorTypes)
+
+        self.sensorTypeLabel = QtWidgets.QLabel("Type")
+
+        self.sensorTypeComboBox = QtWidgets.QComboBox()
+
+        scanLayout = QtWidgets.QVBoxLayout(self.scanGroupBox)
+        scanLayout.addWidget(self.channelsLabel)
+        scanLayout.addWidget(self.channelsLineEdit)
+        scanLayout.addWidget(self.transducerLabel)
+        scanLayout.addWidget(self.transducerComboBox)
+        scanLayout.addWidget(self.sensorTypeLabel)
+        scanLayout.addWidget(self.sensorTypeComboBox)
+        scanLayout.addStretch()
+
+        # Interval
+
+        self.intervalGroupBox = QtWidgets.QGroupBox()
+        self.intervalGroupBox.setTitle("Sample Interval")
+
+        self.intervalSpinBox = QtWidgets.QDoubleSpinBox()
+        self.intervalSpinBox.setStatusTip("Minimum interval between temperature readings, cached temperatures are used in between")
+        self.intervalSpinBox.setRange(0.0, 3600.0)
+        self.intervalSpinBox.setDecimals(1)
+        self.intervalSpinBox.setSuffix(" s")
+
+        intervalLayout = QtWidgets.QVBoxLayout(self.intervalGroupBox)
+        intervalLayout.addWidget(self.intervalSpinBox)
+        intervalLayout.addStretch()
+
+        # Layout
+
+        leftLayout = QtWidgets.QVBoxLayout()
+        leftLayout.addWidget(self.scanGroupBox)
+        leftLayout.addStretch()
+
+        rightLayout = QtWidgets.QVBoxLayout()
+        rightLayout.addWidget(self.intervalGroupBox)
+        rightLayout.addStretch()
+
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(leftLayout)
+        layout.addLayout(rightLayout)
+        layout.addStretch()
+        layout.setStretch(0, 1)
+        layout.setStretch(1, 1)
+        layout.setStretch(2, 1)
+
+        self.bindParameter("scan.channels", WidgetParameter(self.channelsLineEdit))
+        self.bindParameter("scan.transducer", WidgetParameter(self.transducerComboBox))
+        self.bindParameter("scan.type", WidgetParameter(self.sensorTypeComboBox))
+        self.bindParameter("temperature.interval", WidgetParameter(self.intervalSpinBox))
+
+        self.restoreDefaults()
+
+    def updateSensorTypes(self, index: int) -> None:
+        sensorType = self.sensorTypeComboBox.currentData()
+        self.sensorTypeComboBox.clear()
+        for name in self.SENSOR_TYPES.get(self.transducerComboBox.currentData(), []):
+            self.sensorTypeComboBox.addItem(name, name)
+        index = self.sensorTypeComboBox.findData(sensorType)
+        self.sensorTypeComboBox.setCurrentIndex(max(0, index))
+
+    def restoreDefaults(self) -> None:
+        self.channelsLineEdit.setText("")
+        self.transducerComboBox.setCurrentIndex(0)
+        self.updateSensorTypes(0)
+        self.sensorTypeComboBox.setCurrentIndex(self.sensorTypeComboBox.findData("K"))
+        self.intervalSpinBox.setValue(1.0)
+
+    def setLocked(self, state: bool) -> None:
+        self.channelsLineEdit.setEnabled(not state)
+        self.transducerComboBox.setEnabled(not state)
+        self.sensorTypeComboBox.setEnabled(not state)
+        self.intervalSpinBox.setEnabled(not state)
+
 
 class K6514Panel(InstrumentPanel):
 
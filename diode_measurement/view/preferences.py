@@ -15,6 +15,18 @@ VALUE_FORMATS: List = [
     "+.12E",
 ]
 
+SAMPLE_METHODS: List = [
+    ("Median", "median"),
+    ("Trimmed Mean", "trimmed_mean"),
+    ("Mean", "mean"),
+]
+
+SETTLING_MODES: List = [
+    ("Off", "off"),
+    ("Tolerance", "tolerance"),
+    ("Slope", "slope"),
+]
+
 
 class PreferencesDialog(QtWidgets.QDialog):
 
@@ -42,8 +54,153 @@ class PreferencesDialog(QtWidgets.QDialog):
         outputWidgetLayout.addRow("Timestamp Format", self.timestampFormatComboBox)
         outputWidgetLayout.addRow("Value Format", self.valueFormatComboBox)
 
+        # Measurement Tab
+
+        self.measurementWidget = QtWidgets.QWidget(self)
+
+        self.pipelinedWritesCheckBox = QtWidgets.QCheckBox(self)
+        self.pipelinedWritesCheckBox.setText("Enabled")
+        self.pipelinedWritesCheckBox.setStatusTip("Queue instrument writes and synchronize before readings only")
+
+        self.pipelineSizeSpinBox = QtWidgets.QSpinBox(self)
+        self.pipelineSizeSpinBox.setStatusTip("Maximum number of queued writes per compound command")
+        self.pipelineSizeSpinBox.setRange(1, 64)
+
+        self.serviceRequestsCheckBox = QtWidgets.QCheckBox(self)
+        self.serviceRequestsCheckBox.setText("Enabled")
+        self.serviceRequestsCheckBox.setStatusTip("Wait for instrument service requests instead of polling event status")
+
+        self.sessionIdleTimeoutSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.sessionIdleTimeoutSpinBox.setStatusTip("Keep instrument sessions open between measurements, closed after idle timeout")
+        self.sessionIdleTimeoutSpinBox.setRange(0, 3600)
+        self.sessionIdleTimeoutSpinBox.setDecimals(0)
+        self.sessionIdleTimeoutSpinBox.setSuffix(" s")
+        self.sessionIdleTimeoutSpinBox.setSpecialValueText("Off")
+
+        self.reconnectBudgetSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.reconnectBudgetSpinBox.setStatusTip("Maximum time to retry reconnecting instruments if auto reconnect is enabled")
+        self.reconnectBudgetSpinBox.setRange(1, 3600)
+        self.reconnectBudgetSpinBox.setDecimals(0)
+        self.reconnectBudgetSpinBox.setSuffix(" s")
+
+        self.concurrentReadingsCheckBox = QtWidgets.QCheckBox(self)
+        self.concurrentReadingsCheckBox.setText("Enabled")
+        self.concurrentReadingsCheckBox.setStatusTip("Read all instruments in parallel, one worker thread per instrument")
+
+        self.hardwareSweepCheckBox = QtWidgets.QCheckBox(self)
+        self.hardwareSweepCheckBox.setText("Enabled")
+        self.hardwareSweepCheckBox.setStatusTip("Run IV and CV ramps as hardware sweeps if only the source instrument is used")
+
+        self.bufferedContinuousCheckBox = QtWidgets.QCheckBox(self)
+        self.bufferedContinuousCheckBox.setText("Enabled")
+        self.bufferedContinuousCheckBox.setStatusTip("Acquire continuous ELM readings using the instrument trace buffer")
+
+        self.sourceVerifyIntervalSpinBox = QtWidgets.QSpinBox(self)
+        self.sourceVerifyIntervalSpinBox.setStatusTip("Read back source voltage every N ramp steps, in addition to first and last step")
+        self.sourceVerifyIntervalSpinBox.setRange(0, 1000)
+        self.sourceVerifyIntervalSpinBox.setSuffix(" steps")
+        self.sourceVerifyIntervalSpinBox.setSpecialValueText("First/Last")
+
+        self.adaptiveRampCheckBox = QtWidgets.QCheckBox(self)
+        self.adaptiveRampCheckBox.setText("Enabled")
+        self.adaptiveRampCheckBox.setStatusTip("Adapt ramp step to the change of readings, the ramp step is the maximum step")
+
+        self.adaptiveMinStepSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.adaptiveMinStepSpinBox.setStatusTip("Minimum ramp step of adaptive ramps")
+        self.adaptiveMinStepSpinBox.setRange(0.001, 100)
+        self.adaptiveMinStepSpinBox.setDecimals(3)
+        self.adaptiveMinStepSpinBox.setSuffix(" V")
+
+        self.adaptiveThresholdSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.adaptiveThresholdSpinBox.setStatusTip("Relative change of reading per step above which adaptive ramps refine the step")
+        self.adaptiveThresholdSpinBox.setRange(0.1, 1000)
+        self.adaptiveThresholdSpinBox.setDecimals(1)
+        self.adaptiveThresholdSpinBox.setSuffix(" %")
+
+        self.settlingModeComboBox = QtWidgets.QComboBox(self)
+        self.settlingModeComboBox.setStatusTip("Take readings after every step until settled, the waiting time is the upper bound")
+
+        for text, settlingMode in SETTLING_MODES:
+            self.settlingModeComboBox.addItem(text, settlingMode)
+
+        self.settlingToleranceSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.settlingToleranceSpinBox.setStatusTip("Relative spread of settled readings (Tolerance) or relative drift per second (Slope)")
+        self.settlingToleranceSpinBox.setRange(0.01, 100)
+        self.settlingToleranceSpinBox.setDecimals(2)
+        self.settlingToleranceSpinBox.setSuffix(" %")
+
+        self.settlingCountSpinBox = QtWidgets.QSpinBox(self)
+        self.settlingCountSpinBox.setStatusTip("Number of consecutive readings evaluated for settling")
+        self.settlingCountSpinBox.setRange(2, 100)
+
+        self.sampleCountSpinBox = QtWidgets.QSpinBox(self)
+        self.sampleCountSpinBox.setStatusTip("Number of samples per reading, reduced in software")
+        self.sampleCountSpinBox.setRange(1, 1000)
+        self.sampleCountSpinBox.setSuffix(" samples")
+        self.sampleCountSpinBox.setSpecialValueText("Off")
+
+        self.sampleMethodComboBox = QtWidgets.QComboBox(self)
+        self.sampleMethodComboBox.setStatusTip("Reduction of samples to a single reading")
+
+        for text, sampleMethod in SAMPLE_METHODS:
+            self.sampleMethodComboBox.addItem(text, sampleMethod)
+
+        self.sampleSigmaSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.sampleSigmaSpinBox.setStatusTip("Reject samples deviating from the median by more than N standard deviations, estimated by the median absolute deviation")
+        self.sampleSigmaSpinBox.setRange(0, 10)
+        self.sampleSigmaSpinBox.setDecimals(1)
+        self.sampleSigmaSpinBox.setSuffix(" sigma")
+        self.sampleSigmaSpinBox.setSpecialValueText("Off")
+
+        self.sampleTrimSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.sampleTrimSpinBox.setStatusTip("Proportion of lowest and highest samples removed by trimmed mean reduction, at least one sample each")
+        self.sampleTrimSpinBox.setRange(0, 45)
+        self.sampleTrimSpinBox.setDecimals(0)
+        self.sampleTrimSpinBox.setSuffix(" %")
+
+        self.rampSlewRateSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.rampSlewRateSpinBox.setStatusTip("Slew rate of ramps to begin voltage, to bias voltage and to zero")
+        self.rampSlewRateSpinBox.setRange(0.1, 1000)
+        self.rampSlewRateSpinBox.setDecimals(1)
+        self.rampSlewRateSpinBox.setSuffix(" V/s")
+
+        self.rampMaxStepSpinBox = QtWidgets.QDoubleSpinBox(self)
+        self.rampMaxStepSpinBox.setStatusTip("Maximum voltage step of ramps, further limited by the instrument")
+        self.rampMaxStepSpinBox.setRange(0.1, 100)
+        self.rampMaxStepSpinBox.setDecimals(1)
+        self.rampMaxStepSpinBox.setSuffix(" V")
+
+        self.rampHardwareSweepCheckBox = QtWidgets.QCheckBox(self)
+        self.rampHardwareSweepCheckBox.setText("Enabled")
+        self.rampHardwareSweepCheckBox.setStatusTip("Run ramps as hardware sweeps if supported by the instrument")
+
+        measurementWidgetLayout = QtWidgets.QFormLayout(self.measurementWidget)
+        measurementWidgetLayout.addRow("Pipelined Writes", self.pipelinedWritesCheckBox)
+        measurementWidgetLayout.addRow("Pipeline Size", self.pipelineSizeSpinBox)
+        measurementWidgetLayout.addRow("Service Requests", self.serviceRequestsCheckBox)
+        measurementWidgetLayout.addRow("Keep Sessions Open", self.sessionIdleTimeoutSpinBox)
+        measurementWidgetLayout.addRow("Reconnect Budget", self.reconnectBudgetSpinBox)
+        measurementWidgetLayout.addRow("Concurrent Readings", self.concurrentReadingsCheckBox)
+        measurementWidgetLayout.addRow("Hardware Sweep", self.hardwareSweepCheckBox)
+        measurementWidgetLayout.addRow("Buffered Continuous", self.bufferedContinuousCheckBox)
+        measurementWidgetLayout.addRow("Verify Source Level", self.sourceVerifyIntervalSpinBox)
+        measurementWidgetLayout.addRow("Adaptive Ramp", self.adaptiveRampCheckBox)
+        measurementWidgetLayout.addRow("Adaptive Min Step", self.adaptiveMinStepSpinBox)
+        measurementWidgetLayout.addRow("Adaptive Threshold", self.adaptiveThresholdSpinBox)
+        measurementWidgetLayout.addRow("Settling", self.settlingModeComboBox)
+        measurementWidgetLayout.addRow("Settling Tolerance", self.settlingToleranceSpinBox)
+        measurementWidgetLayout.addRow("Settling Readings", self.settlingCountSpinBox)
+        measurementWidgetLayout.addRow("Samples", self.sampleCountSpinBox)
+        measurementWidgetLayout.addRow("Sample Reduction", self.sampleMethodComboBox)
+        measurementWidgetLayout.addRow("Sample Clipping", self.sampleSigmaSpinBox)
+        measurementWidgetLayout.addRow("Sample Trimming", self.sampleTrimSpinBox)
+        measurementWidgetLayout.addRow("Ramp Slew Rate", self.rampSlewRateSpinBox)
+        measurementWidgetLayout.addRow("Ramp Max Step", self.rampMaxStepSpinBox)
+        measurementWidgetLayout.addRow("Ramp Hardware Sweep", self.rampHardwareSweepCheckBox)
+
         self.tabWidget = QtWidgets.QTabWidget(self)
         self.tabWidget.addTab(self.outputWidget, "Output")
+        self.tabWidget.addTab(self.measurementWidget, "Measurement")
 
         self.buttonBox = QtWidgets.QDialogButtonBox(self)
         self.buttonBox.addButton(QtWidgets.QDialogButtonBox.Ok)
@@ -65,6 +222,74 @@ class PreferencesDialog(QtWidgets.QDialog):
         index = self.valueFormatComboBox.findData(valueFormat)
         self.valueFormatComboBox.setCurrentIndex(index)
 
+        pipelinedWrites = settings.value("measurement/pipelinedWrites", False, bool)
+        self.pipelinedWritesCheckBox.setChecked(pipelinedWrites)
+
+        pipelineSize = settings.value("measurement/pipelineSize", 8, int)
+        self.pipelineSizeSpinBox.setValue(pipelineSize)
+
+        serviceRequests = settings.value("measurement/serviceRequests", False, bool)
+        self.serviceRequestsCheckBox.setChecked(serviceRequests)
+
+        sessionIdleTimeout = settings.value("measurement/sessionIdleTimeout", 0.0, float)
+        self.sessionIdleTimeoutSpinBox.setValue(sessionIdleTimeout)
+
+        reconnectBudget = settings.value("measurement/reconnectBudget", 60.0, float)
+        self.reconnectBudgetSpinBox.setValue(reconnectBudget)
+
+        concurrentReadings = settings.value("measurement/concurrentReadings", False, bool)
+        self.concurrentReadingsCheckBox.setChecked(concurrentReadings)
+
+        hardwareSweep = settings.value("measurement/hardwareSweep", False, bool)
+        self.hardwareSweepCheckBox.setChecked(hardwareSweep)
+
+        bufferedContinuous = settings.value("measurement/bufferedContinuous", False, bool)
+        self.bufferedContinuousCheckBox.setChecked(bufferedContinuous)
+
+        sourceVerifyInterval = settings.value("measurement/sourceVerifyInterval", 10, int)
+        self.sourceVerifyIntervalSpinBox.setValue(sourceVerifyInterval)
+
+        adaptiveRamp = settings.value("measurement/adaptiveRamp", False, bool)
+        self.adaptiveRampCheckBox.setChecked(adaptiveRamp)
+
+        adaptiveMinStep = settings.value("measurement/adaptiveMinStep", 1.0, float)
+        self.adaptiveMinStepSpinBox.setValue(adaptiveMinStep)
+
+        adaptiveThreshold = settings.value("measurement/adaptiveThreshold", 0.1, float)
+        self.adaptiveThresholdSpinBox.setValue(adaptiveThreshold * 100)
+
+        settlingMode = settings.value("measurement/settlingMode", "off", str)
+        index = self.settlingModeComboBox.findData(settlingMode)
+        self.settlingModeComboBox.setCurrentIndex(max(0, index))
+
+        settlingTolerance = settings.value("measurement/settlingTolerance", 0.01, float)
+        self.settlingToleranceSpinBox.setValue(settlingTolerance * 100)
+
+        settlingCount = settings.value("measurement/settlingCount", 3, int)
+        self.settlingCountSpinBox.setValue(settlingCount)
+
+        sampleCount = settings.value("measurement/sampleCount", 1, int)
+        self.sampleCountSpinBox.setValue(sampleCount)
+
+        sampleMethod = settings.value("measurement/sampleMethod", "median", str)
+        index = self.sampleMethodComboBox.findData(sampleMethod)
+        self.sampleMethodComboBox.setCurrentIndex(max(0, index))
+
+        sampleSigma = settings.value("measurement/sampleSigma", 0.0, float)
+        self.sampleSigmaSpinBox.setValue(sampleSigma)
+
+        sampleTrim = settings.value("measurement/sampleTrim", 0.1, float)
+        self.sampleTrimSpinBox.setValue(sampleTrim * 100)
+
+        rampSlewRate = settings.value("measurement/rampSlewRate", 20.0, float)
+        self.rampSlewRateSpinBox.setValue(rampSlewRate)
+
+        rampMaxStep = settings.value("measurement/rampMaxStep", 5.0, float)
+        self.rampMaxStepSpinBox.setValue(rampMaxStep)
+
+        rampHardwareSweep = settings.value("measurement/rampHardwareSweep", False, bool)
+        self.rampHardwareSweepCheckBox.setChecked(rampHardwareSweep)
+
     def writeSettings(self) -> None:
         settings = QtCore.QSettings()
 
@@ -73,3 +298,69 @@ class PreferencesDialog(QtWidgets.QDialog):
 
         valueFormat = self.valueFormatComboBox.currentData() or VALUE_FORMATS[0]
         settings.setValue("writer/valueFormat", valueFormat)
+
+        pipelinedWrites = self.pipelinedWritesCheckBox.isChecked()
+        settings.setValue("measurement/pipelinedWrites", pipelinedWrites)
+
+        pipelineSize = self.pipelineSizeSpinBox.value()
+        settings.setValue("measurement/pipelineSize", pipelineSize)
+
+        serviceRequests = self.serviceRequestsCheckBox.isChecked()
+        settings.setValue("measurement/serviceRequests", serviceRequests)
+
+        sessionIdleTimeout = self.sessionIdleTimeoutSpinBox.value()
+        settings.setValue("measurement/sessionIdleTimeout", sessionIdleTimeout)
+
+        reconnectBudget = self.reconnectBudgetSpinBox.value()
+        settings.setValue("measurement/reconnectBudget", reconnectBudget)
+
+        concurrentReadings = self.concurrentReadingsCheckBox.isChecked()
+        settings.setValue("measurement/concurrentReadings", concurrentReadings)
+
+        hardwareSweep = self.hardwareSweepCheckBox.isChecked()
+        settings.setValue("measurement/hardwareSweep", hardwareSweep)
+
+        bufferedContinuous = self.bufferedContinuousCheckBox.isChecked()
+        settings.setValue("measurement/bufferedContinuous", bufferedContinuous)
+
+        sourceVerifyInterval = self.sourceVerifyIntervalSpinBox.value()
+        settings.setValue("measurement/sourceVerifyInterval", sourceVerifyInterval)
+
+        adaptiveRamp = self.adaptiveRampCheckBox.isChecked()
+        settings.setValue("measurement/adaptiveRamp", adaptiveRamp)
+
+        adaptiveMinStep = self.adaptiveMinStepSpinBox.value()
+        settings.setValue("measurement/adaptiveMinStep", adaptiveMinStep)
+
+        adaptiveThreshold = self.adaptiveThresholdSpinBox.value() / 100
+        settings.setValue("measurement/adaptiveThreshold", adaptiveThreshold)
+
+        settlingMode = self.settlingModeComboBox.currentData() or "off"
+        settings.setValue("measurement/settlingMode", settlingMode)
+
+        settlingTolerance = self.settlingToleranceSpinBox.value() / 100
+        settings.setValue("measurement/settlingTolerance", settlingTolerance)
+
+        settlingCount = self.settlingCountSpinBox.value()
+        settings.setValue("measurement/settlingCount", settlingCount)
+
+        sampleCount = self.sampleCountSpinBox.value()
+        settings.setValue("measurement/sampleCount", sampleCount)
+
+        sampleMethod = self.sampleMethodComboBox.currentData() or "median"
+        settings.setValue("measurement/sampleMethod", sampleMethod)
+
+        sampleSigma = self.sampleSigmaSpinBox.value()
+        settings.setValue("measurement/sampleSigma", sampleSigma)
+
+        sampleTrim = self.sampleTrimSpinBox.value() / 100
+        settings.setValue("measurement/sampleTrim", sampleTrim)
+
+        rampSlewRate = self.rampSlewRateSpinBox.value()
+        settings.setValue("measurement/rampSlewRate", rampSlewRate)
+
+        rampMaxStep = self.rampMaxStepSpinBox.value()
+        settings.setValue("measurement/rampMaxStep", rampMaxStep)
+
+        rampHardwareSweep = self.rampHardwareSweepCheckBox.isChecked()
+        settings.setValue("measurement/rampHardwareSweep", rampHardwareSweep)
@@ -1,10 +1,19 @@
 import csv
 import math
+import os
 
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
 
 __all__ = ["Writer"]
 
+DEVIATION_COLUMNS: List[Tuple[str, str]] = [
+    ("i_smu_std", "A"),
+    ("i_smu2_std", "A"),
+    ("i_elm_std", "A"),
+    ("i_elm2_std", "A"),
+    ("c_lcr_std", "F"),
+]
+
 
 def safe_format(value: Any, format_spec: str = None) -> str:
     """Safe format any value, return `NAN` if format fails."""
@@ -22,6 +31,9 @@ class Writer:
         self._fp = fp
         self._writer = csv.writer(fp, delimiter=type(self).delimiter)
         self._current_table: Optional[str] = None
+        self._settling_time: bool = False
+        self._deviation_columns: List[Tuple[str, str]] = []
+        self._temperature_channels: List[str] = []
         self._timestamp_offset: float = 0.
         self.relative_timestamp: bool = False
         self.timestamp_format: str = ".6f"
@@ -50,6 +62,26 @@ class Writer:
         value = format(value).strip()
         self._writer.writerow([f"{key}: {value}"])
 
+    def optional_header(self, data: dict) -> List[str]:
+        """Select optional columns (standard deviations of sampled readings,
+        settling time, scanned DMM channels) of reading for the current
+        table, return their column names.
+        """
+        self._deviation_columns = [(key, unit) for key, unit in DEVIATION_COLUMNS if key in data]
+        self._settling_time = "settling_time" in data
+        self._temperature_channels = sorted(key[6:] for key in data if key.startswith("t_dmm_"))
+        header: List[str] = [f"{key}[{unit}]" for key, unit in self._deviation_columns]
+        if self._settling_time:
+            header.append("settling_time[s]")
+        return header + [f"temperature_{channel}[degC]" for channel in self._temperature_channels]
+
+    def optional_columns(self, data: dict) -> List[str]:
+        """Return formatted optional columns selected for the current table."""
+        columns: List[str] = [safe_format(data.get(key), self.value_format) for key, _ in self._deviation_columns]
+        if self._settling_time:
+            columns.append(safe_format(data.get("settling_time"), self.timestamp_format))
+        return columns + [safe_format(data.get(f"t_dmm_{channel}"), self.value_format) for channel in self._temperature_channels]
+
     def write_table_header(self, columns: list) -> None:
         self._writer.writerow([])
         self._writer.writerow(columns)
@@ -67,10 +99,33 @@ class Writer:
         self.write_tag("voltage_end[V]", safe_format(data.get("voltage_end"), self.value_format))
         self.write_tag("voltage_step[V]", safe_format(data.get("voltage_step"), self.value_format))
         self.write_tag("waiting_time[s]", safe_format(data.get("waiting_time"), self.value_format))
+        self.write_tag("sweep_profile", self.sweep_profile(data))
+        if data.get("adaptive_ramp"):
+            self.write_tag("voltage_min_step[V]", safe_format(data.get("adaptive_min_step"), self.value_format))
+            self.write_tag("adaptive_threshold", safe_format(data.get("adaptive_threshold"), self.value_format))
+        if data.get("sample_count", 1) > 1:
+            self.write_tag("sample_count", data.get("sample_count"))
+            self.write_tag("sample_method", data.get("sample_method"))
+            self.write_tag("sample_sigma", safe_format(data.get("sample_sigma"), self.value_format))
+            if data.get("sample_method") == "trimmed_mean":
+                self.write_tag("sample_trim", safe_format(data.get("sample_trim"), self.value_format))
+        if data.get("settling_mode", "off") != "off":
+            self.write_tag("settling_mode", data.get("settling_mode"))
+            self.write_tag("settling_tolerance", safe_format(data.get("settling_tolerance"), self.value_format))
+            self.write_tag("settling_count", data.get("settling_count"))
         self.write_tag("current_compliance[A]", safe_format(data.get("current_compliance"), self.value_format))
         self.write_meta_lcr(data)
         self.flush()
 
+    def sweep_profile(self, data: dict) -> str:
+        """Return description of sweep profile, e.g. `bidirectional linear`."""
+        profile = data.get("sweep_profile", "linear")
+        if profile == "file":
+            profile = f"file:{os.path.basename(data.get('sweep_file', ''))}"
+        if data.get("sweep_bidirectional"):
+            profile = f"bidirectional {profile}"
+        return profile
+
     def write_meta_lcr(self, data: dict) -> None:
         lcr = data.get("roles", {}).get("lcr", {})
         if lcr.get("enabled"):
@@ -95,7 +150,7 @@ class Writer:
                 "i_elm[A]",
                 "i_elm2[A]",
                 "temperature[degC]",
-            ])
+            ] + self.optional_header(data))
             self.reset_timestamp_offset(data)
         self.write_table_row([
             safe_format(self.get_timestamp(data), self.timestamp_format),
@@ -105,7 +160,7 @@ class Writer:
             safe_format(data.get("i_elm"), self.value_format),
             safe_format(data.get("i_elm2"), self.value_format),
             safe_format(data.get("t_dmm"), self.value_format),
-        ])
+        ] + self.optional_columns(data))
         self.flush()
 
     def write_iv_bias_row(self, data: dict) -> None:
@@ -121,7 +176,7 @@ class Writer:
                 "i_elm[A]",
                 "i_elm2[A]",
                 "temperature[degC]",
-            ])
+            ] + self.optional_header(data))
             self.reset_timestamp_offset(data)
         self.write_table_row([
             safe_format(self.get_timestamp(data), self.timestamp_format),
@@ -133,7 +188,7 @@ class Writer:
             safe_format(data.get("i_elm"), self.value_format),
             safe_format(data.get("i_elm2"), self.value_format),
             safe_format(data.get("t_dmm"), self.value_format),
-        ])
+        ] + self.optional_columns(data))
         self.flush()
 
     def write_it_row(self, data: dict) -> None:
@@ -147,7 +202,7 @@ class Writer:
                 "i_elm[A]",
                 "i_elm2[A]",
                 "temperature[degC]",
-            ])
+            ] + self.optional_header(data))
             self.reset_timestamp_offset(data)
         self.write_table_row([
             safe_format(self.get_timestamp(data), self.timestamp_format),
@@ -157,7 +212,7 @@ class Writer:
             safe_format(data.get("i_elm"), self.value_format),
             safe_format(data.get("i_elm2"), self.value_format),
             safe_format(data.get("t_dmm"), self.value_format),
-        ])
+        ] + self.optional_columns(data))
         self.flush()
 
     def write_it_bias_row(self, data: dict) -> None:
@@ -172,8 +227,8 @@ class Writer:
                 "i_smu2[A]",
                 "i_elm[A]",
                 "i_elm2[A]",
-                "temperature[degC]"
-            ])
+                "temperature[degC]",
+            ] + self.optional_header(data))
             self.reset_timestamp_offset(data)
         self.write_table_row([
             safe_format(self.get_timestamp(data), self.timestamp_format),
@@ -185,7 +240,7 @@ class Writer:
             safe_format(data.get("i_elm"), self.value_format),
             safe_format(data.get("i_elm2"), self.value_format),
             safe_format(data.get("t_dmm"), self.value_format),
-        ])
+        ] + self.optional_columns(data))
         self.flush()
 
     def write_cv_row(self, data: dict) -> None:
@@ -199,8 +254,8 @@ class Writer:
                 "c_lcr[F]",
                 "c2_lcr[1/F^2]",
                 "r_lcr[Ohm]",
-                "temperature[degC]"
-            ])
+                "temperature[degC]",
+            ] + self.optional_header(data))
             self.reset_timestamp_offset(data)
         self.write_table_row([
             safe_format(self.get_timestamp(data), self.timestamp_format),
@@ -210,6 +265,6 @@ class Writer:
             safe_format(data.get("c_lcr"), self.value_format),
             safe_format(data.get("c2_lcr"), self.value_format),
             safe_format(data.get("r_lcr"), self.value_format),
-            safe_format(data.get("t_dmm"), self.value_format)
-        ])
+            safe_format(data.get("t_dmm"), self.value_format),
+        ] + self.optional_columns(data))
         self.flush()
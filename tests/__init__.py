@@ -1,10 +1,16 @@
+from array import array
+
 import pytest
 
+from diode_measurement.resource import poll_event_status
+
 
 class FakeResource:
 
     def __init__(self):
         self.buffer = []
+        self.reconnects = 0
+        self.stb = 0
 
     def write(self, message):
         self.buffer.append(message)
@@ -13,9 +19,22 @@ class FakeResource:
         self.buffer.append(message)
         return self.buffer.pop(0)
 
+    def query_binary_values(self, message, datatype="d", is_big_endian=False):
+        self.buffer.append(message)
+        return array(datatype, self.buffer.pop(0))
+
     def clear(self):
         ...
 
+    def read_stb(self):
+        return self.stb
+
+    def prepare_opc(self):
+        ...
+
+    def wait_for_opc(self, timeout, abort=None):
+        return poll_event_status(self.query, timeout, abort=abort)
+
 
 @pytest.fixture
 def res():
@@ -0,0 +1,138 @@
+import asyncio
+
+from diode_measurement.aio import AsyncResource, async_driver, async_driver_class, measure_instruments
+from diode_measurement.driver import K2410, K6514
+from diode_measurement.resource import Resource
+from diode_measurement.simulation import SimulatedInstrument
+
+from . import FakeResource
+
+
+class FakeSrqResource(FakeResource):
+
+    resource_name = "FAKE::SRQ"
+
+    def __init__(self):
+        super().__init__()
+        self.srq_armed = False
+        self.srq = False
+
+    def prepare_opc(self):
+        self.srq_armed = True
+
+    def poll_srq(self):
+        self.buffer.append("poll")
+        if self.srq:
+            self.srq_armed = False
+        return self.srq
+
+    def disarm_srq(self):
+        self.srq_armed = False
+
+    def query(self, message):
+        if message == "*TRG":
+            self.srq = True
+        return super().query(message)
+
+
+def test_async_driver_class():
+    cls = async_driver_class(K2410)
+    assert cls.__name__ == "AsyncK2410"
+    assert cls is async_driver_class(K2410)
+    assert asyncio.iscoroutinefunction(cls.measure_iv)
+    assert not hasattr(cls, "_write")
+
+
+def test_async_measure_instruments(monkeypatch):
+    monkeypatch.setattr(SimulatedInstrument, "time_scale", 0.0)
+
+    async def main():
+        async with AsyncResource(Resource("SIM::K2410::test_aio", "")) as smu_res, \
+                AsyncResource(Resource("SIM::K6514::test_aio", "")) as elm_res:
+            smu = async_driver(K2410, smu_res)
+            elm = async_driver(K6514, elm_res)
+            await asyncio.gather(smu.configure({}), elm.configure({}))
+            await elm.set_zero_check_enabled(False)
+            await smu.set_output_enabled(True)
+            await smu.set_voltage_level(-20.0)
+            await smu_res.write("*OPC")
+            assert await smu_res.wait_for_opc(1.0) is True
+            return await measure_instruments({"smu": smu, "elm": elm})
+
+    results, timestamps = asyncio.run(main())
+    assert results["smu"][1] == -20.0
+    assert results["elm"] < 0
+    assert set(timestamps) == {"smu", "elm"}
+
+
+def test_async_resource_flush_pipeline():
+    res = FakeSrqResource()
+
+    async def main():
+        async_res = AsyncResource(res)
+        smu = async_driver(K2410, async_res)
+        smu.driver.set_pipeline_enabled(True, 8)
+        await smu.set_voltage_level(-5.0)
+        assert res.buffer == []
+        # Pending writes are sent before direct I/O
+        await async_res.write("*OPC")
+        assert res.buffer == [":SOUR:VOLT:LEV -5.000E+00", "*OPC"]
+
+    asyncio.run(main())
+
+
+def test_async_resource_wait_for_srq():
+    res = FakeSrqResource()
+    res.buffer = ["1", "1"]
+
+    async def main():
+        async_res = AsyncResource(res)
+        await async_res.prepare_opc()
+        await async_res.write("*OPC")
+        wait = asyncio.ensure_future(async_res.wait_for_opc(1.0))
+        await asyncio.sleep(0.020)
+        # Worker is not blocked while waiting for the service request
+        assert await async_res.query("*TRG") == "1"
+        assert await wait is True
+
+    asyncio.run(main())
+    assert res.buffer[0] == "*OPC"
+    assert res.buffer[1:3] == ["poll", "poll"]
+    assert res.buffer[-3:] == ["*TRG", "poll", "*ESR?"]
+    assert res.srq_armed is False
+
+
+def test_async_driver_fetch():
+    res = FakeSrqResource()
+    res.buffer = ["1", "1", "1", "-1.000000E-09,+0.000000E+00"]
+
+    async def main():
+        async_res = AsyncResource(res)
+        elm = async_driver(K6514, async_res)
+        await elm.initiate()
+        assert elm.driver.opc_requested is True
+        fetch = asyncio.ensure_future(elm.fetch())
+        await asyncio.sleep(0.020)
+        # Operation complete is awaited on the event loop
+        assert await async_res.query("*TRG") == "1"
+        return await fetch
+
+    assert asyncio.run(main()) == -1e-9
+    assert res.buffer[:5] == ["*CLS", "*OPC?", "*OPC", ":INIT", "poll"]
+    # Driver fetches without polling the event status again
+    assert res.buffer[-4:] == ["*TRG", "poll", "*ESR?", ":FETC?"]
+    assert res.srq_armed is False
+
+
+def test_async_resource_wait_for_srq_timeout():
+    res = FakeSrqResource()
+    res.buffer = ["0"]
+
+    async def main():
+        async_res = AsyncResource(res)
+        await async_res.prepare_opc()
+        return await async_res.wait_for_opc(0.050)
+
+    assert asyncio.run(main()) is False
+    assert res.buffer[-1] == "*ESR?"
+    assert res.srq_armed is False
@@ -0,0 +1,31 @@
+import pytest
+
+from diode_measurement.driver import DRIVERS, Capability, driver_capabilities
+from diode_measurement.driver.driver import Electrometer, LCRMeter, SourceMeter
+
+
+def overrides(cls, base, name):
+    return getattr(cls, name, None) is not getattr(base, name, None)
+
+
+@pytest.mark.parametrize("model", list(DRIVERS))
+def test_driver_capabilities(model):
+    cls = DRIVERS[model]
+    capabilities = driver_capabilities(model)
+    assert capabilities is cls.capabilities
+    assert (Capability.MEASURE_V in capabilities) == hasattr(cls, "measure_v")
+    assert (Capability.INTERLOCK in capabilities) == hasattr(cls, "is_interlock")
+    if issubclass(cls, LCRMeter):
+        hardware_sweep = overrides(cls, LCRMeter, "prepare_list_sweep")
+    elif issubclass(cls, SourceMeter):
+        hardware_sweep = overrides(cls, SourceMeter, "prepare_sweep")
+    else:
+        hardware_sweep = False
+    assert (Capability.HARDWARE_SWEEP in capabilities) == hardware_sweep
+    trace_buffer = issubclass(cls, Electrometer) and overrides(cls, Electrometer, "prepare_buffer")
+    assert (Capability.TRACE_BUFFER in capabilities) == trace_buffer
+
+
+def test_driver_capabilities_unknown():
+    with pytest.raises(ValueError):
+        driver_capabilities("K0000")
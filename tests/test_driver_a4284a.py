@@ -97,3 +97,34 @@ def test_driver_a4284a(res):
     res.buffer = ["1"]
     assert d.set_amplitude_alc(True) is None
     assert res.buffer == [":AMPL:ALC 1", "*OPC?"]
+
+
+def test_driver_a4284a_list_sweep(res):
+    d = A4284A(res)
+
+    res.buffer = ["1", "1", "1", "1"]
+    assert d.prepare_list_sweep([0.0, -1.0], 0.5) is None
+    assert res.buffer == [
+        ":DISP:PAGE LIST", "*OPC?",
+        ":LIST:MODE SEQ", "*OPC?",
+        ":LIST:BIAS:VOLT 0.000E+00,-1.000E+00", "*OPC?",
+        ":TRIG:DEL 5.000000E-01", "*OPC?",
+    ]
+
+    res.buffer = ["1", "1", "+1.00000E-10,+2.00000E+03,+0,+0,+1.10000E-10,+2.10000E+03,+0,+0", "1", "1", "1"]
+    assert d.fetch_list_sweep() == [(1.0e-10, 2.0e3), (1.1e-10, 2.1e3)]
+    assert res.buffer == [
+        "*CLS", "*OPC?", "*OPC", ":TRIG:IMM", "*ESR?", ":FETC?",
+        ":BIAS:VOLT:LEV -1.000E+00", "*OPC?",
+        ":TRIG:DEL 0", "*OPC?",
+        ":DISP:PAGE MEAS", "*OPC?",
+    ]
+
+    # Abort list sweep on stop request
+    res.buffer = ["1", "0", "1", "1"]
+    assert d.fetch_list_sweep(abort=lambda: True) == []
+    assert res.buffer == [
+        "*CLS", "*OPC?", "*OPC", ":TRIG:IMM", "*ESR?", ":ABOR",
+        ":TRIG:DEL 0", "*OPC?",
+        ":DISP:PAGE MEAS", "*OPC?",
+    ]
@@ -93,3 +93,51 @@ def test_driver_e4980a(res):
     res.buffer = ["1"]
     assert d.set_amplitude_alc(True) is None
     assert res.buffer == [":AMPL:ALC 1", "*OPC?"]
+
+
+def test_driver_e4980a_list_sweep(res):
+    d = E4980A(res)
+
+    res.buffer = ["1", "1", "1", "1"]
+    assert d.prepare_list_sweep([0.0, -1.0], 0.5) is None
+    assert res.buffer == [
+        ":DISP:PAGE LIST", "*OPC?",
+        ":LIST:MODE SEQ", "*OPC?",
+        ":LIST:BIAS:VOLT 0.000E+00,-1.000E+00", "*OPC?",
+        ":TRIG:DEL 5.000000E-01", "*OPC?",
+    ]
+
+    res.buffer = ["1", "1", "1", "1", [1.0e-10, 2.0e3, 0, 0, 1.1e-10, 2.1e3, 0, 0], "1", "1", "1", "1"]
+    assert d.fetch_list_sweep() == [(1.0e-10, 2.0e3), (1.1e-10, 2.1e3)]
+    assert res.buffer == [
+        ":FORM:BORD NORM", "*OPC?",
+        ":FORM:DATA REAL,64", "*OPC?",
+        "*CLS", "*OPC?", "*OPC", ":TRIG:IMM", "*ESR?", ":FETC?",
+        ":FORM:DATA ASC", "*OPC?",
+        ":BIAS:VOLT:LEV -1.000E+00", "*OPC?",
+        ":TRIG:DEL 0", "*OPC?",
+        ":DISP:PAGE MEAS", "*OPC?",
+    ]
+
+    # Abort list sweep on stop request
+    res.buffer = ["1", "1", "0", "1", "1", "1"]
+    assert d.fetch_list_sweep(abort=lambda: True) == []
+    assert res.buffer == [
+        ":FORM:DATA REAL,64", "*OPC?",
+        "*CLS", "*OPC?", "*OPC", ":TRIG:IMM", "*ESR?", ":ABOR",
+        ":TRIG:DEL 0", "*OPC?",
+        ":DISP:PAGE MEAS", "*OPC?",
+        ":FORM:DATA ASC", "*OPC?",
+    ]
+
+
+def test_driver_e4980a_initiate_fetch(res):
+    d = E4980A(res)
+
+    res.buffer = ["1"]
+    assert d.initiate() is None
+    assert res.buffer == ["*CLS", "*OPC?", "*OPC", ":TRIG:IMM"]
+
+    res.buffer = ["1", "1.000000E-01,2.000000E-01,+0"]
+    assert d.fetch() == (0.1, 0.2)
+    assert res.buffer == ["*ESR?", ":FETC?"]
@@ -69,7 +69,17 @@ def test_driver_k237(res):
 
     res.buffer = ["+4.210000E-03", "+4.200000E+01"]
     assert d.measure_iv() == (0.00421, 42.0)
-    assert res.buffer == ["G4,2,0X", "X", "G1,2,0X", "X"]
+    assert res.buffer == ["X", "G1,2,0X", "X"]
+
+    res.buffer = ["OSDCV+4.2000E+01,NMDCI+4.2100E-03"]
+    assert d.measure_iv(status=True) == (0.00421, 42.0, True)
+    assert res.buffer == ["G5,0,0X", "X"]
+
+    # Mode commands are sent again after clear
+    res.buffer = ["+4.210000E-03"]
+    d.clear()
+    assert d.measure_i() == 0.00421
+    assert res.buffer == ["G4,2,0X", "X"]
 
     assert d._voltage_range(0.1) == 1
     assert d._voltage_range(2.0) == 2
@@ -58,18 +58,26 @@ def test_driver_k2400(res):
     assert d.compliance_tripped() is True
     assert res.buffer == [":SENS:CURR:PROT:TRIP?"]
 
-    res.buffer = ["1", "+4.210000E+01,+4.210000E-03"]  # VOLT,CURR
+    res.buffer = ["1", "+4.210000E+01,+4.210000E-03,+0.000000E+00"]  # VOLT,CURR,STAT
     assert d.measure_i() == 0.00421
-    assert res.buffer == [":FORM:ELEM VOLT,CURR", "*OPC?", ":READ?"]
+    assert res.buffer == [":FORM:ELEM VOLT,CURR,STAT", "*OPC?", ":READ?"]
 
-    res.buffer = ["+4.210000E+01,+4.210000E-03"]  # VOLT,CURR
+    res.buffer = ["+4.210000E+01,+4.210000E-03,+0.000000E+00"]  # VOLT,CURR,STAT
     assert d.measure_v() == 42.1
     assert res.buffer == [":READ?"]
 
-    res.buffer = ["+4.210000E+01,+4.210000E-03"]  # VOLT,CURR
+    res.buffer = ["+4.210000E+01,+4.210000E-03,+0.000000E+00"]  # VOLT,CURR,STAT
     assert d.measure_iv() == (0.00421, 42.1)
     assert res.buffer == [":READ?"]
 
+    res.buffer = ["+4.210000E+01,+4.210000E-03,+1.200000E+01"]  # VOLT,CURR,STAT
+    assert d.measure_iv(status=True) == (0.00421, 42.1, True)
+    assert res.buffer == [":READ?"]
+
+    res.buffer = ["+4.210000E+01,+4.210000E-03,+4.000000E+00"]  # VOLT,CURR,STAT
+    assert d.fetch(status=True) == (0.00421, 42.1, False)
+    assert res.buffer == [":READ?"]
+
     res.buffer = ["1"]
     assert d.set_system_beeper_state(True) is None
     assert res.buffer == [":SYST:BEEP:STAT 1", "*OPC?"]
@@ -97,3 +105,118 @@ def test_driver_k2400(res):
     res.buffer = ["1"]
     assert d.set_sense_current_nplc(4.2) is None
     assert res.buffer == [":SENS:CURR:NPLC 4.200000E+00", "*OPC?"]
+
+
+def test_driver_k2400_pipeline(res):
+    d = K2400(res)
+    d.set_pipeline_enabled(True, size=3)
+
+    res.buffer = []
+    assert d.set_voltage_level(42.0) is None
+    assert d.set_voltage_range(200.0) is None
+    assert res.buffer == []
+
+    res.buffer = ["0,\"No error\""]
+    assert d.next_error() == (0, "No error")
+    assert res.buffer == [":SOUR:VOLT:LEV 4.200E+01;:SOUR:VOLT:RANG 2.000E+02", ":SYST:ERR?"]
+
+    res.buffer = ["1"]
+    assert d.set_system_beeper_state(False) is None
+    assert d.set_route_terminals("FRON") is None
+    assert d.set_source_function("VOLT") is None
+    assert res.buffer == [":SYST:BEEP:STAT 0;:ROUT:TERM FRON;:SOUR:FUNC VOLT", "*OPC?"]
+
+    res.buffer = ["1"]
+    assert d.set_output_enabled(True) is None
+    assert d.flush() is None
+    assert res.buffer == [":OUTP:STAT 1", "*OPC?"]
+
+    res.buffer = []
+    assert d.flush() is None
+    assert res.buffer == []
+
+
+def test_driver_k2400_sweep(res):
+    d = K2400(res)
+
+    res.buffer = ["0", "+2.500000E-01", "1", "1", "1", "1", "1", "1"]
+    assert d.prepare_sweep([0.0, -5.0], 0.5) is None
+    assert res.buffer == [
+        ":SOUR:DEL:AUTO?",
+        ":SOUR:DEL?",
+        ":SOUR:VOLT:MODE LIST", "*OPC?",
+        ":SOUR:LIST:VOLT 0.000E+00,-5.000E+00", "*OPC?",
+        ":SOUR:VOLT:LEV -5.000E+00", "*OPC?",
+        ":SOUR:DEL 5.000000E-01", "*OPC?",
+        ":TRIG:COUN 2", "*OPC?",
+        ":FORM:ELEM VOLT,CURR,TIME", "*OPC?",
+    ]
+
+    res.buffer = ["1", "1", "1", "1", [0.0, 0.125, 12.0, -5.0, 0.25, 12.5], "1", "1", "1", "1"]
+    assert d.fetch_sweep() == [(0.125, 0.0, 0.0), (0.25, -5.0, 0.5)]
+    assert res.buffer == [
+        "*CLS", "*OPC?", "*OPC", ":INIT", "*ESR?",
+        ":FORM:BORD NORM", "*OPC?",
+        ":FORM:DATA REAL,32", "*OPC?",
+        ":FETC?",
+        ":FORM:DATA ASC", "*OPC?",
+        ":SOUR:VOLT:MODE FIX", "*OPC?",
+        ":SOUR:DEL 2.500000E-01", "*OPC?",
+        ":TRIG:COUN 1", "*OPC?",
+    ]
+
+    # Abort sweep on stop request
+    res.buffer = ["1", "0", "1", "1", "1"]
+    assert d.fetch_sweep(abort=lambda: True) == []
+    assert res.buffer == [
+        "*CLS", "*OPC?", "*OPC", ":INIT", "*ESR?", ":ABOR",
+        ":SOUR:VOLT:MODE FIX", "*OPC?",
+        ":SOUR:DEL 2.500000E-01", "*OPC?",
+        ":TRIG:COUN 1", "*OPC?",
+    ]
+
+
+def test_driver_k2400_sweep_unprepared(res):
+    d = K2400(res)
+
+    # No source delay to restore without prepared sweep
+    res.buffer = ["1", "0", "1", "1"]
+    assert d.fetch_sweep(timeout=0.0, abort=lambda: True) == []
+    assert res.buffer == [
+        "*CLS", "*OPC?", "*OPC", ":INIT", "*ESR?", ":ABOR",
+        ":SOUR:VOLT:MODE FIX", "*OPC?",
+        ":TRIG:COUN 1", "*OPC?",
+    ]
+
+
+def test_driver_k2400_settings(res):
+    d = K2400(res)
+
+    res.buffer = ["1"]
+    assert d.set_voltage_range(200.0) is None
+    assert res.buffer == [":SOUR:VOLT:RANG 2.000E+02", "*OPC?"]
+
+    res.buffer = []
+    assert d.set_voltage_range(200.0) is None
+    assert res.buffer == []
+
+    res.buffer = ["1"]
+    assert d.set_voltage_range(20.0) is None
+    assert res.buffer == [":SOUR:VOLT:RANG 2.000E+01", "*OPC?"]
+
+    res.buffer = ["1", "1"]
+    assert d.reset() is None
+    assert d.set_voltage_range(20.0) is None
+    assert res.buffer == ["*RST", "*OPC?", ":SOUR:VOLT:RANG 2.000E+01", "*OPC?"]
+
+    res.reconnects += 1
+    res.buffer = ["1"]
+    assert d.set_voltage_range(20.0) is None
+    assert res.buffer == [":SOUR:VOLT:RANG 2.000E+01", "*OPC?"]
+
+    # Restore configuration and changed settings
+    res.buffer = ["1"] * 32
+    assert d.restore({}) is None
+    messages = [message for message in res.buffer if message not in ("1", "*OPC?")]
+    assert messages[:2] == [":SYST:BEEP:STAT 0", ":ROUT:TERM FRON"]
+    assert messages[-1] == ":SOUR:VOLT:RANG 2.000E+01"
@@ -93,3 +93,31 @@ def test_driver_k2470(res):
     res.buffer = ["1"]
     assert d.is_interlock() is True
     assert res.buffer == [":OUTP:INT:TRIP?"]
+
+
+def test_driver_k2470_sweep(res):
+    d = K2470(res)
+
+    res.buffer = ["1", "1", "1", "1"]
+    assert d.prepare_sweep([0.0, -5.0], 0.5) is None
+    assert res.buffer == [
+        ":SENS:FUNC \"CURR\"", "*OPC?",
+        ":SOUR:LIST:VOLT 0.000E+00,-5.000E+00", "*OPC?",
+        ":SOUR:SWE:VOLT:LIST 1, 5.000000E-01", "*OPC?",
+        ":TRAC:CLE", "*OPC?",
+    ]
+
+    res.buffer = ["1", "1", "1", "1", [1e-9, 0.0, 0.0, 2e-9, -5.0, 0.5], "1"]
+    assert d.fetch_sweep() == [(1e-9, 0.0, 0.0), (2e-9, -5.0, 0.5)]
+    assert res.buffer == [
+        "*CLS", "*OPC?", "*OPC", ":INIT", "*ESR?",
+        ":FORM:BORD NORM", "*OPC?",
+        ":FORM:DATA REAL", "*OPC?",
+        ":TRAC:DATA? 1, 2, \"defbuffer1\", READ, SOUR, REL",
+        ":FORM:DATA ASC", "*OPC?",
+    ]
+
+    # Abort sweep on stop request
+    res.buffer = ["1", "0"]
+    assert d.fetch_sweep(abort=lambda: True) == []
+    assert res.buffer == ["*CLS", "*OPC?", "*OPC", ":INIT", "*ESR?", ":ABOR"]
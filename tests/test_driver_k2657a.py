@@ -58,9 +58,13 @@ def test_driver_k2657a(res):
     assert d.measure_v() == 42.1
     assert res.buffer == ["print(smua.measure.v())"]
 
-    res.buffer = ["+4.210000E-03", "+4.210000E+01"]
+    res.buffer = ["+4.210000E-03\t+4.210000E+01"]
     assert d.measure_iv() == (0.00421, 42.1)
-    assert res.buffer == ["print(smua.measure.i())", "print(smua.measure.v())"]
+    assert res.buffer == ["print(smua.measure.iv())"]
+
+    res.buffer = ["+4.210000E-03\t+4.210000E+01\tfalse"]
+    assert d.measure_iv(status=True) == (0.00421, 42.1, False)
+    assert res.buffer == ["print(smua.measure.i(), smua.measure.v(), smua.source.compliance)"]
 
     res.buffer = ["1"]
     assert d.set_beeper_enable(True) is None
@@ -85,3 +89,49 @@ def test_driver_k2657a(res):
     res.buffer = ["1"]
     assert d.set_measure_nplc(4.2) is None
     assert res.buffer == ["smua.measure.nplc = 4.200000E+00", "*OPC?"]
+
+
+def test_driver_k2657a_sweep(res):
+    d = K2657A(res)
+
+    res.buffer = ["-1.00000e+00"]
+    assert d.prepare_sweep([0.0, -5.0], 0.5) is None
+    assert res.buffer == [
+        "print(smua.source.delay)",
+        "loadscript diodeMeasurementSweep",
+        "smua.nvbuffer1.clear()",
+        "smua.nvbuffer2.clear()",
+        "smua.nvbuffer1.collecttimestamps = 1",
+        "smua.source.delay = 5.000000E-01",
+        "smua.trigger.source.listv({0.000E+00, -5.000E+00})",
+        "smua.trigger.source.limiti = smua.source.limiti",
+        "smua.trigger.source.action = smua.ENABLE",
+        "smua.trigger.measure.iv(smua.nvbuffer1, smua.nvbuffer2)",
+        "smua.trigger.measure.action = smua.ENABLE",
+        "smua.trigger.endsweep.action = smua.SOURCE_HOLD",
+        "smua.trigger.count = 2",
+        "smua.trigger.arm.count = 1",
+        "smua.trigger.initiate()",
+        "endscript",
+    ]
+
+    res.buffer = ["2.00000e+00", "1", "0.00000e+00, 1.00000e-09, 0.00000e+00, 5.10000e-01, 2.00000e-09, -5.00000e+00"]
+    assert d.fetch_sweep() == [(1e-9, 0.0, 0.0), (2e-9, -5.0, 0.51)]
+    assert res.buffer == [
+        "diodeMeasurementSweep()",
+        "print(smua.nvbuffer2.n)",
+        "smua.source.delay = -1.000000E+00",
+        "*OPC?",
+        "printbuffer(1, 2, smua.nvbuffer1.timestamps, smua.nvbuffer1.readings, smua.nvbuffer2.readings)",
+    ]
+
+    # Abort sweep on stop request
+    res.buffer = ["1.00000e+00", "1"]
+    assert d.fetch_sweep(abort=lambda: True) == []
+    assert res.buffer == [
+        "diodeMeasurementSweep()",
+        "print(smua.nvbuffer2.n)",
+        "smua.abort()",
+        "smua.source.delay = -1.000000E+00",
+        "*OPC?",
+    ]
@@ -1,4 +1,4 @@
-from diode_measurement.driver.k2700 import K2700
+from diode_measurement.driver.k2700 import K2700, parse_channels
 
 from . import res
 
@@ -17,3 +17,66 @@ def test_driver_k2700(res):
     res.buffer = ["1"]
     assert d.clear() is None
     assert res.buffer == ["*CLS", "*OPC?"]
+
+    res.buffer = ["1", "+2.310000E+01"]
+    assert d.measure_temperature() == 23.1
+    assert res.buffer == [":FORM:ELEM READ", "*OPC?", ":FETC?"]
+
+    res.buffer = []  # cached reading
+    assert d.measure_temperature() == 23.1
+    assert res.buffer == []
+    assert d.channel_temperatures() == {}
+
+    # Settings are written again after clear
+    d._temperatures = []
+    res.buffer = ["1", "1", "+2.320000E+01"]
+    assert d.clear() is None
+    assert d.measure_temperature() == 23.2
+    assert res.buffer == ["*CLS", "*OPC?", ":FORM:ELEM READ", "*OPC?", ":FETC?"]
+
+
+def test_driver_k2700_scan(res):
+    d = K2700(res)
+
+    assert parse_channels("101:103, 105") == ["101", "102", "103", "105"]
+    assert parse_channels("(@101)") == ["101"]
+    assert parse_channels("") == []
+
+    res.buffer = ["1"] * 11
+    d.configure({"scan.channels": "101:102", "scan.transducer": "TC", "scan.type": "K", "temperature.interval": 0.0})
+    assert res.buffer == [
+        ":INIT:CONT OFF", "*OPC?",
+        ":TRAC:CLE", "*OPC?",
+        ":SENS:FUNC 'TEMP',(@101,102)", "*OPC?",
+        ":SENS:TEMP:TRAN TC,(@101,102)", "*OPC?",
+        ":SENS:TEMP:TC:TYPE K,(@101,102)", "*OPC?",
+        ":TRIG:SOUR IMM", "*OPC?",
+        ":TRIG:COUN 1", "*OPC?",
+        ":SAMP:COUN 2", "*OPC?",
+        ":ROUT:SCAN (@101,102)", "*OPC?",
+        ":ROUT:SCAN:TSO IMM", "*OPC?",
+        ":ROUT:SCAN:LSEL INT", "*OPC?",
+    ]
+
+    res.buffer = ["1", "+2.310000E+01,+2.420000E+01"]
+    assert d.measure_temperatures() == [23.1, 24.2]
+    assert res.buffer == [":FORM:ELEM READ", "*OPC?", ":READ?"]
+    assert d.channel_temperatures() == {"101": 23.1, "102": 24.2}
+
+    res.buffer = ["+2.320000E+01,+2.430000E+01"]
+    assert d.measure_temperature() == 23.2
+    assert res.buffer == [":READ?"]
+
+    # Return to single channel readings
+    res.buffer = ["1"] * 3
+    d.configure({"temperature.interval": 0.0})
+    assert res.buffer == [
+        ":ROUT:SCAN:LSEL NONE", "*OPC?",
+        ":SAMP:COUN 1", "*OPC?",
+        ":INIT:CONT ON", "*OPC?",
+    ]
+    assert d.channel_temperatures() == {}
+
+    res.buffer = ["+2.330000E+01"]
+    assert d.measure_temperature() == 23.3
+    assert res.buffer == [":FETC?"]
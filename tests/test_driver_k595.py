@@ -1,5 +1,8 @@
 import math
 
+import pytest
+
+from diode_measurement.driver.driver import DriverError
 from diode_measurement.driver.k595 import K595
 
 from . import res
@@ -47,7 +50,7 @@ def test_driver_k595(res):
 
     res.buffer = ["0,1.000E+00"]
     assert d.get_voltage_level() == 1.0
-    assert res.buffer == ["F1X", "G1X", "X"]
+    assert res.buffer == ["X"]
 
     res.buffer = []
     assert d.set_voltage_level(1.0) is None
@@ -63,20 +66,62 @@ def test_driver_k595(res):
 
     res.buffer = ["O0000000000000000000000000000"]
     assert d.compliance_tripped() is True
-    assert res.buffer == ["F1X", "G1X", "X"]
+    assert res.buffer == ["X"]
 
     res.buffer = ["+4.210E-03"]
     assert d.measure_i() == 0.00421
-    assert res.buffer == ["F1X", "G1X", "X"]
+    assert res.buffer == ["X"]
 
     res.buffer = ["+4.210E-03"]
     i, v = d.measure_iv()
     assert i == 0.00421
     assert math.isnan(v)
-    assert res.buffer == ["F1X", "G1X", "X"]
+    assert res.buffer == ["X"]
 
     res.buffer = ["1.000E-01"]
     prim, sec = d.measure_impedance()
     assert prim == 0.1
     assert math.isnan(sec)
-    assert res.buffer == ["F0X", "G1X", "X"]
+    assert res.buffer == ["F0X", "X"]
+
+    res.buffer = ["+4.210E-03"]
+    assert d.measure_i() == 0.00421
+    assert res.buffer == ["F1X", "X"]
+
+    # Mode commands are sent again after clear
+    res.buffer = ["+4.210E-03"]
+    d.clear()
+    assert d.measure_i() == 0.00421
+    assert res.buffer == ["F1X", "G1X", "X"]
+
+
+def test_driver_k595_pacing(res):
+    d = K595(res)
+    d.WRITE_DELAY = 0.1
+
+    d._write("F1X")
+    assert d._pacer.delay == 0.05
+    d._write("G1X")
+    assert d._pacer.delay == 0.025
+
+    # Error bit restores fixed delay, failed gap limits learned gap, error
+    # is cleared and command sent again
+    status = [0x20, 0]
+    res.read_stb = lambda: status.pop(0)
+    res.buffer = ["59500001000"]
+    d._write("V1.00X")
+    assert d._pacer.delay == 0.05
+    assert d._pacer.min_delay == 0.05
+    assert res.buffer == ["V1.00X", "U1X", "V1.00X"]
+    del res.read_stb
+    res.buffer = []
+    d._write("V2.00X")
+    assert d._pacer.delay == 0.05
+    assert res.buffer == ["V2.00X"]
+
+    # Error on second attempt raises
+    res.stb = 0x20
+    res.buffer = ["59500001000", "59500001000"]
+    with pytest.raises(DriverError):
+        d._write("V3.00X")
+    assert res.buffer == ["V3.00X", "U1X", "V3.00X", "U1X"]
@@ -57,3 +57,50 @@ def test_driver_k6514(res):
     res.buffer = ["1"]
     assert d.set_zero_check_enabled(True) is None
     assert res.buffer == [":SYST:ZCH 1", "*OPC?"]
+
+
+def test_driver_k6514_buffer(res):
+    d = K6514(res)
+
+    res.buffer = ["1", "1", "1", "1", "1", "1", "1", "1", "1", "1"]
+    assert d.prepare_buffer(100) is None
+    assert res.buffer == [
+        ":ABOR", "*OPC?",
+        ":FORM:ELEM READ,TIME", "*OPC?",
+        ":FORM:BORD NORM", "*OPC?",
+        ":FORM:DATA REAL,32", "*OPC?",
+        ":TRAC:CLE", "*OPC?",
+        ":TRAC:POIN 100", "*OPC?",
+        ":TRAC:FEED SENS", "*OPC?",
+        ":TRAC:FEED:CONT NEXT", "*OPC?",
+        ":SYST:TIME:RES", "*OPC?",
+        ":INIT:CONT ON", "*OPC?",
+    ]
+
+    res.buffer = ["0"]
+    assert d.fetch_buffer() == []
+    assert res.buffer == [":TRAC:POIN:ACT?"]
+
+    res.buffer = ["2", "1", "1", [0.5, 0.25, 0.75, 0.5], "1", "1", "1"]
+    assert d.fetch_buffer() == [(0.5, 0.25), (0.75, 0.5)]
+    assert res.buffer == [
+        ":TRAC:POIN:ACT?",
+        ":INIT:CONT OFF", "*OPC?",
+        ":ABOR", "*OPC?",
+        ":TRAC:DATA?",
+        ":TRAC:CLE", "*OPC?",
+        ":TRAC:FEED:CONT NEXT", "*OPC?",
+        ":INIT:CONT ON", "*OPC?",
+    ]
+
+
+def test_driver_k6514_initiate_fetch(res):
+    d = K6514(res)
+
+    res.buffer = ["1"]
+    assert d.initiate() is None
+    assert res.buffer == ["*CLS", "*OPC?", "*OPC", ":INIT"]
+
+    res.buffer = ["0", "1", "+4.200000E-09,+1.000000E+00"]
+    assert d.fetch() == 4.2e-09
+    assert res.buffer == ["*ESR?", "*ESR?", ":FETC?"]
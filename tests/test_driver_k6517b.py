@@ -81,3 +81,59 @@ def test_driver_k6517b(res):
     res.buffer = ["0"]
     assert d.compliance_tripped() is False
     assert res.buffer == [":SOUR:CURR:LIM?"]
+
+
+def test_driver_k6517b_buffer(res):
+    d = K6517B(res)
+
+    res.buffer = ["1", "1", "1", "1", "1", "1", "1", "1", "1", "1"]
+    assert d.prepare_buffer(100) is None
+    assert res.buffer == [
+        ":ABOR", "*OPC?",
+        ":FORM:ELEM READ,TST", "*OPC?",
+        ":FORM:BORD NORM", "*OPC?",
+        ":FORM:DATA REAL,64", "*OPC?",
+        ":TRAC:CLE", "*OPC?",
+        ":TRAC:POIN 100", "*OPC?",
+        ":TRAC:FEED SENS", "*OPC?",
+        ":TRAC:FEED:CONT NEXT", "*OPC?",
+        ":SYST:TST:REL:RES", "*OPC?",
+        ":INIT:CONT ON", "*OPC?",
+    ]
+
+    res.buffer = ["0"]
+    assert d.fetch_buffer() == []
+    assert res.buffer == [":TRAC:POIN:ACT?"]
+
+    res.buffer = ["2", [1e-12, 0.01, 2e-12, 0.02]]
+    assert d.fetch_buffer() == [(1e-12, 0.01), (2e-12, 0.02)]
+    assert res.buffer == [":TRAC:POIN:ACT?", ":TRAC:DATA:SEL? 0,2"]
+
+    # Read new readings only, buffer is not cleared while acquiring
+    res.buffer = ["2"]
+    assert d.fetch_buffer() == []
+    assert res.buffer == [":TRAC:POIN:ACT?"]
+
+    res.buffer = ["5", [3e-12, 0.03, 4e-12, 0.04, 5e-12, 0.05]]
+    assert d.fetch_buffer() == [(3e-12, 0.03), (4e-12, 0.04), (5e-12, 0.05)]
+    assert res.buffer == [":TRAC:POIN:ACT?", ":TRAC:DATA:SEL? 2,3"]
+
+    # Re-arm full buffer
+    d._buffer_points = 6
+    res.buffer = ["6", [6e-12, 0.06], "1", "1"]
+    assert d.fetch_buffer() == [(6e-12, 0.06)]
+    assert res.buffer == [":TRAC:POIN:ACT?", ":TRAC:DATA:SEL? 5,1", ":TRAC:CLE", "*OPC?", ":TRAC:FEED:CONT NEXT", "*OPC?"]
+
+    res.buffer = ["1", [7e-12, 0.07]]
+    assert d.fetch_buffer() == [(7e-12, 0.07)]
+    assert res.buffer == [":TRAC:POIN:ACT?", ":TRAC:DATA:SEL? 0,1"]
+
+    res.buffer = ["1", "1", "1", "1", "1"]
+    assert d.abort_buffer() is None
+    assert res.buffer == [
+        ":INIT:CONT OFF", "*OPC?",
+        ":ABOR", "*OPC?",
+        ":TRAC:FEED:CONT NEV", "*OPC?",
+        ":FORM:DATA ASC", "*OPC?",
+        ":FORM:ELEM READ", "*OPC?",
+    ]
@@ -91,3 +91,23 @@ def test_range():
     assert_range(0, 0, 5.0, [], 0)
     assert_range(0, 1, 5.0, [0, 1], 1)  # limited step
     assert_range(1, 0, 5.0, [1, 0], 1)  # limited step
+
+
+def test_adaptive_range():
+    r = functions.AdaptiveRange(0, 10, 2.5, 0.5, threshold=0.1)
+    values = []
+    for value in r:
+        values.append(value)
+        r.update(1e-9 if value < 5 else 1e-9 * (value - 4) ** 4)
+    assert values[:3] == [0, 2.5, 5]
+    assert values[-1] == 10
+    assert min(b - a for a, b in zip(values, values[1:])) == 0.5
+    assert r.points == values
+    assert len(r) == len(values) - 1
+
+    r = functions.AdaptiveRange(0, -10, 5, 1, limit=1e-6)
+    values = []
+    for value in r:
+        values.append(value)
+        r.update(1e-9, current=-1e-6)
+    assert values == [0, -1, -2, -3, -4, -5, -6, -7, -8, -9, -10]
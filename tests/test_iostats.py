@@ -0,0 +1,43 @@
+import math
+
+from diode_measurement import iostats
+
+
+def test_normalize_command():
+    assert iostats.normalize_command("*IDN?") == "*IDN?"
+    assert iostats.normalize_command(":SOUR:VOLT:LEV 1.000E+01") == ":SOUR:VOLT:LEV"
+    assert iostats.normalize_command(":SENS:CURR:PROT:LEV 2.000E-03\r\n") == ":SENS:CURR:PROT:LEV"
+    assert iostats.normalize_command("smua.source.levelv = -4.200E+01") == "smua.source.levelv"
+    assert iostats.normalize_command("print(smua.measure.i())") == "print(smua.measure.i())"
+    assert iostats.normalize_command("printbuffer(1, 10, smua.nvbuffer1.readings)") == "printbuffer(#, #, smua.nvbuffer1.readings)"
+    assert iostats.normalize_command("F1,0X") == "F1,#X"
+    assert iostats.normalize_command("") == ""
+
+
+def test_percentile():
+    assert math.isnan(iostats.percentile([], 50))
+    values = [float(value) for value in range(1, 101)]
+    assert iostats.percentile(values, 50) == 50.0
+    assert iostats.percentile(values, 95) == 95.0
+    assert iostats.percentile(values, 99) == 99.0
+    assert iostats.percentile([1.0], 99) == 1.0
+
+
+def test_io_statistics():
+    stats = iostats.IOStatistics()
+    stats.record("GPIB::16::INSTR", ":READ?", 0.1, 6, 32, 0)
+    stats.record("GPIB::16::INSTR", ":READ?", 0.3, 6, 32, 1)
+    stats.record("GPIB::16::INSTR", ":SOUR:VOLT:LEV 1.0", 0.01, 18, 0, 0)
+    snapshot = stats.snapshot()
+    summary = snapshot["GPIB::16::INSTR"][":READ?"]
+    assert summary["count"] == 2
+    assert summary["p50"] == 0.1
+    assert summary["p99"] == 0.3
+    assert summary["bytes_read"] == 64
+    assert summary["retries"] == 1
+    assert snapshot["GPIB::16::INSTR"][":SOUR:VOLT:LEV"]["bytes_written"] == 18
+    lines = stats.report()
+    assert lines[0] == "GPIB::16::INSTR: 0.410 s"
+    assert lines[1].startswith("  :READ?: n=2")
+    stats.clear()
+    assert stats.snapshot() == {}
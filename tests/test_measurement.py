@@ -0,0 +1,447 @@
+import concurrent.futures
+import contextlib
+import math
+import threading
+import time
+
+import pytest
+
+from diode_measurement.driver import Capability
+from diode_measurement.driver.e4980a import E4980A
+from diode_measurement.driver.k237 import K237
+from diode_measurement.driver.k2410 import K2410
+from diode_measurement.estimate import Estimate
+from diode_measurement.measurement import Measurement, RangeMeasurement
+from diode_measurement.measurement.cv import CVMeasurement
+from diode_measurement.profile import SweepProfile
+from diode_measurement.state import State
+
+from . import FakeResource
+
+
+class FakeSource:
+
+    capabilities = frozenset()
+
+    max_ramp_step = math.inf
+
+    def __init__(self):
+        self.levels = []
+        self.reads = []
+        self.sweeps = []
+        self.level = 0.0
+
+    def get_voltage_level(self):
+        self.reads.append(len(self.levels) - 1)
+        return self.level
+
+    def set_voltage_level(self, voltage):
+        self.levels.append(voltage)
+        self.level = voltage
+
+    def flush(self, wait=True):
+        ...
+
+    def measure_i(self):
+        return self.level
+
+    def compliance_tripped(self):
+        return False
+
+    def prepare_sweep(self, points, source_delay):
+        self.sweeps.append(list(points))
+        self.sweep_delay = source_delay
+
+    def fetch_sweep(self, abort=None):
+        return [(0.0, voltage, 0.0) for voltage in self.sweeps[-1]]
+
+
+class FakeInstrument:
+
+    capabilities = frozenset()
+
+    def __init__(self, name, log, delay=0.0, error=None):
+        self.name = name
+        self.log = log
+        self.delay = delay
+        self.error = error
+
+    def initiate(self):
+        self.log.append(("initiate", self.name))
+
+    def fetch(self):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.log.append(("fetch", self.name))
+        return self.name
+
+    def flush(self, wait=True):
+        ...
+
+
+class StepMeasurement(RangeMeasurement):
+
+    def __init__(self, state):
+        super().__init__(state)
+        self.source_instrument = FakeSource()
+        self.bias_source_instrument = None
+        self.readings = []
+
+    def apply_waiting_time(self):
+        ...
+
+    def acquire_sweep_reading(self, reading):
+        self.readings.append(reading)
+
+    def acquire_reading(self):
+        reading = {"voltage": self.source_voltage_level}
+        self.readings.append(reading)
+        return reading
+
+    def check_current_compliance(self):
+        ...
+
+    def update_current_compliance(self):
+        ...
+
+
+@pytest.fixture
+def state():
+    state = State()
+    state.update({"ramp_slew_rate": 0.0, "ramp_max_step": 5.0})
+    return state
+
+
+def test_measure_steps_ramps_between_profile_points(state):
+    state.update({"sweep_profile": "file"})
+    m = StepMeasurement(state)
+    ramp = SweepProfile([0.0, -20.0, -22.0], "file:test.txt")
+    m.measure_steps(ramp, Estimate(len(ramp)))
+    assert m.source_instrument.levels == [0.0, -5.0, -10.0, -15.0, -20.0, -22.0]
+    assert [reading["voltage"] for reading in m.readings] == [0.0, -20.0, -22.0]
+
+
+def test_measure_steps_linear_profile(state):
+    state.update({"sweep_profile": "linear", "voltage_step": 10.0})
+    m = StepMeasurement(state)
+    ramp = SweepProfile.linear(0.0, -20.0, 10.0)
+    m.measure_steps(ramp, Estimate(len(ramp)))
+    assert m.source_instrument.levels == [0.0, -10.0, -20.0]
+    assert [reading["voltage"] for reading in m.readings] == [0.0, -10.0, -20.0]
+
+
+def test_measure_sweep_chunks_by_time(state):
+    state.update({"waiting_time": 0.23})
+    m = StepMeasurement(state)
+    ramp = SweepProfile.linear(0.0, -10.0, 1.0)
+    m.measure_sweep(ramp, Estimate(len(ramp)))
+    # About one second per sweep
+    assert m.source_instrument.sweeps == [ramp[0:4], ramp[4:8], ramp[8:11]]
+    assert [reading["voltage"] for reading in m.readings] == list(ramp)
+
+
+def test_measure_sweep_stop_request(state):
+    state.update({"waiting_time": 0.23})
+    m = StepMeasurement(state)
+    m.source_instrument.fetch_sweep = lambda abort: state.update({"stop_requested": True}) or []
+    ramp = SweepProfile.linear(0.0, -10.0, 1.0)
+    m.measure_sweep(ramp, Estimate(len(ramp)))
+    assert m.source_instrument.sweeps == [ramp[0:4]]
+    assert m.state.get("source_voltage") is None
+
+
+def test_measure_sweep_short_chunks(state):
+    state.update({"waiting_time": 1.0, "sample_count": 1})
+    m = StepMeasurement(state)
+    m.is_hardware_sweep = lambda: True
+    m.create_ramp = lambda: SweepProfile.linear(0.0, -2.0, 1.0)
+    assert m.get_sweep_chunk_size() == 0
+    m.measure()
+    # Single point sweeps fall back to steps
+    assert m.source_instrument.sweeps == []
+    assert m.source_instrument.levels == [0.0, -1.0, -2.0]
+
+
+def test_cv_sweep_chunk_size(state):
+    state.update({"waiting_time": 1.0})
+    m = CVMeasurement(state)
+    m.instruments["lcr"] = E4980A(FakeResource())
+    # List sweeps are not split by time
+    assert m.get_sweep_chunk_size() == 201
+
+
+def test_is_verify_step(state):
+    m = StepMeasurement(state)
+    state.update({"source_verify_interval": 0})
+    assert [step for step in range(7) if m.is_verify_step(step, step == 6)] == [0, 6]
+    state.update({"source_verify_interval": 3})
+    assert [step for step in range(8) if m.is_verify_step(step, step == 7)] == [0, 3, 6, 7]
+    assert [step for step in range(2) if m.is_verify_step(step, step == 1)] == [0, 1]
+
+
+def test_measure_steps_verify_source_levels(state):
+    state.update({"sweep_profile": "file", "source_verify_interval": 2})
+    m = StepMeasurement(state)
+    # End voltage is passed before the last step
+    ramp = SweepProfile([0.0, -2.0, -1.0, -3.0, -4.0, -2.0], "file:test.txt")
+    m.measure_steps(ramp, Estimate(len(ramp)))
+    assert m.source_instrument.reads == [0, 2, 4, 5]
+
+
+def test_source_voltage_level_cache(state):
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    smu.level = -1.0
+    # Read back if not known
+    assert m.get_source_voltage() == -1.0
+    assert smu.reads == [-1]
+    # Commanded level is returned without read back
+    m.set_source_voltage(-5.0)
+    assert m.get_source_voltage() == -5.0
+    assert smu.reads == [-1]
+    # Verification replaces commanded level by read back level
+    smu.level = -4.9
+    m.verify_source_levels()
+    assert m.get_source_voltage() == -4.9
+    assert smu.reads == [-1, 0]
+    # Level after hardware sweeps is read back on demand
+    state.update({"waiting_time": 0.0})
+    m.measure_sweep(SweepProfile.linear(-5.0, -7.0, 1.0), Estimate(3))
+    assert m.source_voltage_level is None
+    assert m.get_source_voltage() == smu.level
+    assert smu.reads == [-1, 0, 0]
+
+
+def test_queue_readings(state):
+    m = StepMeasurement(state)
+    # Not attached queues are ignored
+    m.queue_readings("it", [{"voltage": 0.0}])
+    queue, lock = [], threading.RLock()
+    m.attach_reading_queue("it", queue, lock)
+    m.queue_readings("it", [{"voltage": 0.0}, {"voltage": -1.0}])
+    m.queue_readings("iv", [{"voltage": -2.0}])
+    assert queue == [{"voltage": 0.0}, {"voltage": -1.0}]
+
+
+def test_measure_instruments_concurrent(state):
+    log = []
+    m = Measurement(state)
+    m.instruments.update({
+        "smu": FakeInstrument("smu", log, delay=0.01),
+        "elm": FakeInstrument("elm", log, delay=0.05),
+        "dmm": FakeInstrument("dmm", log),
+    })
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as m.executor:
+        t0 = time.time()
+        results, timestamps = m.measure_instruments(["smu", "elm", "dmm", "lcr"])
+        t1 = time.time()
+    # Results keep order of keys, missing instruments are ignored
+    assert list(results.items()) == [("smu", "smu"), ("elm", "elm"), ("dmm", "dmm")]
+    assert list(timestamps) == ["smu", "elm", "dmm"]
+    for name in results:
+        assert log.index(("initiate", name)) < log.index(("fetch", name))
+    # Timestamps are taken when each reading is fetched
+    assert t0 <= timestamps["dmm"] < timestamps["smu"] < timestamps["elm"] <= t1
+
+
+def test_measure_instruments_concurrent_error(state):
+    log = []
+    m = Measurement(state)
+    m.instruments.update({
+        "smu": FakeInstrument("smu", log, error=RuntimeError("smu failed")),
+        "elm": FakeInstrument("elm", log, delay=0.05),
+    })
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as m.executor:
+        with pytest.raises(RuntimeError, match="smu failed"):
+            m.measure_instruments(["smu", "elm"])
+        # Pending readings completed before raising
+        assert ("fetch", "elm") in log
+
+
+class FakeDriver(FakeInstrument):
+
+    def __init__(self, resource):
+        super().__init__("smu", resource)
+
+
+class FailingMeasurement(Measurement):
+
+    def measure(self):
+        self.used_executor = self.executor
+
+    def finalize(self):
+        raise RuntimeError("finalize failed")
+
+
+def test_measurement_run_shutdown_executor(state):
+    state.update({"concurrent_readings": True})
+    m = FailingMeasurement(state)
+    m._instruments["smu"] = FakeDriver, contextlib.nullcontext([])
+    errors = []
+    m.failed_event.subscribe(errors.append)
+    m.run()
+    assert [str(exc) for exc in errors] == ["finalize failed"]
+    assert m.executor is None
+    with pytest.raises(RuntimeError):
+        m.used_executor.submit(time.sleep, 0)
+
+
+class ClosingResource(FakeResource):
+
+    def __init__(self):
+        super().__init__()
+        self.closed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self, discard=False):
+        self.closed.append(discard)
+
+
+class MeasureFailingMeasurement(Measurement):
+
+    def measure(self):
+        raise RuntimeError("measure failed")
+
+
+def test_measurement_run_discard_sessions(state):
+    m = MeasureFailingMeasurement(state)
+    resource = ClosingResource()
+    m._instruments["smu"] = FakeDriver, resource
+    errors = []
+    m.failed_event.subscribe(errors.append)
+    m.run()
+    assert [str(exc) for exc in errors] == ["measure failed"]
+    # Session closed after the failure, not released to the pool
+    assert resource.closed[0] is True
+
+    m = Measurement(state)
+    resource = ClosingResource()
+    m._instruments["smu"] = FakeDriver, resource
+    m.run()
+    assert resource.closed == [False]
+
+
+def test_acquisition_plan_current_only(state):
+    m = Measurement(state)
+    smu_res, smu2_res = FakeResource(), FakeResource()
+    m.instruments.update({"smu": K2410(smu_res), "smu2": K237(smu2_res)})
+    m.instruments["smu2"].WRITE_DELAY = 0
+    plan = m.acquisition_plan(["smu", "smu2", "elm"])
+    assert list(plan.instruments) == ["smu", "smu2"]
+    assert plan.current_keys == ["smu2"]
+    assert m.acquisition_plan(["smu", "smu2", "elm"]) is plan
+    smu_res.buffer = ["1", "+4.200000E+01,+4.210000E-03,+0.000000E+00"]
+    smu2_res.buffer = ["+4.210000E-03"]
+    results, _ = m.measure_instruments(["smu", "smu2", "elm"])
+    assert results["smu"] == (0.00421, 42.0)
+    assert results["smu2"][0] == 0.00421
+    assert math.isnan(results["smu2"][1])
+    # K237 voltage is not queried
+    assert smu2_res.buffer == ["G4,2,0X", "X"]
+
+
+def test_settling_reader(state):
+    state.update({"settling_mode": "tolerance", "settling_tolerance": 0.01, "settling_count": 3})
+    m = StepMeasurement(state)
+    values = [2.0, 1.2, 1.01, 1.0, 1.0, 1.0]
+    elm = FakeInstrument("elm", [])
+    elm.measure_i = lambda: values.pop(0)
+    m.instruments["elm"] = elm
+    m.apply_settling_time(1.0)
+    # Settled after five readings
+    assert values == [1.0]
+    assert m.settling_time < 1.0
+    # Selected once per run
+    del m.instruments["elm"]
+    assert m.get_settling_reader() == elm.measure_i
+    m.settling_reader = None
+    assert m.get_settling_reader() == m.source_instrument.measure_i
+
+
+def ramp_waits(m):
+    waits = []
+
+    def ramp_wait(seconds, interruptible):
+        waits.append((round(seconds, 6), interruptible))
+        return True
+
+    m.ramp_wait = ramp_wait
+    return waits
+
+
+def test_apply_ramp_slew_rate(state):
+    state.update({"ramp_slew_rate": 100.0})
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    waits = ramp_waits(m)
+    m.apply_ramp(smu, 0.0, -12.0, smu.set_voltage_level, "Ramp")
+    assert smu.levels == [-5.0, -10.0, -12.0]
+    # Dwell follows the step size
+    assert waits == [(0.05, True), (0.05, True), (0.02, True)]
+
+
+def test_apply_ramp_instrument_max_step(state):
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    smu.max_ramp_step = 2.0
+    m.apply_ramp(smu, -1.0, -7.0, smu.set_voltage_level, "Ramp")
+    assert smu.levels == [-3.0, -5.0, -7.0]
+    assert m.ramp_max_step(smu) == 2.0
+    state.update({"ramp_max_step": 1.0})
+    assert m.ramp_max_step(smu) == 1.0
+    assert m.ramp_max_step(E4980A(FakeResource())) == 1.0
+
+
+def test_apply_ramp_stop_request(state):
+    state.update({"stop_requested": True})
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    waits = ramp_waits(m)
+    m.apply_ramp(smu, 0.0, -10.0, smu.set_voltage_level, "Ramp")
+    assert smu.levels == []
+    # Ramps to zero are not interrupted
+    m.apply_ramp(smu, -10.0, 0.0, smu.set_voltage_level, "Ramp", interruptible=False)
+    assert smu.levels == [-5.0, 0.0]
+    assert waits == [(0.0, False), (0.0, False)]
+
+
+def test_apply_ramp_interrupted_wait(state):
+    state.update({"ramp_slew_rate": 1.0})
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    smu.set_voltage_level = lambda voltage: state.update({"stop_requested": True}) or smu.levels.append(voltage)
+    start = time.monotonic()
+    m.apply_ramp(smu, 0.0, -10.0, smu.set_voltage_level, "Ramp")
+    # Five seconds dwell interrupted by stop request
+    assert time.monotonic() - start < 1.0
+    assert smu.levels == [-5.0]
+
+
+def test_apply_ramp_hardware_sweep(state):
+    state.update({"ramp_slew_rate": 10.0, "ramp_hardware_sweep": True})
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    smu.capabilities = frozenset({Capability.HARDWARE_SWEEP})
+    m.apply_ramp(smu, 0.0, -30.0, smu.set_voltage_level, "Ramp")
+    # Sweeps of about one second, output holding last level of every sweep
+    assert smu.sweeps == [[-5.0, -10.0], [-15.0, -20.0], [-25.0, -30.0]]
+    assert smu.sweep_delay == 0.5
+    assert smu.levels == [-10.0, -20.0, -30.0]
+
+
+def test_apply_ramp_hardware_sweep_stop_request(state):
+    state.update({"ramp_slew_rate": 10.0, "ramp_hardware_sweep": True})
+    m = StepMeasurement(state)
+    smu = m.source_instrument
+    smu.capabilities = frozenset({Capability.HARDWARE_SWEEP})
+    smu.fetch_sweep = lambda: state.update({"stop_requested": True})
+    m.apply_ramp(smu, 0.0, -30.0, smu.set_voltage_level, "Ramp")
+    assert smu.sweeps == [[-5.0, -10.0]]
+    assert smu.levels == [-10.0]
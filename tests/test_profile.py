@@ -0,0 +1,49 @@
+import pytest
+
+from diode_measurement.profile import SweepProfile
+
+
+def test_profile_linear():
+    p = SweepProfile.linear(0, -10, 2.5)
+    assert list(p) == [0, -2.5, -5, -7.5, -10]
+    assert len(p) == 5
+    assert p[1] == -2.5
+    assert p[-1] == -10
+    assert p[1:3] == [-2.5, -5]
+    assert p.begin == 0
+    assert p.end == -10
+    assert p.extent == 10
+    assert p.max_step == 2.5
+    assert SweepProfile([0, -20, -15]).max_step == 20
+    assert len(SweepProfile.linear(0, 0, 1)) == 0
+
+
+def test_profile_logarithmic():
+    assert list(SweepProfile.logarithmic(1, 1000, 4)) == [1, 10, 100, 1000]
+    assert list(SweepProfile.logarithmic(0, -1000, 4)) == [0, -1, -10, -100, -1000]
+    assert list(SweepProfile.logarithmic(-1000, 0, 4)) == [-1000, -100, -10, -1, 0]
+    assert list(SweepProfile.logarithmic(0, -100, 3, 10)) == [0, -10, -31.6227766017, -100]
+    with pytest.raises(ValueError):
+        SweepProfile.logarithmic(-10, 10, 4)
+
+
+def test_profile_bidirectional():
+    p = SweepProfile.linear(0, -2, 1).bidirectional()
+    assert list(p) == [0, -1, -2, -1, 0]
+    assert p.name == "bidirectional linear"
+
+
+def test_profile_segments():
+    p = SweepProfile.segments([(0, -10, 5), (-10, -12, 1), (-12, 0, 6)])
+    assert list(p) == [0, -5, -10, -11, -12, -6, 0]
+
+
+def test_profile_from_file(tmp_path):
+    filename = tmp_path / "profile.txt"
+    filename.write_text("# hysteresis\n0\n-5, -10, 2.5\n-10\n\n-4 # return\n0\n")
+    p = SweepProfile.from_file(str(filename))
+    assert list(p) == [0, -5, -7.5, -10, -4, 0]
+    assert p.name == "file:profile.txt"
+    filename.write_text("0, 1\n")
+    with pytest.raises(ValueError):
+        SweepProfile.from_file(str(filename))
@@ -1,4 +1,10 @@
-from diode_measurement.resource import Resource
+import struct
+
+import pytest
+import pyvisa
+from pyvisa.constants import StatusCode
+
+from diode_measurement.resource import AutoReconnectResource, Resource, ResourcePool, parse_binary_block, resource_pool
 
 
 def test_resource():
@@ -22,3 +28,275 @@ def test_resource_options():
         "timeout": 2000,
         "foo": 42,
     }
+
+
+class FakeVisaResource:
+
+    def __init__(self, responses, srq=True):
+        self.responses = list(responses)
+        self.srq = srq
+        self.buffer = []
+        self.events_enabled = False
+        self.events = []
+
+    def write(self, message):
+        self.buffer.append(message)
+        if message == "*OPC":
+            self.complete()
+
+    def query(self, message):
+        self.buffer.append(message)
+        return self.responses.pop(0)
+
+    def complete(self):
+        # Service request events are queued only while enabled
+        if self.events_enabled:
+            self.events.append("SRQ")
+
+    def enable_event(self, event_type, mechanism):
+        if not self.srq:
+            raise NotImplementedError()
+        self.events_enabled = True
+
+    def wait_on_event(self, event_type, timeout):
+        if not self.events:
+            raise pyvisa.VisaIOError(StatusCode.error_timeout)
+        self.buffer.append(self.events.pop(0))
+
+    def read_stb(self):
+        return 0x60
+
+    def disable_event(self, event_type, mechanism):
+        self.events_enabled = False
+
+    def discard_events(self, event_type, mechanism):
+        self.events.clear()
+
+
+def test_resource_wait_for_opc():
+    res = Resource("GPIB::8::INSTR", "")
+    res._resource = FakeVisaResource(["0", "0", "1"])
+    assert res.wait_for_opc(1.0) is True
+    assert res._resource.buffer == ["*ESR?", "*ESR?", "*ESR?"]
+
+    res._resource = FakeVisaResource(["0"])
+    assert res.wait_for_opc(0.0) is False
+    assert res._resource.buffer == ["*ESR?"]
+
+    # Abort between polls
+    res._resource = FakeVisaResource(["0", "1"])
+    assert res.wait_for_opc(10.0, abort=lambda: True) is False
+    assert res._resource.buffer == ["*ESR?"]
+
+
+def test_resource_wait_for_opc_srq():
+    res = Resource("GPIB::8::INSTR", "")
+    res.srq_enabled = True
+    res._resource = FakeVisaResource(["1", "1", "1"])
+    # Operation completes before waiting begins
+    res.prepare_opc()
+    res.write("*OPC")
+    assert res.wait_for_opc(1.0) is True
+    assert res._resource.buffer == ["*ESE 1", "*SRE 32", "*OPC", "SRQ", "*ESR?"]
+    assert res.srq_enabled is True
+
+    # Enable registers are written once per session
+    res._resource.buffer.clear()
+    res.prepare_opc()
+    res.write("*OPC")
+    assert res.wait_for_opc(1.0) is True
+    assert res._resource.buffer == ["*OPC", "SRQ", "*ESR?"]
+
+    # Polling if not armed before writing *OPC
+    res._resource.buffer.clear()
+    assert res.wait_for_opc(1.0) is True
+    assert res._resource.buffer == ["*ESR?"]
+    assert res.srq_enabled is True
+
+    res._resource = FakeVisaResource(["0", "1"], srq=False)
+    res.prepare_opc()
+    assert res.wait_for_opc(1.0) is True
+    assert res._resource.buffer == ["*ESE 1", "*SRE 32", "*ESR?", "*ESR?"]
+    assert res.srq_enabled is False
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.closed = False
+        self.timeout = 2000
+        self.polls = []
+        self.stb_error = None
+
+    @property
+    def session(self):
+        if self.closed:
+            raise RuntimeError("invalid session")
+        return 1
+
+    def read_stb(self):
+        self.polls.append(self.timeout)
+        if self.stb_error:
+            raise self.stb_error
+        return 0
+
+    def close(self):
+        self.closed = True
+
+
+class FakeResourceManager:
+
+    def __init__(self):
+        self.opened = []
+
+    def open_resource(self, resource_name, **options):
+        session = FakeSession()
+        self.opened.append(session)
+        return session
+
+
+def test_resource_pool():
+    pool = ResourcePool()
+    rm = FakeResourceManager()
+    pool._managers["@fake"] = rm
+    options = {"timeout": 2000}
+
+    # Pooling disabled
+    a = pool.acquire("GPIB::8::INSTR", "@fake", options)
+    pool.release("GPIB::8::INSTR", "@fake", options, a)
+    assert a.closed
+    b = pool.acquire("GPIB::8::INSTR", "@fake", options)
+    assert b is not a
+
+    # Reuse idle session with identical options only
+    pool.idle_timeout = 60.0
+    pool.release("GPIB::8::INSTR", "@fake", options, b)
+    assert not b.closed
+    assert pool.acquire("GPIB::8::INSTR", "@fake", {"timeout": 4000}) is not b
+    assert pool.acquire("GPIB::8::INSTR", "@fake", options) is b
+
+    # Idle sessions are probed by serial poll using a short timeout
+    assert b.polls == [500]
+    assert b.timeout == 2000
+
+    # Replace dead sessions
+    pool.release("GPIB::8::INSTR", "@fake", options, b)
+    b.closed = True
+    c = pool.acquire("GPIB::8::INSTR", "@fake", options)
+    assert c is not b
+
+    # Replace sessions of instruments not responding
+    pool.release("GPIB::8::INSTR", "@fake", options, c)
+    c.stb_error = pyvisa.VisaIOError(StatusCode.error_timeout)
+    d = pool.acquire("GPIB::8::INSTR", "@fake", options)
+    assert d is not c
+    assert c.closed
+    assert c.timeout == 2000
+
+    # Sessions not supporting serial polls
+    pool.release("GPIB::8::INSTR", "@fake", options, d)
+    d.stb_error = pyvisa.VisaIOError(StatusCode.error_nonsupported_operation)
+    assert pool.acquire("GPIB::8::INSTR", "@fake", options) is d
+    c = d
+
+    # Evict idle sessions
+    pool.release("GPIB::8::INSTR", "@fake", options, c)
+    pool.idle_timeout = 0.0
+    pool.evict_idle()
+    assert c.closed
+    assert len(rm.opened) == 5
+
+
+def test_resource_io_hooks():
+    records = []
+    res = Resource("GPIB::8::INSTR", "")
+    res.io_hooks.append(lambda *args: records.append(args))
+    res._resource = FakeVisaResource(["1"])
+    assert res.query("*OPC?") == "1"
+    res.write(":SOUR:VOLT:LEV 1.0")
+    assert [record[:2] for record in records] == [("GPIB::8::INSTR", "*OPC?"), ("GPIB::8::INSTR", ":SOUR:VOLT:LEV 1.0")]
+    assert [record[3:] for record in records] == [(5, 1, 0), (18, 0, 0)]
+
+
+def test_parse_binary_block():
+    block = b"#216" + struct.pack(">2d", 1.0, 2.0) + b"\n"
+    assert list(parse_binary_block(block, "d", True)) == [1.0, 2.0]
+    block = b"#0" + struct.pack("<2f", 0.5, 0.25) + b"\n"
+    assert list(parse_binary_block(block, "f", False)) == [0.5, 0.25]
+    block = b"#0" + struct.pack(">3d", 1.0, 2.0, 3.0) + b"\r\n"
+    assert list(parse_binary_block(block, "d", True)) == [1.0, 2.0, 3.0]
+
+
+class BinaryVisaResource:
+
+    read_termination = "\n"
+
+    def __init__(self, block):
+        self.block = block
+        self.buffer = []
+
+    def write(self, message):
+        self.buffer.append(message)
+
+    def read_raw(self):
+        # Stops at termination characters within data unless disabled
+        self.buffer.append(self.read_termination)
+        if self.read_termination:
+            return self.block[:self.block.index(self.read_termination.encode()) + 1]
+        return self.block
+
+
+def test_resource_query_binary_values_indefinite():
+    # Second value contains a line feed byte
+    values = [1.0, struct.unpack(">d", b"\x3f\xf0\x0a\x00\x00\x00\x00\x00")[0], 3.0]
+    data = struct.pack(">3d", *values)
+    res = Resource("GPIB::8::INSTR", "")
+    res._resource = BinaryVisaResource(b"#0" + data + b"\n")
+    assert list(res.query_binary_values(":TRAC:DATA?", "d", True)) == values
+    assert res._resource.buffer == [":TRAC:DATA?", None]
+    assert res._resource.read_termination == "\n"
+
+
+class FlakyVisaResource(FakeVisaResource):
+
+    def __init__(self, responses, failures):
+        super().__init__(responses)
+        self.failures = failures
+
+    def query(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+        return super().query(message)
+
+    def close(self):
+        ...
+
+
+def test_auto_reconnect_resource(monkeypatch):
+    sessions = [FlakyVisaResource(["1"], 2)]
+    replayed = []
+    res = AutoReconnectResource("TCPIP::localhost:8080::SOCKET", "")
+    res.retry_delay = 0.0
+    res.reconnect_hooks.append(lambda: replayed.append(res.write(":FORM:ELEM READ")))
+    monkeypatch.setattr(resource_pool, "acquire", lambda *args: sessions[0])
+    res._resource = sessions[0]
+    assert res.query("*IDN?") == "1"
+    assert res.reconnects == 2
+    assert len(replayed) == 2
+    assert sessions[0].buffer == [":FORM:ELEM READ", ":FORM:ELEM READ", "*IDN?"]
+
+    # Retry budget exceeded
+    res._resource = FlakyVisaResource([], 1)
+    res.retry_delay = 1.0
+    res.retry_budget = 0.1
+    with pytest.raises(ConnectionError):
+        res.query("*IDN?")
+    assert res.reconnects == 2
+
+
+def test_auto_reconnect_resource_backoff():
+    res = AutoReconnectResource("TCPIP::localhost:8080::SOCKET", "")
+    assert 0.25 <= res.backoff_delay(1) <= 0.5
+    assert 1.0 <= res.backoff_delay(3) <= 2.0
+    assert 4.0 <= res.backoff_delay(10) <= 8.0
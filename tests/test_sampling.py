@@ -0,0 +1,40 @@
+import math
+
+import pytest
+
+from diode_measurement.sampling import reduce_samples, sigma_clip, trimmed_mean
+
+
+def test_sigma_clip():
+    assert sigma_clip([1.0, 1.1, 0.9, 1.0, 9.0], 2.0) == [1.0, 1.1, 0.9, 1.0]
+    assert sigma_clip([1.0, 1.0, 1.0], 2.0) == [1.0, 1.0, 1.0]
+    assert sigma_clip([1.0, 9.0], 1.0) == [1.0, 9.0]
+    # Outlier does not inflate the deviation estimate
+    assert sigma_clip([1.0, 1.0, 1.01, 0.99, 1000.0], 3.0) == [1.0, 1.0, 1.01, 0.99]
+    assert sigma_clip([1.0, 1.0, 1.0, 1.0, 50.0], 1.5) == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_trimmed_mean():
+    assert trimmed_mean([1.0, 2.0, 3.0, 4.0, 100.0], 0.2) == 3.0
+    assert trimmed_mean([1.0, 2.0, 3.0], 0.1) == 2.0
+    assert trimmed_mean([1.0, 2.0, 3.0, 4.0], 0.4) == 2.5
+    assert trimmed_mean([1.0, 2.0], 0.4) == 1.5
+    assert trimmed_mean([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 100.0], 0.2) == 5.5
+
+
+def test_reduce_samples():
+    assert reduce_samples([1.0, 3.0, 2.0]) == (2.0, 1.0)
+    assert reduce_samples([1.0, 3.0, 2.0], "mean") == (2.0, 1.0)
+    value, deviation = reduce_samples([1.0, 1.0, 1.0, 1.0, 50.0], "mean", sigma=1.5)
+    assert value == 1.0
+    assert deviation == 0.0
+    value, deviation = reduce_samples([2.0, math.nan])
+    assert value == 2.0
+    assert math.isnan(deviation)
+    value, deviation = reduce_samples([math.nan])
+    assert math.isnan(value)
+    assert math.isnan(deviation)
+    assert reduce_samples([1.0, 1.0, 1.0, 1.0, 1000.0], "trimmed_mean")[0] == 1.0
+    assert reduce_samples([1.0, 2.0, 3.0, 4.0, 100.0], "trimmed_mean", proportion=0.0)[0] == 3.0
+    with pytest.raises(ValueError):
+        reduce_samples([1.0], "mode")
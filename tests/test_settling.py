@@ -0,0 +1,31 @@
+import pytest
+
+from diode_measurement.settling import Settling
+
+
+def test_settling_tolerance():
+    s = Settling("tolerance", 0.01, 3)
+    assert s.append(1.0, 0.0) is False
+    assert s.append(1.0, 0.1) is False
+    assert s.append(1.0, 0.2) is True
+    s.reset()
+    assert s.append(1.0, 0.3) is False
+    values = [-2e-9, -1.5e-9, -1.02e-9, -1.01e-9, -1.01e-9]
+    assert [s.append(value, t) for t, value in enumerate(values)] == [False, False, False, False, True]
+
+
+def test_settling_slope():
+    s = Settling("slope", 0.01, 4)
+    values = [1.0, 0.9, 0.85, 0.84, 0.838, 0.837, 0.8368]
+    result = [s.append(value, t * 0.5) for t, value in enumerate(values)]
+    assert result == [False, False, False, False, False, True, True]
+
+
+def test_settling_invalid():
+    s = Settling("tolerance", 0.01, 2)
+    assert s.append(1.0, 0.0) is False
+    assert s.append(float("nan"), 0.1) is False
+    assert s.append(1.0, 0.2) is False
+    assert s.append(1.0, 0.3) is True
+    with pytest.raises(ValueError):
+        Settling("off", 0.01, 2)
@@ -0,0 +1,219 @@
+import math
+import time
+
+import pytest
+
+from diode_measurement.driver import driver_factory
+from diode_measurement.measurement.cv import CVMeasurement
+from diode_measurement.measurement.iv import IVMeasurement
+from diode_measurement.resource import Resource
+from diode_measurement.simulation import DdcInstrument, SimulatedInstrument, is_simulated, simulated_diode
+from diode_measurement.state import State
+
+
+@pytest.fixture(autouse=True)
+def instant(monkeypatch):
+    monkeypatch.setattr(SimulatedInstrument, "time_scale", 0.0)
+
+
+def test_is_simulated():
+    assert is_simulated("SIM::K2410::1")
+    assert is_simulated("sim::E4980A")
+    assert not is_simulated("GPIB0::16::INSTR")
+
+
+def test_simulated_diode():
+    diode = simulated_diode("test")
+    diode.noise = 0.0
+    assert diode.current(-200.0) == pytest.approx(-(diode.saturation_current + diode.leakage_current))
+    assert diode.current(0.5) > 0
+    assert diode.capacitance(-10.0) > diode.capacitance(-100.0) == pytest.approx(diode.end_capacitance)
+
+
+def test_ddc_parse():
+    assert DdcInstrument.parse("B4.200E+01,,X") == [("B", "4.200E+01,,"), ("X", "")]
+    assert DdcInstrument.parse("F0,0XG1,2,0X") == [("F", "0,0"), ("X", ""), ("G", "1,2,0"), ("X", "")]
+
+
+def test_simulation_k2410():
+    with Resource("SIM::K2410::test_k2410", "") as res:
+        smu = driver_factory("K2410")(res)
+        smu.reset()
+        smu.configure({})
+        smu.set_current_compliance_level(1e-3)
+        smu.set_output_enabled(True)
+        smu.set_voltage_level(-100.0)
+        assert smu.get_output_enabled() is True
+        assert smu.get_voltage_level() == -100.0
+        i, v = smu.measure_iv()
+        assert v == -100.0
+        assert i < 0
+        assert smu.compliance_tripped() is False
+        smu.prepare_sweep([-1.0, -2.0], 0.1)
+        readings = smu.fetch_sweep()
+        assert [v for _, v, _ in readings] == [-1.0, -2.0]
+        assert smu.next_error() == (0, "No error")
+
+
+def test_simulation_shared_bench():
+    with Resource("SIM::K2657A::test_bench", "") as smu_res, Resource("SIM::K6514::test_bench", "") as elm_res:
+        smu = driver_factory("K2657A")(smu_res)
+        elm = driver_factory("K6514")(elm_res)
+        smu.configure({})
+        elm.configure({})
+        elm.set_zero_check_enabled(False)
+        smu.set_output_enabled(True)
+        smu.set_voltage_level(-50.0)
+        assert elm.measure_i() < -1e-9
+        smu.set_output_enabled(False)
+        assert abs(elm.measure_i()) < 1e-9
+
+
+def test_simulation_k6517b_buffer():
+    with Resource("SIM::K6517B::test_k6517b", "") as res:
+        elm = driver_factory("K6517B")(res)
+        elm.configure({})
+        elm.prepare_buffer(1000)
+        readings = []
+        for _ in range(4):
+            time.sleep(0.010)
+            readings.extend(elm.fetch_buffer())
+        elm.abort_buffer()
+        # No readings are dropped between fetches
+        timestamps = [t for _, t in readings]
+        assert len(timestamps) > 4
+        assert all(b - a == pytest.approx(1e-3) for a, b in zip(timestamps, timestamps[1:]))
+
+
+def test_simulation_k2700_scan():
+    with Resource("SIM::K2700::test_k2700", "") as res:
+        dmm = driver_factory("K2700")(res)
+        dmm.configure({"scan.channels": "101:103", "temperature.interval": 0.0})
+        assert len(dmm.measure_temperatures()) == 3
+        dmm.configure({"temperature.interval": 0.0})
+        assert len(dmm.measure_temperatures()) == 1
+        assert dmm.channel_temperatures() == {}
+
+
+def test_simulation_e4980a_list_sweep():
+    with Resource("SIM::E4980A::test_e4980a", "") as res:
+        lcr = driver_factory("E4980A")(res)
+        lcr.configure({})
+        lcr.set_output_enabled(True)
+        lcr.prepare_list_sweep([-1.0, -5.0, -10.0], 0.0)
+        readings = lcr.fetch_list_sweep()
+        assert len(readings) == 3
+        assert readings[0][0] > readings[2][0]
+        assert lcr.get_voltage_level() == -10.0
+
+
+def test_simulation_k595():
+    with Resource("SIM::K595::test_k595", "") as res:
+        lcr = driver_factory("K595")(res)
+        lcr.WRITE_DELAY = 0
+        assert lcr.identity() == "595"
+        lcr.set_voltage_level(-5.0)
+        assert lcr.get_voltage_level() == -5.0
+        c, _ = lcr.measure_impedance()
+        assert c > 0
+        assert lcr.next_error() == (0, "No Error")
+
+
+def test_simulation_unknown_model():
+    with pytest.raises(Exception):
+        with Resource("SIM::K9999::1", ""):
+            ...
+    assert math.isfinite(simulated_diode().current())
+
+
+def simulated_role(model, bench, enabled=True):
+    return {
+        "resource_name": f"SIM::{model}::{bench}",
+        "visa_library": "",
+        "model": model,
+        "termination": "\r\n",
+        "timeout": 4.0,
+        "options": {},
+        "enabled": enabled,
+    }
+
+
+def simulated_state(bench, source_role, **roles):
+    state = State()
+    state.update({
+        "voltage_begin": 0.0,
+        "voltage_end": -20.0,
+        "voltage_step": 5.0,
+        "waiting_time": 0.0,
+        "settle_waiting_time": 0.0,
+        "ramp_slew_rate": 0.0,
+        "current_compliance": 1e-6,
+        "source_role": source_role,
+        "roles": {
+            name: simulated_role(model, bench, name in roles)
+            for name, model in dict({
+                "smu": "K2410",
+                "smu2": "K2410",
+                "elm": "K6514",
+                "elm2": "K6514",
+                "lcr": "E4980A",
+                "dmm": "K2700",
+                "switch": "BrandBox",
+            }, **roles).items()
+        },
+    })
+    return state
+
+
+def run_measurement(measurement, roles):
+    errors = []
+    measurement.failed_event.subscribe(errors.append)
+    for name in roles:
+        measurement.register_instrument(name)
+    measurement.run()
+    assert errors == []
+
+
+@pytest.mark.parametrize("roles, hardware_sweep", [
+    ({"smu": "K2410", "elm": "K6514", "dmm": "K2700"}, False),
+    ({"smu": "K2410"}, False),
+    ({"smu": "K2410"}, True),
+    ({"smu": "K2657A", "elm": "K6517B"}, False),
+])
+def test_simulation_iv_run(roles, hardware_sweep):
+    bench = "test_iv_run_" + "_".join(roles.values()) + ("_sweep" if hardware_sweep else "")
+    state = simulated_state(bench, "smu", **roles)
+    state.update({"measurement_type": "iv", "hardware_sweep": hardware_sweep})
+    measurement = IVMeasurement(state)
+    readings = []
+    measurement.iv_reading_event.subscribe(readings.append)
+    run_measurement(measurement, roles)
+    assert [reading["voltage"] for reading in readings] == [0.0, -5.0, -10.0, -15.0, -20.0]
+    for key in ("i_smu", "i_elm", "t_dmm"):
+        if key[2:] in roles:
+            assert all(math.isfinite(reading[key]) for reading in readings)
+    assert readings[-1]["i_smu"] < readings[1]["i_smu"] < 0
+    # Source ramped down and output disabled
+    with Resource(f"SIM::{roles['smu']}::{bench}", "") as res:
+        smu = driver_factory(roles["smu"])(res)
+        assert smu.get_output_enabled() is False
+        assert smu.get_voltage_level() == 0.0
+
+
+def test_simulation_cv_run():
+    roles = {"lcr": "E4980A", "dmm": "K2700"}
+    state = simulated_state("test_cv_run", "lcr", **roles)
+    state.update({"measurement_type": "cv"})
+    measurement = CVMeasurement(state)
+    readings = []
+    measurement.cv_reading_event.subscribe(readings.append)
+    run_measurement(measurement, roles)
+    assert [reading["voltage"] for reading in readings] == [0.0, -5.0, -10.0, -15.0, -20.0]
+    capacitances = [reading["c_lcr"] for reading in readings]
+    assert capacitances == sorted(capacitances, reverse=True)
+    assert all(math.isfinite(reading["t_dmm"]) for reading in readings)
+    # Bias ramped down and output disabled
+    with Resource("SIM::E4980A::test_cv_run", "") as res:
+        lcr = driver_factory("E4980A")(res)
+        assert lcr.get_output_enabled() is False
+        assert lcr.get_voltage_level() == 0.0